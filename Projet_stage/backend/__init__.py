@@ -1,8 +1,14 @@
 """Fichier d'initialisation du package ``backend`` à ne pas toucher.
+
+Les classes ne sont importées qu'au premier accès (``backend.MethodeUMAP``,
+``from backend import Visualisation2D``) : importer le package ne charge ni
+sklearn, ni umap, ni plotly.
 """
 
 # backend/__init__.py
 
+from importlib import import_module
+
 # Importation des modules minimum pour l'utilisateur
 __all__ = [
 	'DataLoader',
@@ -21,23 +27,51 @@ __all__ = [
 	'Visualisation3D'
 ]
 
-# Les modules/classes devant intervenir dans l'API
-from modules.loading import DataLoader
-from modules.save_in_db import SaveInDataBase
-
-# Les modules/classes qui le bon fonctionnement des autres modules/classes.
-from modules.string_tool import StringTools
-from modules.clean_dataframe_for_json import CleanDataframeForJson
-from modules.analysis import Analyse
-from modules.nettoyage import  Nettoyage
-from modules.numeric_data import NumericData
-from modules.sans_espace import StringUtils
-from modules.methode_acp import  MethodeACP
-from modules.methode_tsne import  MethodeTSNE
-from modules.methode_umap import  MethodeUMAP
-from modules.auto_selector import  AutoSelector
-from modules.visualisation_2d import Visualisation2D
-from modules.visualisation_3d import Visualisation3D
-from cfg.config_db import DbConfigRegistry
+# Le module de chaque classe exposée par le package.
+_MODULES = {
+	# Les modules/classes devant intervenir dans l'API
+	'DataLoader': 'modules.loading',
+	'SaveInDataBase': 'modules.save_in_db',
+
+	# Les modules/classes qui le bon fonctionnement des autres modules/classes.
+	'StringTools': 'modules.string_tool',
+	'CleanDataframeForJson': 'modules.clean_dataframe_for_json',
+	'Analyse': 'modules.analysis',
+	'Nettoyage': 'modules.nettoyage',
+	'NumericData': 'modules.numeric_data',
+	'StringUtils': 'modules.sans_espace',
+	'MethodeACP': 'modules.methode_acp',
+	'MethodeTSNE': 'modules.methode_tsne',
+	'MethodeUMAP': 'modules.methode_umap',
+	'AutoSelector': 'modules.auto_selector',
+	'Visualisation2D': 'modules.visualisation_2D',
+	'Visualisation3D': 'modules.visualisation_3D',
+	'DbConfigRegistry': 'cfg.config_db',
+}
 
 __version__ = "0.0.1"
+
+def __getattr__(nom: str) -> object:
+	"""Importe une classe du package à son premier accès (PEP 562).
+
+	Args:
+		nom (str): Le nom de la classe.
+
+	Raises:
+		AttributeError: Si le package n'expose pas ce nom.
+
+	Returns:
+		object: La classe demandée.
+	"""
+
+	if nom not in _MODULES:
+		raise AttributeError(f"module {__name__!r} has no attribute {nom!r}")
+	valeur = getattr(import_module(_MODULES[nom]), nom)
+	# Les accès suivants ne repassent plus par cette fonction.
+	globals()[nom] = valeur
+	return valeur
+
+def __dir__() -> list[str]:
+	"""Liste les noms du package, y compris les classes pas encore importées.
+	"""
+	return sorted(set(globals()) | set(_MODULES))
@@ -3,18 +3,22 @@
 # Il faut s'assurer que les importations se présente sous la forme:
 # from modules.nom_du_module import nom_de_la_class
 
+from concurrent.futures.process import BrokenProcessPool
 from enum import Enum
+import os
 from pathlib import Path
 from typing import (
     Any,
     Annotated,
-    # Optional
+    Optional,
     )
 # from cfg.config_db import DbCreateRequest
 from fastapi import (
     FastAPI,
+    Request,
     status,
     Query,
+    Header,
     # Form,
     # Depends,
     HTTPException
@@ -22,25 +26,53 @@ from fastapi import (
 from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import (
+    Response,
     JSONResponse,
+    StreamingResponse,
     # FileResponse,
     # HTMLResponse
     )
 # from pydantic import BaseModel
 from modules.analysis import Analyse
+from modules.cache_donnees import CacheDonnees
+from modules.cache_projections import CacheProjections
 from modules.clean_dataframe_for_json import CleanDataframeForJson
+from modules.compaction import CompactionDataFrame
+from modules.doublons import DetecteurDoublons
+from modules.executeur_reduction import ExecuteurReduction
+from modules.index_voisins import IndexVoisins
 from modules.loading import (
     DataLoader,
     FilePayload,
     )
+from modules.registre_donnees import (
+    JeuDeDonnees,
+    RegistreDonnees,
+    nouvel_identifiant,
+    )
+from modules.stockage_partage import StockagePartage
+from modules.taches import (
+    FileTachesPleine,
+    GestionnaireTaches,
+    tache_visualisation,
+    )
+from modules.pagination import (
+    Pagination,
+    PaginationSlot,
+    )
+from modules.serialisation_dataframe import (
+    MEDIA_TYPE_ARROW,
+    MEDIA_TYPE_NDJSON,
+    SerialisationDataFrame,
+    )
 
 # from modules.save_in_data_base import SaveInDataBase
-from modules.visualisation_2d import (
+from modules.visualisation_2D import (
     BuildGraphic2DSlot,
     Visualisation2D,
     ReadGraphic2DSlot,
     )
-from modules.visualisation_3d import (
+from modules.visualisation_3D import (
     BuildGraphic3DSlot,
     Visualisation3D,
     ReadGraphic3DSlot,
@@ -74,6 +106,8 @@ class Routes:
     ANALYSE_DATA = "/v_01/analyse/"
     VISUALISATION_2D = "/v_01/visualisation/2d/"
     VISUALISATION_3D = "/v_01/visualisation/3d/"
+    CACHE_DATA = "/v_01/cache/"
+    JOBS = "/v_01/jobs/{job_id}"
 
 class Tags(str, Enum):
     """Cette classe déclare le nom des points des endpoints.
@@ -86,6 +120,8 @@ class Tags(str, Enum):
     ANALYSE_DATA = "analyse_data"
     VISUALISATION_2D = "visualisation_data_2d"
     VISUALISATION_3D = "visualisation_data_3d"
+    CACHE_DATA = "cache_data"
+    JOBS = "jobs"
     ITEMS = "items"
     USERS = "users"
 
@@ -99,9 +135,6 @@ app = FastAPI(
     version=VERSION
     )
 
-app.state.data_frame = None
-app.state.file_path = None
-app.state.folder_path = None
 
 origines = [
     "http://127.0.0.1:5501",
@@ -115,12 +148,222 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Permettre au frontend de lire le nombre total de lignes pour la pagination,
+    # la mémoire gagnée par la compaction et l'identifiant du jeu de données.
+    expose_headers=["X-Total-Count", "X-Octets-Avant", "X-Octets-Apres", "X-Dataset-Id"],
 )
 
+# Dossier du cache disque des données déjà analysées.
+CACHE_FOLDER = Path(__file__).parent / ".cache" / "donnees"
+# Dossier du cache disque des projections (ACP, t-SNE, UMAP) déjà calculées.
+PROJECTIONS_FOLDER = Path(__file__).parent / ".cache" / "projections"
+# Dossier du cache disque des graphes de plus proches voisins (t-SNE, UMAP).
+VOISINS_FOLDER = Path(__file__).parent / ".cache" / "voisins"
+# Dossier où sont déchargés les jeux de données évincés de la mémoire.
+REGISTRE_FOLDER = Path(__file__).parent / ".cache" / "registre"
+# Dossier partagé entre les workers (uvicorn --workers N) ; sans lui, chaque
+# processus garde ses propres jeux de données.
+DOSSIER_PARTAGE = os.environ.get("VISUALDATA_DOSSIER_PARTAGE")
+# Dossier des états des tâches de visualisation (dans le dossier partagé s'il existe).
+TACHES_FOLDER = Path(DOSSIER_PARTAGE) / "taches" if DOSSIER_PARTAGE else (
+    Path(__file__).parent / ".cache" / "taches")
+# Nombre maximal de visualisations calculées en même temps.
+TACHES_MAX = int(os.environ.get("VISUALDATA_TACHES_MAX", "2"))
+# Nombre de processus de réduction de dimension (par défaut les coeurs moins un).
+REDUCTION_PROCESSUS = os.environ.get("VISUALDATA_REDUCTION_PROCESSUS")
+# Compilation des fonctions numba d'UMAP au démarrage des processus de réduction
+# (VISUALDATA_PRECHAUFFAGE=0 pour la désactiver).
+PRECHAUFFAGE = os.environ.get("VISUALDATA_PRECHAUFFAGE", "1") != "0"
+# Nombre de lignes à partir duquel l'ACP relit le fichier CSV ou Parquet des
+# données par morceaux, au lieu de copier la matrice vers le processus de réduction.
+LIGNES_ACP_FLUX = int(os.environ.get("VISUALDATA_LIGNES_ACP_FLUX", "1000000"))
+# Plafond mémoire en octets d'un tableau chargé par morceaux ou relu depuis le cache
+# (aucun par défaut) ; une requête peut l'abaisser avec `memoire_max`.
+MEMOIRE_MAX = os.environ.get("VISUALDATA_MEMOIRE_MAX")
+# Cache disque de numba, hérité par les processus de réduction et de tâches
+# (le dossier du paquet umap n'est pas toujours accessible en écriture).
+# UMAP n'est jamais exécuté dans le processus de l'API : les tâches en sont
+# dupliquées par fork, ce qui bloquerait après du code numba parallèle.
+os.environ.setdefault("NUMBA_CACHE_DIR", str(Path(__file__).parent / ".cache" / "numba"))
+
 # Instanciation de classe
-chargeur_data = DataLoader()
+cache_donnees = CacheDonnees(dossier=str(CACHE_FOLDER))
+# Une vue graphique des mêmes colonnes relit sa projection au lieu de la recalculer.
+cache_projections = CacheProjections(dossier=str(PROJECTIONS_FOLDER))
+# La recherche des voisins n'est faite qu'une fois par sélection de colonnes pour t-SNE et UMAP.
+index_voisins = IndexVoisins(dossier=str(VOISINS_FOLDER))
+# Les jeux de données chargés, désignés par un identifiant (un par utilisateur ou onglet).
+registre_donnees = RegistreDonnees(
+    dossier_debordement=str(REGISTRE_FOLDER),
+    stockage=StockagePartage(dossier=DOSSIER_PARTAGE) if DOSSIER_PARTAGE else None)
+# Les visualisations longues sont calculées hors des requêtes, dans un groupe borné de processus.
+gestionnaire_taches = GestionnaireTaches(dossier=str(TACHES_FOLDER), processus_max=TACHES_MAX)
+app.router.on_shutdown.append(gestionnaire_taches.arreter)
+# Les réductions des visualisations synchrones sont calculées dans des processus
+# démarrés au lancement de l'application, sans bloquer celui de l'API.
+executeur_reduction = ExecuteurReduction(
+    processus_max=int(REDUCTION_PROCESSUS) if REDUCTION_PROCESSUS else None,
+    prechauffage=PRECHAUFFAGE)
+app.router.on_startup.append(executeur_reduction.demarrer)
+app.router.on_shutdown.append(executeur_reduction.arreter)
 chargeur_clean_df_for_json = CleanDataframeForJson()
-chargeur_analyse = Analyse()
+chargeur_compaction = CompactionDataFrame()
+# Détecteur de doublons partagé : les lignes ne sont hachées qu'une fois par version.
+detecteur_doublons = DetecteurDoublons()
+chargeur_analyse = Analyse(doublons=detecteur_doublons)
+chargeur_serialisation = SerialisationDataFrame()
+
+# Identifiant du jeu de données visé par une requête, dans l'entête `X-Dataset-Id`
+# (un entête plutôt qu'un paramètre de requête, pour ne pas se mêler aux modèles
+# de paramètres comme `PaginationSlot`).
+DatasetId = Annotated[
+    str,
+    Header(
+        alias="X-Dataset-Id",
+        title="X-Dataset-Id is header parameter.",
+        description="""This header selects the dataset loaded by
+        the user (the ID returned by the data loading endpoint).""",
+        pattern=r"^[A-Za-z0-9_-]{1,64}$")]
+
+# Au chargement, l'identifiant est facultatif : sans lui, un nouvel identifiant est créé
+# pour ne pas remplacer le jeu de données d'un autre client.
+NouveauDatasetId = Annotated[
+    Optional[str],
+    Header(
+        alias="X-Dataset-Id",
+        title="X-Dataset-Id is header parameter.",
+        description="""This header gives the ID of the dataset to create
+        or replace; without it a new ID is generated and returned
+        in the `X-Dataset-Id` response header.""",
+        pattern=r"^[A-Za-z0-9_-]{1,64}$")]
+
+# Exécution de la visualisation en tâche de fond plutôt que pendant la requête.
+Asynchrone = Annotated[
+    bool,
+    Query(
+        title="asynchrone is query parameter.",
+        description="""With this parameter, the visualisation is computed
+        in a background job and its ID is returned immediately
+        (follow it on `/v_01/jobs/{job_id}`).""")]
+
+# Temps accordé au choix de la méthode de réduction et à la réduction elle-même.
+Budget = Annotated[
+    Optional[float],
+    Query(
+        gt=0,
+        title="budget is query parameter.",
+        description="""With this parameter (in seconds), ACP, t-SNE and UMAP
+        are scored on a sample and the best method whose predicted runtime
+        fits the budget is used; without it a quick heuristic chooses.""")]
+
+def format_demande(request: Request) -> str:
+    """Négociation du format de réponse à partir de l'entête `Accept` du client.
+
+    Args:
+        request (Request): La requête reçue par le endpoint.
+
+    Returns:
+        str: `arrow`, `ndjson` ou `json` (par défaut, pour les navigateurs).
+    """
+    accept = request.headers.get("accept", "")
+    if MEDIA_TYPE_ARROW in accept:
+        return "arrow"
+    if MEDIA_TYPE_NDJSON in accept:
+        return "ndjson"
+    return "json"
+
+def source_acp(jeu: JeuDeDonnees) -> Optional[str]:
+    """Retourne le fichier que l'ACP hors mémoire peut relire par morceaux : la copie
+    du registre (Arrow partagé ou Parquet de débordement), qui contient la version
+    enregistrée des données, et non le fichier téléversé qui a pu changer depuis.
+
+    Args:
+        jeu (JeuDeDonnees): Le jeu de données à visualiser.
+
+    Returns:
+        str | None: Le chemin de la copie, None si le tableau n'existe qu'en mémoire.
+    """
+    chemin = registre_donnees.fichier(jeu)
+    return str(chemin) if chemin is not None else None
+
+def reponse_tache(
+    axes: int,
+    df: Any,
+    folder_path: str,
+    file_name: str,
+    budget: Optional[float] = None,
+    source: Optional[str] = None) -> JSONResponse:
+    """Soumet une visualisation au gestionnaire de tâches et renvoie l'état de la tâche.
+
+    Args:
+        axes (int): Le nombre de dimensions de la vue graphique (2 ou 3).
+        df (pd.DataFrame): Les colonnes numériques à visualiser.
+        folder_path (str): Le dossier devant contenir les vues graphiques.
+        file_name (str): Le nom du fichier des données.
+        budget (float | None): Le temps accordé au choix de la méthode et à la réduction.
+        source (str | None): Le fichier des données, relu par l'ACP hors mémoire.
+
+    Raises:
+        HTTPException: Trop de tâches sont déjà en attente (429), ou le groupe
+        de processus des tâches ne démarre pas (503).
+
+    Returns:
+        JSONResponse: L'état de la tâche (202), avec son adresse dans l'entête `Location`.
+    """
+
+    try:
+        etat = gestionnaire_taches.soumettre(
+            tache_visualisation,
+            axes,
+            df,
+            folder_path,
+            file_name,
+            cache=cache_projections,
+            index=index_voisins,
+            budget_secondes=budget,
+            source=source,
+            lignes_flux=LIGNES_ACP_FLUX)
+    except FileTachesPleine as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(e)) from e
+    except BrokenProcessPool as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e)) from e
+
+    return JSONResponse(
+        content=etat,
+        status_code=status.HTTP_202_ACCEPTED,
+        headers={"Location": Routes.JOBS.format(job_id=etat['identifiant'])})
+
+def reponse_arrow(
+    df: Any,
+    status_code: int = status.HTTP_200_OK,
+    headers: dict[str, str] | None = None,
+    metadonnees: dict | None = None) -> Response:
+    """Construit une réponse au format Apache Arrow IPC à partir d'un DataFrame.
+
+    Args:
+        df (pd.DataFrame): Le tableau de données à renvoyer.
+        status_code (int): Le code de la réponse (200 par défaut).
+        headers (dict[str, str] | None): Les entêtes de la réponse.
+        metadonnees (dict | None): Des informations ajoutées au schéma Arrow.
+
+    Returns:
+        Response: Une réponse binaire Arrow IPC est retournée.
+    """
+    try:
+        contenu = chargeur_serialisation.vers_arrow_ipc(df, metadonnees=metadonnees)
+    except (ImportError, ValueError, TypeError, NotImplementedError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_406_NOT_ACCEPTABLE,
+            detail=f"Les données ne peuvent pas être renvoyées au format Arrow : {e}") from e
+    return Response(
+        content=contenu,
+        media_type=MEDIA_TYPE_ARROW,
+        status_code=status_code,
+        headers=headers)
 
 @app.get('/')
 def root() -> dict[str, str]:
@@ -212,13 +455,31 @@ LOADING_DATA = "/v_01/data/"
     response_description=RESPONSE_DESCRIPTION,
     name="create_loading_data"
     )
-def send_data(payload: FilePayload) -> JSONResponse:
+def send_data(
+    payload: FilePayload,
+    request: Request,
+    dataset_id: NouveauDatasetId = None) -> Any:
     """L'utilisateur envoie le chemin d'un fichier de données et ce chemin
     sera lu par le endpoint pour renvoyer en retour une réponse
     au format JSON.
+    - Avec l'entête `Accept: application/x-ndjson`, les données sont
+    envoyées en flux NDJSON par lots de lignes.
+    - Avec l'entête `Accept: application/vnd.apache.arrow.stream`, les données
+    sont envoyées au format binaire Arrow IPC.
+    - Avec `compacter`, les types des colonnes sont réduits après le chargement et
+    la mémoire avant/après est indiquée dans les entêtes `X-Octets-Avant` et `X-Octets-Apres`.
+    - Le jeu de données est enregistré sous l'identifiant de l'entête `X-Dataset-Id`
+    (un nouvel identifiant sans entête), renvoyé dans l'entête de la réponse.
+    - Avec `memoire_max` (ou `VISUALDATA_MEMOIRE_MAX`, le plus petit des deux), un
+    tableau chargé par morceaux ou relu depuis le cache au-delà du plafond est refusé.
 
     Args:
         payload (FilePayload): Ce paramètre récupère le chemin d'un fichier de données.
+        request (Request): La requête, pour lire l'entête `Accept`.
+        dataset_id (str | None): L'identifiant du jeu de données à créer ou remplacer.
+
+    Raises:
+        HTTPException: Le plafond mémoire est dépassé (413).
 
     Returns:
         JSONResponse: Une réponse JSONResponse est retourné par le serveur backend.
@@ -231,26 +492,54 @@ def send_data(payload: FilePayload) -> JSONResponse:
     if "\\" in file_path:
         file_path = "/".join(file_path.split("\\"))
 
-    # Ce chemin est en suite fixé en mémoire au dela de ce endpoint.
-    app.state.file_path = Path(file_path)
+    # Plafond mémoire : celui du serveur, abaissé par la requête si elle en fixe un.
+    plafonds = [int(p) for p in (MEMOIRE_MAX, payload.memoire_max) if p is not None]
 
-    # Chargement des données dans un data_frame.
-    df = chargeur_data.load(file_path=file_path)
+    # Chargement des données dans un data_frame (par morceaux si demandé), avec un
+    # chargeur par requête : `load` garde le tableau lu dans l'instance.
+    try:
+        df = DataLoader(
+            cache=cache_donnees,
+            memoire_max=min(plafonds) if plafonds else None).load(
+                file_path=file_path,
+                streaming=payload.streaming)
+    except MemoryError as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+            detail=str(e)) from e
 
-    # Nettoyer les données invalides pour un rendu JSON au frontend.
+    # Nettoyer les valeurs infinies pour un rendu JSON au frontend.
     df =  chargeur_clean_df_for_json.clean_dataframe_for_json(df=df)
 
-    # Fixer la data_frame en mémoire au dela de ce endpoint.
-    #https://fastapi.tiangolo.com/reference/fastapi/?h=state#fastapi.FastAPI.state
-    app.state.data_frame = df
-
-    # Conserver la data_frame sous forme d'un dictionnaire python.
-    dict_object = df.to_dict(orient="records")
-
-    # Puis retourner le rendu sous forme d'une réponse JSON au frontend.
-    return JSONResponse(
-        content=jsonable_encoder(dict_object),
-        status_code=status.HTTP_201_CREATED)
+    # Réduire les types des colonnes si demandé, et indiquer la mémoire gagnée.
+    dataset_id = dataset_id or nouvel_identifiant()
+    entetes = {"X-Dataset-Id": dataset_id}
+    if payload.compacter:
+        df, rapport = chargeur_compaction.compacter(df)
+        entetes["X-Octets-Avant"] = str(rapport['octets_avant'])
+        entetes["X-Octets-Apres"] = str(rapport['octets_apres'])
+
+    # Enregistrer la data_frame et son chemin en mémoire au dela de ce endpoint.
+    registre_donnees.ajouter(dataset_id, df, file_path=Path(file_path))
+
+    # Envoyer les données au format binaire ou en flux si le client le demande.
+    format_reponse = format_demande(request)
+    if format_reponse == "arrow":
+        return reponse_arrow(df, status_code=status.HTTP_201_CREATED, headers=entetes)
+    if format_reponse == "ndjson":
+        return StreamingResponse(
+            chargeur_serialisation.iterer_ndjson(df),
+            media_type=MEDIA_TYPE_NDJSON,
+            status_code=status.HTTP_201_CREATED,
+            headers=entetes)
+
+    # Sinon encoder la data_frame colonne par colonne en JSON (NaN devient null),
+    # puis retourner le rendu sous forme d'une réponse JSON au frontend.
+    return Response(
+        content=chargeur_serialisation.vers_json(df),
+        media_type="application/json",
+        status_code=status.HTTP_201_CREATED,
+        headers=entetes)
 
 # READ ROUTER (GET)
 
@@ -263,26 +552,67 @@ RESPONSE_DESCRIPTION = """Lecture des données depuis l'URL de chargement des do
     summary=SUMMARY,
     response_description=RESPONSE_DESCRIPTION,
     name="read_loading_data")
-def read_data() -> JSONResponse:
+def read_data(
+    request: Request,
+    pagination: Annotated[
+        PaginationSlot,
+        Query(
+            title="pagination is query parameter.",
+            description="""These parameters allowed to read only
+            the visible window of the loaded data (offset, limit,
+            columns and sort key).""")],
+    dataset_id: DatasetId) -> Any:
     """Le chemin du fichier envoyé par l'utilisateur pour le chargement
     de données est relu en mémoire et est utilisé par le endpoint
     pour renvoyer en retour une réponse au format JSON.
+    - Seule la fenêtre demandée (`offset`, `limit`, `columns`, `sort_by`)
+    est convertie, et le nombre total de lignes est renvoyé dans l'entête `X-Total-Count`.
+    - Avec l'entête `Accept: application/x-ndjson`, la fenêtre est envoyée
+    en flux NDJSON par lots de lignes.
+    - Avec l'entête `Accept: application/vnd.apache.arrow.stream`, la fenêtre
+    est envoyée au format binaire Arrow IPC.
 
     Returns:
         JSONResponse: Une réponse JSON contenant un message est retourné.
     """
 
     # Vérifier si la data_frame fixée en mémoire est présent.
-    if app.state.data_frame is None:
+    jeu = registre_donnees.obtenir(dataset_id)
+    if jeu is None:
         return JSONResponse(
             content={"error": "Aucune donnée chargée"},
             status_code=status.HTTP_404_NOT_FOUND)
 
-    # Si oui, la convertire dans un dictionnaire python.
-    dict_object = app.state.data_frame.to_dict(orient="records")
+    df = jeu.df
+    chargeur_pagination = Pagination(parametres=pagination)
 
-    # Puis retourner le rendu sous forme d'une réponse JSON au frontend.
-    return JSONResponse(content=jsonable_encoder(dict_object))
+    # Vérifier que les colonnes demandées existent.
+    colonnes_inconnues = chargeur_pagination.colonnes_inconnues(df)
+    if colonnes_inconnues:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Colonne(s) introuvable(s) : {colonnes_inconnues}")
+
+    # Si oui, découper la fenêtre demandée avant toute conversion.
+    page = chargeur_pagination.decouper(df)
+    entetes = {"X-Total-Count": str(len(df))}
+
+    # Envoyer la fenêtre au format binaire ou en flux si le client le demande.
+    format_reponse = format_demande(request)
+    if format_reponse == "arrow":
+        return reponse_arrow(page, headers=entetes)
+    if format_reponse == "ndjson":
+        return StreamingResponse(
+            chargeur_serialisation.iterer_ndjson(page),
+            media_type=MEDIA_TYPE_NDJSON,
+            headers=entetes)
+
+    # Sinon encoder la fenêtre colonne par colonne en JSON (NaN devient null),
+    # puis retourner le rendu sous forme d'une réponse JSON au frontend.
+    return Response(
+        content=chargeur_serialisation.vers_json(page),
+        media_type="application/json",
+        headers=entetes)
 
 # DELETE ROUTER (DELETE)
 
@@ -291,23 +621,22 @@ def read_data() -> JSONResponse:
     tags=[Tags.LOADING_DATA],
     summary="Suppression de la route.",
     name="delete_loading_data")
-def delete_data() -> JSONResponse:
+def delete_data(dataset_id: DatasetId) -> JSONResponse:
     """Supprimer les données sur (`http://127.0.0.1:8000/v_01/data/`).
 
+    Args:
+        dataset_id (str): L'identifiant du jeu de données à supprimer.
+
     Returns:
         JSONResponse: Un objet au format JSON contenant un message et un code lié à ce message.
     """
 
-    # Vérifier si la data_frame fixée en mémoire est présent.
-    if app.state.data_frame is None:
+    # Vérifier si la data_frame fixée en mémoire est présent, et si oui la supprimer.
+    if not registre_donnees.supprimer(dataset_id):
         return JSONResponse(
             content={"error": "Aucune donnée chargée"},
             status_code=status.HTTP_404_NOT_FOUND)
 
-    # Si oui, supprimer les colonnes.
-    app.state.data_frame.drop(columns=[col for col in app.state.data_frame.columns], inplace=True)
-    app.state.data_frame = None
-
     return JSONResponse(content={"message": "Données supprimées avec succès."})
 
 # UPDATE ROUTER (UPDATE)
@@ -315,6 +644,56 @@ def delete_data() -> JSONResponse:
 
 # -----------------------------------------------
 
+# CRUD OF DATA CACHE
+# READ ROUTER (GET)
+
+SUMMARY="""Lecture des compteurs du cache des données chargées."""
+
+@app.get(
+    path=Routes.CACHE_DATA,
+    tags=[Tags.CACHE_DATA],
+    summary=SUMMARY,
+    name="read_cache_infos")
+def read_cache() -> JSONResponse:
+    """Les compteurs de succès et d'échecs du cache, ainsi que sa taille,
+    sont retournés pour permettre son dimensionnement, avec ceux du cache
+    des projections, celui des graphes de voisins et l'état du registre des jeux de données en mémoire.
+
+    Returns:
+        JSONResponse: Un objet au format JSON est retourné.
+    """
+
+    return JSONResponse(content={
+        **cache_donnees.statistiques(),
+        'projections': cache_projections.statistiques(),
+        'voisins': index_voisins.statistiques(),
+        'registre': registre_donnees.statistiques()})
+
+# DELETE ROUTER (DELETE)
+
+SUMMARY="""Suppression du contenu du cache des données chargées."""
+
+@app.delete(
+    path=Routes.CACHE_DATA,
+    tags=[Tags.CACHE_DATA],
+    summary=SUMMARY,
+    name="delete_cache")
+def delete_cache() -> JSONResponse:
+    """Le cache des données chargées, celui des projections et celui des graphes
+    de voisins sont vidés sur cette route.
+
+    Returns:
+        JSONResponse: Une réponse JSON est retournée avec un message.
+    """
+
+    cache_donnees.vider()
+    cache_projections.vider()
+    index_voisins.vider()
+
+    return JSONResponse(content={"message": "Cache vidé avec succès."})
+
+# -----------------------------------------------
+
 # CRUD OF ANALYSE OF DATA LOADING
 # CREATE ROUTER (POST)
 
@@ -325,24 +704,39 @@ SUMMARY="""Création des informations d'analyses des données chargé."""
     tags=[Tags.ANALYSE_DATA],
     summary=SUMMARY,
     name="create_analyse_infos")
-def send_data_analyse() -> JSONResponse:
+def send_data_analyse(
+    request: Request,
+    dataset_id: DatasetId) -> Any:
     """Une fois les données chargées, une analyse de ces derniers est
     faite automatiquement pour l'utilisateur.
+    - Avec l'entête `Accept: application/vnd.apache.arrow.stream`, le résumé
+    par colonne est envoyé au format Arrow IPC (le résumé complet est dans le schéma).
+
+    Args:
+        request (Request): La requête, pour lire l'entête `Accept`.
+        dataset_id (str): L'identifiant du jeu de données à analyser.
 
     Returns:
         JSONResponse: Un objet au format JSON est retourné.
     """
 
-    if app.state.data_frame is None:
+    jeu = registre_donnees.obtenir(dataset_id)
+    if jeu is None:
         return JSONResponse(
             content={"Error": "Aucune donnée chargée"},
             status_code=status.HTTP_404_NOT_FOUND)
 
-    # Nettoyer les données invalides pour JSON.
-    df =  chargeur_clean_df_for_json.clean_dataframe_for_json(df=app.state.data_frame)
+    # Les données sont déjà nettoyées au chargement.
+    df = jeu.df
 
-    # Résumer des données
-    dict_object = chargeur_analyse.summarize(df)
+    # Résumer des données (recalculé seulement si les données ont changé).
+    dict_object = chargeur_analyse.summarize(df, version=jeu.version)
+
+    if format_demande(request) == "arrow":
+        return reponse_arrow(
+            chargeur_analyse.summarize_par_colonne(df),
+            status_code=status.HTTP_201_CREATED,
+            metadonnees=dict_object)
 
     return JSONResponse(
         content=jsonable_encoder(dict_object),
@@ -359,23 +753,37 @@ RESPONSE_DESCRIPTION="""Les informations des données chargées sont lu avec suc
     summary=SUMMARY,
     response_description=RESPONSE_DESCRIPTION,
     name="read_analyse_infos")
-def read_data_analyse() -> JSONResponse:
+def read_data_analyse(
+    request: Request,
+    dataset_id: DatasetId) -> Any:
     """L'analyse étant faite, les informations de l'analyse sont retournées à l'utilisateur.
+    - Avec l'entête `Accept: application/vnd.apache.arrow.stream`, le résumé
+    par colonne est envoyé au format Arrow IPC (le résumé complet est dans le schéma).
+
+    Args:
+        request (Request): La requête, pour lire l'entête `Accept`.
+        dataset_id (str): L'identifiant du jeu de données à analyser.
 
     Returns:
         JSONResponse: Un objet au format JSON est retourné.
     """
 
-    if app.state.data_frame is None:
+    jeu = registre_donnees.obtenir(dataset_id)
+    if jeu is None:
         return JSONResponse(
             content={"error": "Aucune donnée chargée"},
             status_code=status.HTTP_404_NOT_FOUND)
 
-    # Nettoyer les données invalides pour JSON.
-    df =  chargeur_clean_df_for_json.clean_dataframe_for_json(df=app.state.data_frame)
+    # Les données sont déjà nettoyées au chargement.
+    df = jeu.df
+
+    # Résumer des données (recalculé seulement si les données ont changé).
+    dict_object = chargeur_analyse.summarize(df, version=jeu.version)
 
-    # Résumer des données
-    dict_object = chargeur_analyse.summarize(df)
+    if format_demande(request) == "arrow":
+        return reponse_arrow(
+            chargeur_analyse.summarize_par_colonne(df),
+            metadonnees=dict_object)
 
     return JSONResponse(content=jsonable_encoder(dict_object))
 
@@ -388,20 +796,21 @@ SUMMARY="""Suppression des informations d'analyses des données chargé."""
     tags=[Tags.ANALYSE_DATA],
     summary=SUMMARY,
     name="delete_analyse_infos")
-def delete_data_analyse() -> JSONResponse:
+def delete_data_analyse(dataset_id: DatasetId) -> JSONResponse:
     """Après l'avoir créer et lu, les informations peuvent être supprimer sur cette route.
 
+    Args:
+        dataset_id (str): L'identifiant du jeu de données.
+
     Returns:
         JSONResponse: Une réponse JSON est retournée avec un message.
     """
 
-    if app.state.data_frame is None:
+    if not registre_donnees.supprimer(dataset_id):
         return JSONResponse(
             content={"error": "Aucune donnée chargée"},
             status_code=status.HTTP_404_NOT_FOUND)
 
-    app.state.data_frame = None
-
     return JSONResponse(content={"message": "Données supprimées avec succès."})
 
 # UPDATE ROUTER (UPDATE)
@@ -417,10 +826,18 @@ SUMMARY="""Créations de la visualisation graphique en 2 dimension des colonnes
     tags=[Tags.VISUALISATION_2D],
     summary=SUMMARY,
     name="create_2d_visualisation")
-def post_data_visualisation_2d(payload: BuildGraphic2DSlot) -> JSONResponse:
+def post_data_visualisation_2d(
+    payload: BuildGraphic2DSlot,
+    dataset_id: DatasetId,
+    asynchrone: Asynchrone = False,
+    budget: Budget = None) -> JSONResponse:
     """Mise en place de la visualisation 2D dans un dossier local après analyse.
     - Seul les colonnes numérique sélectionnées par l'utilisateur
     seront utilisées pour construire le graphique.
+    - Avec `asynchrone=true`, le graphique est construit en tâche de fond et
+    l'état de la tâche est retourné immédiatement (code 202).
+    - Avec `budget` (en secondes), la méthode de réduction est choisie parmi
+    celles dont la durée prévue tient dans ce budget.
 
     Returns:
         JSONResponse: Une réponse JSON est retourné avec un message et un code lié à ce message.
@@ -444,27 +861,25 @@ def post_data_visualisation_2d(payload: BuildGraphic2DSlot) -> JSONResponse:
     # Ainsi que les colonnes numérique des données à visualiser dans une liste.
     visualize_column = list(payload.visualize_column.keys())
 
-    # Vérifier si le chemin du fichier des données ayant permit le chargement existe en mémoire.
-    if app.state.file_path is None:
-        return JSONResponse(
-            content={"error": "Aucune donnée chargée"},
-            status_code=status.HTTP_404_NOT_FOUND)
-
-    # Si oui, lire le chemin.
-    file_path: Path = app.state.file_path
-    file_name = file_path.stem
-
-    # Vérifier si les données à chargées existent en mémoire.
-    if app.state.data_frame is None:
+    # Vérifier si les données chargées et le chemin de leur fichier existent en mémoire.
+    jeu = registre_donnees.obtenir(dataset_id)
+    if jeu is None or jeu.file_path is None:
         return JSONResponse(
             content={"error": "Aucune donnée chargée"},
             status_code=status.HTTP_404_NOT_FOUND)
 
-    # Si oui, les lire.
-    df = app.state.data_frame
+    # Si oui, lire le chemin et les données.
+    file_name = jeu.file_path.stem
+    df = jeu.df
 
     # Stocké en mémoire le chemin du répertoire devant contenir les vues graphiques.
-    app.state.folder_path = Path(payload.folder_path)
+    registre_donnees.definir_dossier(dataset_id, Path(payload.folder_path))
+
+    # En tâche de fond, l'identifiant de la tâche est renvoyé sans attendre le calcul.
+    if asynchrone:
+        return reponse_tache(
+            2, df[visualize_column], payload.folder_path, file_name, budget,
+            source_acp(jeu))
 
     # Instancier la classe de visualisation graphique en 2 dimensions.
     chargeur_visualisation_2d = Visualisation2D(
@@ -472,15 +887,24 @@ def post_data_visualisation_2d(payload: BuildGraphic2DSlot) -> JSONResponse:
         df=df[visualize_column],
         color_col=None,
         graphic_vue_folder=payload.folder_path,
-        file_name=file_name)
+        file_name=file_name,
+        executeur=executeur_reduction,
+        cache=cache_projections,
+        index=index_voisins,
+        budget_secondes=budget,
+        source=source_acp(jeu),
+        lignes_flux=LIGNES_ACP_FLUX)
 
     # Puis construire le graphique avec la méthode dédié.
     chargeur_visualisation_2d.visualisation_automatique()
 
-    # Un message est retourné après la création de la vue graphique.
+    # Un message est retourné après la création de la vue graphique, avec la variance
+    # expliquée et les contributions des variables pour une vue ACP.
+    contenu = {"message":"Visualisation est crée avec succès."}
+    if chargeur_visualisation_2d.informations is not None:
+        contenu["informations"] = chargeur_visualisation_2d.informations
     return JSONResponse(
-        content={
-            "message":"Visualisation est crée avec succès."},
+        content=contenu,
         status_code=status.HTTP_201_CREATED)
 
 # READ VISUALIZATION (GET)
@@ -499,7 +923,8 @@ def get_data_visualisation_2d(
             title="html_file_s is query parameter.",
             description="""This parameter allowed to read one
             HTML file or all files that represent the graphic
-            vue file generate by plotly library.""")]) -> Any:
+            vue file generate by plotly library.""")],
+    dataset_id: DatasetId) -> Any:
     """Lecture d'un fichier ou de tous les vues 2D depuis un dossier local.
     L'utilisateur peut visualiser les colonnes numériques crées en 2 dimensions via cette route.
 
@@ -510,14 +935,15 @@ def get_data_visualisation_2d(
     """
 
     # Il faut vérifier si le répertoire devant contenir les vues graphiques existe.
-    if app.state.folder_path is None:
+    jeu = registre_donnees.obtenir(dataset_id, charger=False)
+    if jeu is None or jeu.folder_path is None:
         return JSONResponse(
             status_code=404,
             content={"error": "Aucune donnée chargée"}
         )
 
     # S'il exite, se rendre dans le sous répertoire des graphiques en 2 dimensions.
-    html_dir = app.state.folder_path / "2D"
+    html_dir = jeu.folder_path / "2D"
 
     # Puis vérifier si ce sous-répertoire existe.
     if not html_dir.exists():
@@ -568,10 +994,18 @@ SUMMARY="""Créations de la visualisation graphique en 3 dimension des colonnes
     tags=[Tags.VISUALISATION_3D],
     summary=SUMMARY,
     name="create_3d_visualisation")
-def post_data_visualisation_3d(payload: BuildGraphic3DSlot) -> Any:
+def post_data_visualisation_3d(
+    payload: BuildGraphic3DSlot,
+    dataset_id: DatasetId,
+    asynchrone: Asynchrone = False,
+    budget: Budget = None) -> Any:
     """Mise en place de la visualisation 3D après analyse.
     L'utilisateur peut sélectionner les colonnes numériques à visualiser en
     3 dimensions via cette route.
+    - Avec `asynchrone=true`, le graphique est construit en tâche de fond et
+    l'état de la tâche est retourné immédiatement (code 202).
+    - Avec `budget` (en secondes), la méthode de réduction est choisie parmi
+    celles dont la durée prévue tient dans ce budget.
     Returns:
         None: Rien n'est retourné sur le serveur.
     """
@@ -594,27 +1028,25 @@ def post_data_visualisation_3d(payload: BuildGraphic3DSlot) -> Any:
     # Ainsi que les colonnes numérique des données à visualiser dans une liste.
     visualize_column = list(payload.visualize_col.keys())
 
-    # Vérifier si le chemin du fichier des données ayant permit le chargement existe en mémoire.
-    if app.state.file_path is None:
-        return JSONResponse(
-            content={"error": "Aucune donnée chargée"},
-            status_code=status.HTTP_404_NOT_FOUND)
-
-    # Si oui, lire le chemin.
-    file_path: Path = app.state.file_path
-    file_name = file_path.stem
-
-    # Vérifier si les données à chargées existent en mémoire.
-    if app.state.data_frame is None:
+    # Vérifier si les données chargées et le chemin de leur fichier existent en mémoire.
+    jeu = registre_donnees.obtenir(dataset_id)
+    if jeu is None or jeu.file_path is None:
         return JSONResponse(
             content={"error": "Aucune donnée chargée"},
             status_code=status.HTTP_404_NOT_FOUND)
 
-    # Si oui, les lire.
-    df = app.state.data_frame
+    # Si oui, lire le chemin et les données.
+    file_name = jeu.file_path.stem
+    df = jeu.df
 
     # Stocké en mémoire le chemin du répertoire devant contenir les vues graphiques.
-    app.state.folder_path = Path(payload.folder_path)
+    registre_donnees.definir_dossier(dataset_id, Path(payload.folder_path))
+
+    # En tâche de fond, l'identifiant de la tâche est renvoyé sans attendre le calcul.
+    if asynchrone:
+        return reponse_tache(
+            3, df[visualize_column], payload.folder_path, file_name, budget,
+            source_acp(jeu))
 
     # Instancier la classe de visualisation graphique en 3 dimensions.
     chargeur_visualisation_3d = Visualisation3D(
@@ -622,14 +1054,24 @@ def post_data_visualisation_3d(payload: BuildGraphic3DSlot) -> Any:
         df=df[visualize_column],
         color_col=None,
         graphic_vue_folder=payload.folder_path,
-        file_name=file_name)
+        file_name=file_name,
+        executeur=executeur_reduction,
+        cache=cache_projections,
+        index=index_voisins,
+        budget_secondes=budget,
+        source=source_acp(jeu),
+        lignes_flux=LIGNES_ACP_FLUX)
 
     # Puis construire le graphique avec la méthode dédié.
     chargeur_visualisation_3d.visualisation_automatique()
 
-    # Un message est retourné après la création de la vue graphique.
+    # Un message est retourné après la création de la vue graphique, avec la variance
+    # expliquée et les contributions des variables pour une vue ACP.
+    contenu = {"message":"Visualisation est crée avec succès."}
+    if chargeur_visualisation_3d.informations is not None:
+        contenu["informations"] = chargeur_visualisation_3d.informations
     return JSONResponse(
-        content={"message":"Visualisation est crée avec succès."},
+        content=contenu,
         status_code=status.HTTP_201_CREATED)
 
 # READ 3D VISUALIZATION (GET)
@@ -648,21 +1090,23 @@ def read_data_visualisation_3d(
             title="html_file_s is query parameter.",
             description="""This parameter allowed to read one
             HTML file or all files that represent the graphic
-            vue file generate by plotly library.""")]) -> Any:
+            vue file generate by plotly library.""")],
+    dataset_id: DatasetId) -> Any:
     """Mise en place de la visualisation 3D après analyse.
     L'utilisateur peut visualiser les colonnes numériques crées en 3 dimensions via cette route.
     Returns:
         None: Un emplacement où est stocké les vues graphique générées est retourné.
     """
     # Il faut vérifier si le répertoire devant contenir les vues graphiques existe.
-    if app.state.folder_path is None:
+    jeu = registre_donnees.obtenir(dataset_id, charger=False)
+    if jeu is None or jeu.folder_path is None:
         return JSONResponse(
             status_code=404,
             content={"error": "Aucune donnée chargée"}
         )
 
     # S'il exite, se rendre dans le sous répertoire des graphiques en 2 dimensions.
-    html_dir = app.state.folder_path / "3D"
+    html_dir = jeu.folder_path / "3D"
 
     # Puis vérifier si ce sous-répertoire existe.
     if not html_dir.exists():
@@ -697,3 +1141,61 @@ def read_data_visualisation_3d(
             )
     # Si aucun nom de fichier n'est donné alors retourné l'ensemble des vues graphiques présent.
     return ReadGraphic3DSlot(html_files=html_files)
+
+# ---------------------- CRUD OF JOBS ----------------------
+# READ JOB (GET)
+
+SUMMARY="""Suivi d'une tâche de visualisation en cours d'exécution."""
+
+@app.get(
+    path=Routes.JOBS,
+    tags=[Tags.JOBS],
+    summary=SUMMARY,
+    name="read_job")
+def read_job(job_id: str) -> JSONResponse:
+    """L'état (`en_attente`, `en_cours`, `terminee`, `echouee`, `annulee`),
+    la progression et les fichiers produits par une tâche sont retournés.
+
+    Args:
+        job_id (str): L'identifiant de la tâche.
+
+    Returns:
+        JSONResponse: L'état de la tâche au format JSON.
+    """
+
+    etat = gestionnaire_taches.obtenir(job_id)
+    if etat is None:
+        return JSONResponse(
+            content={"error": "Tâche introuvable"},
+            status_code=status.HTTP_404_NOT_FOUND)
+
+    return JSONResponse(content=etat)
+
+# DELETE JOB (DELETE)
+
+SUMMARY="""Annulation d'une tâche de visualisation."""
+
+@app.delete(
+    path=Routes.JOBS,
+    tags=[Tags.JOBS],
+    summary=SUMMARY,
+    name="cancel_job")
+def cancel_job(job_id: str) -> JSONResponse:
+    """Une tâche en attente est annulée immédiatement, une tâche en cours
+    à sa prochaine étape.
+
+    Args:
+        job_id (str): L'identifiant de la tâche.
+
+    Returns:
+        JSONResponse: Une réponse JSON est retournée avec un message.
+    """
+
+    if not gestionnaire_taches.annuler(job_id):
+        return JSONResponse(
+            content={"error": "Tâche introuvable ou déjà terminée"},
+            status_code=status.HTTP_404_NOT_FOUND)
+
+    return JSONResponse(
+        content={"message": "Annulation de la tâche demandée."},
+        status_code=status.HTTP_202_ACCEPTED)
@@ -8,16 +8,30 @@ Classes:
         Methodes:
             summarize(
                 self,
-                data: Union[pd.DataFrame, np.ndarray, str] = None
+                data: Union[pd.DataFrame, np.ndarray, str] = None,
+                version: Optional[Hashable] = None
             ) -> dict:
             Retourne un résumé statistique de la donnée chargée.
 
             Args:
                 data (Union[pd.DataFrame,np.ndarray,str]) : Les données à résumer (par défaut c'est `None`).
+                version (Hashable | None) : La version des données, pour réutiliser un résumé déjà calculé.
 
             Returns:
                 dict: L'ensemble des informations résumé dans un dictionnaire.
 
+            summarize_par_colonne(
+                self,
+                df: pd.DataFrame
+                ) -> pd.DataFrame:
+                Retourne le résumé des données sous forme tabulaire, une ligne par colonne.
+
+                Args:
+                    df (pd.DataFrame) : Les données à résumer.
+
+                Returns:
+                    pd.DataFrame: Le nom, le type, les valeurs manquantes et la nature de chaque colonne.
+
             get_descriptive_stats(
                 self,
                 df: pd.DataFrame
@@ -30,6 +44,18 @@ Classes:
                 Returns:
                     pd.DataFrame: Des données numériques et catégorielles traitées sont retourne.
 
+            get_descriptive_stats_flux(
+                self,
+                morceaux: Iterable[pd.DataFrame]
+                ) -> pd.DataFrame:
+                Fait des statistiques descriptives approchées morceau par morceau, en mémoire bornée.
+
+                Args:
+                    morceaux (Iterable[pd.DataFrame]) : Les morceaux de données à résumer.
+
+                Returns:
+                    pd.DataFrame: Les statistiques de chaque colonne.
+
 
 Raises:
     ValueError: Une erreur de valeur est soulevée s'il n'y a pas de données à résumer.
@@ -42,21 +68,53 @@ Returns:
     pd.DataFrame: Des données numériques et catégorielles traitées sont retourné.
 """
 
-from typing import Union
+from collections import OrderedDict
+import threading
+from typing import (
+    Union,
+    Hashable,
+    Iterable,
+    Optional,
+    )
 import pandas as pd
 import numpy as np
+from modules.doublons import DetecteurDoublons
+from modules.statistiques_flux import StatistiquesFlux
 
 class Analyse:
     """
     Analyse de données chargées depuis un emplacement local ou distant.
+
+    Args:
+        taille_cache (int): Le nombre de résumés conservés par version de données (8 par défaut).
+        doublons (DetecteurDoublons | None): Le détecteur de lignes dupliquées, à partager
+        avec le nettoyage pour ne hacher les lignes qu'une fois par version.
     """
 
-    def summarize(self, data: Union[pd.DataFrame, np.ndarray, str] = None) -> dict:
+    def __init__(
+        self,
+        taille_cache: int = 8,
+        doublons: Optional[DetecteurDoublons] = None
+        ) -> None:
+        self.taille_cache = taille_cache
+        self.doublons = doublons if doublons is not None else DetecteurDoublons()
+        self._resumes: OrderedDict[Hashable, dict] = OrderedDict()
+        # L'analyseur est partagé entre les requêtes servies en parallèle.
+        self._verrou = threading.Lock()
+
+    def summarize(
+        self,
+        data: Union[pd.DataFrame, np.ndarray, str] = None,
+        version: Optional[Hashable] = None
+        ) -> dict:
         """
         Retourne un résumé statistique de la donnée chargée.
+        - Si une version est donnée, le résumé déjà calculé pour cette version
+        est retourné sans parcourir les données.
 
         Args:
             data (Union[pd.DataFrame,np.ndarray,str]) : Les données à résumer (par défaut c'est `None`).
+            version (Hashable | None) : La version des données, pour réutiliser un résumé déjà calculé.
 
         Returns:
             dict: L'ensemble des informations résumé dans un dictionnaire.
@@ -64,11 +122,44 @@ class Analyse:
         if data is None:
             raise ValueError("Aucune donnée chargée.")
 
+        if version is not None:
+            with self._verrou:
+                if version in self._resumes:
+                    self._resumes.move_to_end(version)
+                    return self._resumes[version]
+
+        # Le résumé est calculé hors du verrou : seul le cache est protégé.
+        resume = self._resumer(data, version)
+
+        if version is not None:
+            with self._verrou:
+                self._resumes[version] = resume
+                # Ne conserver que les résumés des versions les plus récentes.
+                while len(self._resumes) > self.taille_cache:
+                    self._resumes.popitem(last=False)
+
+        return resume
+
+    def _resumer(
+        self,
+        data: Union[pd.DataFrame, np.ndarray, str],
+        version: Optional[Hashable] = None
+        ) -> dict:
+        """
+        Calcule le résumé statistique de la donnée chargée.
+
+        Args:
+            data (Union[pd.DataFrame,np.ndarray,str]) : Les données à résumer.
+            version (Hashable | None) : La version des données, pour réutiliser le hachage des lignes.
+
+        Returns:
+            dict: L'ensemble des informations résumé dans un dictionnaire.
+        """
         if isinstance(data, pd.DataFrame):
             return {
                 'shape': data.shape,
                 'columns': list(data.columns),
-                'duplicates': int(data.duplicated().sum()),
+                'duplicates': self.doublons.compter(data, version),
                 'missing_values': data.isnull().sum().to_dict(),
                 'types': data.dtypes.astype(str).to_dict(),
                 # 'infos': data.info(),
@@ -89,6 +180,28 @@ class Analyse:
         else:
             raise TypeError("Type de données non supporté pour le résumé.")
 
+    def summarize_par_colonne(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Retourne le résumé des données sous forme tabulaire, une ligne par colonne.
+
+        Args:
+            df (pd.DataFrame) : Les données à résumer.
+
+        Returns:
+            pd.DataFrame: Le nom, le type, les valeurs manquantes et la nature de chaque colonne.
+        """
+        if not isinstance(df, pd.DataFrame):
+            raise TypeError("Les données ne sont pas tabulaires (DataFrame).")
+
+        num_col = set(df.select_dtypes(include='number').columns)
+
+        return pd.DataFrame({
+            'colonne': [str(col) for col in df.columns],
+            'type': df.dtypes.astype(str).to_list(),
+            'valeurs_manquantes': df.isnull().sum().to_list(),
+            'numerique': [col in num_col for col in df.columns],
+        })
+
     def get_descriptive_stats(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Fait des statistiques descriptives pour les colonnes numériques et catégorielles.
@@ -103,6 +216,20 @@ class Analyse:
             raise TypeError("Les données ne sont pas tabulaires (DataFrame).")
 
         numeric_stats = df.describe(include=np.number).transpose()
-        categorical_stats = df.describe(include='object').transpose()
+        categorical_stats = df.describe(include=['object', 'category']).transpose()
 
         return pd.concat([numeric_stats, categorical_stats])
+
+    def get_descriptive_stats_flux(self, morceaux: Iterable[pd.DataFrame]) -> pd.DataFrame:
+        """
+        Fait des statistiques descriptives morceau par morceau, sans charger
+        tout le jeu de données en mémoire (par exemple avec `DataLoader.iterer_morceaux_csv`).
+        Les quantiles et le nombre de valeurs distinctes sont approchés.
+
+        Args:
+            morceaux (Iterable[pd.DataFrame]) : Les morceaux de données à résumer.
+
+        Returns:
+            pd.DataFrame: Les statistiques de chaque colonne.
+        """
+        return StatistiquesFlux().consommer_tout(morceaux).resume()
@@ -1,27 +1,184 @@
 """
 Détecter automatiquement la meilleure méthode de réduction de dimension (ACP, t-SNE, UMAP)
 selon la nature et la structure du jeu de données.
+
+`AutoSelector.detecter_methode` choisit la méthode avec une heuristique immédiate ;
+`AutoSelector.selectionner` évalue les trois méthodes sur un échantillon, en
+parallèle dans le groupe de processus de réduction, et retient la mieux notée
+parmi celles dont la durée prévue sur le jeu complet tient dans un budget.
 """
 
+import dataclasses
+import time
 import warnings
+from concurrent.futures import ThreadPoolExecutor
 from typing import (
-    Any,
+    Optional,
     Union,
     Literal,)
 from pydantic import ConfigDict
 from pydantic.dataclasses import dataclass
 import pandas as pd
 import numpy as np
-from sklearn.metrics import pairwise_distances
-from sklearn.preprocessing import StandardScaler
+from modules.executeur_reduction import (
+    ExecuteurReduction,
+    Methode,
+    reduire_localement,
+    )
+from modules.index_voisins import conservation_voisinage
 
-# Import des méthodes de réduction
-from modules.methode_acp import MethodeACP
-from modules.methode_tsne import MethodeTSNE
-from modules.methode_umap import MethodeUMAP
+# sklearn n'est importé qu'à la première détection (démarrage de l'API).
+# pylint: disable=import-outside-toplevel
 
 warnings.filterwarnings("ignore")
 
+# Nombre de lignes de l'échantillon sur lequel les méthodes sont évaluées.
+TAILLE_EVALUATION = 500
+# Part du budget accordée à l'évaluation des méthodes, le reste étant laissé à la réduction.
+PART_EVALUATION = 0.25
+# Les méthodes évaluées, de la moins coûteuse à la plus coûteuse.
+CANDIDATS: tuple[Methode, ...] = ('acp', 'tsne', 'umap')
+
+@dataclasses.dataclass
+class ResultatSelection:
+    """La méthode retenue par `AutoSelector.selectionner`.
+
+    Args:
+        methode (Literal): La méthode de réduction retenue.
+        score (float | None): Son score de préservation de la structure, entre -1 et 1
+        (`None` si aucune méthode n'a pu être évaluée dans le budget).
+        duree_prevue (float | None): Sa durée prévue sur le jeu complet, en secondes.
+        parametres (dict): Les hyperparamètres qui font tenir la méthode dans le budget
+        restant (le nombre de repères de t-SNE), à lui transmettre pour la réduction.
+    """
+
+    methode: Methode
+    score: Optional[float] = None
+    duree_prevue: Optional[float] = None
+    parametres: dict = dataclasses.field(default_factory=dict)
+
+def score_structure(x_proj: np.ndarray, x_original: np.ndarray, voisins: int = 10) -> float:
+    """Calcule une mesure de qualité structurelle entre l'espace original et réduit :
+    la moyenne de la corrélation des distances (structure globale) et de la part
+    des plus proches voisins conservés (structure locale). Plus le score est proche
+    de 1, plus la structure est bien préservée.
+
+    Args:
+        x_proj (np.ndarray): Les données réduites.
+        x_original (np.ndarray): Les mêmes lignes dans l'espace original.
+        voisins (int): Le nombre de voisins comparés pour la structure locale.
+
+    Returns:
+        float: Le score de structure.
+    """
+
+    from sklearn.metrics import pairwise_distances
+    from sklearn.neighbors import NearestNeighbors
+
+    idx = np.random.default_rng(42).choice(
+        len(x_original), size=min(300, len(x_original)), replace=False)
+    dist_orig = pairwise_distances(x_original[idx])
+    dist_proj = pairwise_distances(x_proj[idx])
+    # Une projection constante n'a pas de corrélation définie.
+    corr = np.nan_to_num(np.corrcoef(dist_orig.flatten(), dist_proj.flatten())[0, 1])
+
+    voisins = min(voisins, len(x_original) - 1)
+    _, indices = NearestNeighbors(n_neighbors=voisins + 1).fit(x_original).kneighbors(x_original)
+    return float((corr + conservation_voisinage(indices, x_proj, voisins)) / 2)
+
+def _evaluer_candidat(
+    methode: Methode,
+    x: np.ndarray,
+    axes: int,
+    echeance: float = float("inf")
+    ) -> tuple[float, float]:
+    """Réduit un échantillon avec une méthode et note le résultat
+    (dans un processus du groupe de réduction).
+
+    Args:
+        methode (Literal): La méthode évaluée.
+        x (np.ndarray): L'échantillon centré réduit.
+        axes (int): Le nombre de dimensions de réduction.
+        echeance (float): L'heure (`time.time()`) après laquelle l'évaluation n'est plus
+        commencée (elle attendait un processus libre) ; l'appelant n'attend pas au-delà.
+
+    Raises:
+        TimeoutError: Si l'évaluation commence après l'échéance.
+
+    Returns:
+        tuple[float, float]: Le score de structure et la durée de la réduction, en secondes.
+    """
+
+    if time.time() >= echeance:
+        raise TimeoutError("\nÉvaluation commencée après l'échéance.\n")
+
+    debut = time.perf_counter()
+    x_proj = np.asarray(reduire_localement(methode, x, axes))
+    duree = time.perf_counter() - debut
+    return score_structure(x_proj, x), duree
+
+def reperes_tsne(
+    n: int,
+    budget_secondes: Optional[float] = None,
+    coeurs: Optional[int] = None
+    ) -> int:
+    """Retourne le nombre de points que t-SNE réduit dans un budget (voir
+    `MethodeTSNE.nombre_de_reperes`), arrondi au millier inférieur pour que la clé
+    du cache des projections ne change pas d'un appel à l'autre.
+
+    Args:
+        n (int): Le nombre de lignes du jeu complet.
+        budget_secondes (float | None): Le budget de t-SNE (celui de `MethodeTSNE` par défaut).
+        coeurs (int | None): Les coeurs du processus qui calculera t-SNE
+        (par défaut ceux de ce processus).
+
+    Returns:
+        int: Le nombre de repères (`n` si toutes les lignes tiennent dans le budget).
+    """
+
+    from modules.methode_tsne import (
+        REPERES_MIN,
+        MethodeTSNE,
+        )
+
+    tsne = MethodeTSNE(df=np.empty((0, 0)), coeurs=coeurs)
+    if budget_secondes is not None:
+        tsne.budget_secondes = max(budget_secondes, 0.0)
+    reperes = tsne.nombre_de_reperes(n)
+    return reperes if reperes >= n else max(REPERES_MIN, reperes - reperes % REPERES_MIN)
+
+def duree_prevue(
+    methode: Methode,
+    duree_echantillon: float,
+    m: int,
+    n: int,
+    budget_secondes: Optional[float] = None,
+    coeurs: Optional[int] = None
+    ) -> float:
+    """Extrapole la durée d'une réduction de l'échantillon (m lignes) au jeu complet (n lignes) :
+    linéaire pour l'ACP, en n log n pour UMAP et pour t-SNE, dont seuls les repères
+    sont réduits au-delà de son budget (voir `reperes_tsne`).
+
+    Args:
+        methode (Literal): La méthode de réduction.
+        duree_echantillon (float): La durée mesurée sur l'échantillon, en secondes.
+        m (int): Le nombre de lignes de l'échantillon.
+        n (int): Le nombre de lignes du jeu complet.
+        budget_secondes (float | None): Le budget accordé à la réduction
+        (celui de `MethodeTSNE` par défaut).
+        coeurs (int | None): Les coeurs du processus qui calculera la réduction.
+
+    Returns:
+        float: La durée prévue sur le jeu complet, en secondes.
+    """
+
+    if methode == 'acp' or m < 2:
+        return duree_echantillon * n / max(m, 1)
+
+    if methode == 'tsne':
+        n = reperes_tsne(n, budget_secondes, coeurs)
+    return float(duree_echantillon * (n * np.log(max(n, 2))) / (m * np.log(m)))
+
 @dataclass(config=ConfigDict(arbitrary_types_allowed=True))
 class AutoSelector:
     """Cette classe choisi la méthode de réduction automatiquement sans l'intervention humaine.
@@ -62,43 +219,29 @@ class AutoSelector:
         moyenne_corr = np.mean(corr[np.triu_indices_from(corr, k=1)])
         return moyenne_corr
 
-    def _score_structure(self, x_proj: np.ndarray, x_original: np.ndarray) -> float:
-        """
-        Calcule une mesure de qualité structurelle entre distances dans l’espace original et réduit.
-        Plus la corrélation est proche de 1, plus la structure est bien préservée.
-        
-        Args:
-            x_proj (np.ndarray) : Projection suivant le premier vecteur unitaire.
-            x_original (np.ndarray) :
-
-        Returns:
-            float : La corrélation est retourné.
-        """
-        idx = np.random.choice(len(x_original), size=min(300, len(x_original)), replace=False)
-        dist_orig = pairwise_distances(x_original[idx])
-        dist_proj = pairwise_distances(x_proj[idx])
-        corr = np.corrcoef(dist_orig.flatten(), dist_proj.flatten())[0, 1]
-        return corr
-
     def detecter_methode(self) -> Literal['acp', 'tsne', 'umap']:
         """
-        Détermine automatiquement la meilleure méthode selon :
-            - le nombre de colonnes
+        Détermine immédiatement la méthode pressentie selon :
+            - le nombre de lignes et de colonnes
             - la linéarité
-            - un score de préservation de la structure après réduction
+        (`selectionner` la valide par un score de préservation de la structure).
 
         Returns:
-            str : 
+            str : La méthode pressentie.
         """
 
+        from sklearn.preprocessing import StandardScaler
+
         df_sample = self._echantillonner()
         df_num = df_sample.select_dtypes(include=[np.number])
         _x = StandardScaler().fit_transform(df_num.values)
 
-        n, p = _x.shape
+        # La taille du jeu complet (et non celle de l'échantillon) guide le choix :
+        # t-SNE n'est pressenti que pour des données de taille modérée.
+        n, p = len(self.df), _x.shape[1]
         score_linearite = self._calculer_score_linearite(df_num)
 
-        print(f"\nDonnées : {n} échantillons, {p} variables\n")
+        print(f"\nDonnées : {n} lignes ({len(_x)} échantillons), {p} variables\n")
         print(f"\nScore de linéarité moyenne : {score_linearite:.3f}\n")
 
         # Étape 1 — Choix initial heuristique
@@ -112,30 +255,84 @@ class AutoSelector:
 
         print(f"\nMéthode initialement pressentie : {methode.upper()}\n")
 
-        # Étape 2 — Validation par score de qualité structurelle (test rapide)
-        # resultats: dict[str, Any] = {}
-        # try:
-        #     # ACP
-        #     x_acp = MethodeACP(df_num).acp_reduction(nombre_dimenssion=self.nombre_de_dimension)
-        #     resultats["acp"] = self._score_structure(x_acp, _x)
-
-        #     # t-SNE (échantillon plus petit si dataset volumineux)
-        #     x_small = _x[: min(700, len(_x))]
-        #     x_tsne = MethodeTSNE(
-        #         df=pd.DataFrame(x_small)).tsne_reduction(
-        #             nombre_de_dimension=self.nombre_de_dimension)
-        #     resultats["tsne"] = self._score_structure(x_tsne, x_small)
-
-        #     # UMAP
-        #     x_umap = MethodeUMAP(df_num).umap_reduction(nombre_de_dimension=2)
-        #     resultats["umap"] = self._score_structure(x_umap, _x)
-        # except ImportError as e:
-        #     print(f"\nErreur durant l’évaluation structurelle : {e}\n")
-
-        # if resultats:
-        #     meilleure_methode = max(resultats, key=resultats.__getitem__)
-        #     print(f"\nScores structurels : {resultats}\n")
-        #     print(f"\nMéthode sélectionnée : {meilleure_methode.upper()}\n")
-        #     return meilleure_methode
-
         return methode
+
+    def selectionner(
+        self,
+        budget_secondes: float,
+        executeur: Optional[ExecuteurReduction] = None
+        ) -> ResultatSelection:
+        """Évalue l'ACP, t-SNE et UMAP sur un échantillon et retient la méthode
+        la mieux notée dont la durée prévue sur le jeu complet tient dans le budget.
+
+        L'évaluation dispose de `PART_EVALUATION` du budget : le résultat de chaque
+        méthode n'est attendu que jusqu'à l'échéance (`Future.result(timeout=...)`),
+        aussi dans un fil de l'API où aucun signal ne peut interrompre le calcul, et
+        les méthodes qui ne l'ont pas terminée à temps sont écartées. Si aucune méthode ne
+        tient dans le budget restant, la plus rapide est retenue ; si aucune n'a pu être
+        évaluée, l'ACP. Le budget restant est transmis à la méthode retenue (`parametres`).
+
+        Args:
+            budget_secondes (float): Le temps accordé à la sélection et à la réduction, en secondes.
+            executeur (ExecuteurReduction | None): Le groupe de processus où les méthodes
+            sont évaluées en parallèle (sinon l'une après l'autre dans un fil du processus courant).
+
+        Returns:
+            ResultatSelection: La méthode retenue, son score et sa durée prévue.
+        """
+
+        from sklearn.preprocessing import StandardScaler
+
+        debut = time.perf_counter()
+        echeance = debut + budget_secondes * PART_EVALUATION
+        # La même échéance, lisible dans les processus du groupe.
+        echeance_murale = time.time() + budget_secondes * PART_EVALUATION
+
+        df_num = self._echantillonner().select_dtypes(include=[np.number])
+        x = StandardScaler().fit_transform(df_num.to_numpy(dtype=np.float64)[:TAILLE_EVALUATION])
+        n, m = len(self.df), len(x)
+
+        # Sans groupe de processus, les méthodes sont évaluées l'une après l'autre dans
+        # un fil, pour que l'attente de leurs résultats puisse s'arrêter à l'échéance.
+        fil = ThreadPoolExecutor(max_workers=1) if executeur is None else None
+        soumettre = executeur.executer if executeur is not None else fil.submit
+        futurs = {
+            methode: soumettre(
+                _evaluer_candidat, methode, x, self.nombre_de_dimension, echeance_murale)
+            for methode in CANDIDATS}
+
+        evaluations: dict[str, tuple[float, float]] = {}
+        try:
+            for methode, futur in futurs.items():
+                try:
+                    evaluations[methode] = futur.result(
+                        timeout=max(0.0, echeance - time.perf_counter()))
+                except TimeoutError:
+                    # Une évaluation en attente est retirée de la file ; une évaluation
+                    # commencée se termine sans être attendue.
+                    futur.cancel()
+                except Exception as e: # pylint: disable=broad-exception-caught
+                    print(f"\nErreur durant l’évaluation structurelle de {methode} : {e}\n")
+        finally:
+            if fil is not None:
+                fil.shutdown(wait=False, cancel_futures=True)
+
+        restant = budget_secondes - (time.perf_counter() - debut)
+        # La réduction sera calculée dans un processus du groupe, avec sa part des coeurs.
+        coeurs = executeur.coeurs_par_processus() if executeur is not None else None
+        resultats = [
+            ResultatSelection(
+                methode,
+                score,
+                duree_prevue(methode, duree, m, n, restant, coeurs),
+                {'max_points': reperes_tsne(n, restant, coeurs)} if methode == 'tsne' else {})
+            for methode, (score, duree) in evaluations.items()]
+
+        if not resultats:
+            return ResultatSelection('acp')
+        dans_budget = [r for r in resultats if r.duree_prevue <= restant]
+        if dans_budget:
+            resultat = max(dans_budget, key=lambda r: r.score)
+        else:
+            resultat = min(resultats, key=lambda r: r.duree_prevue)
+        return resultat
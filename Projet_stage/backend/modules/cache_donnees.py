@@ -0,0 +1,234 @@
+"""Ce module conserve sur le disque les tableaux de données déjà analysés
+afin qu'un nouveau chargement du même fichier ne soit qu'une lecture
+en mémoire projetée (memory-map) au format Arrow/Feather.
+
+Classes:
+
+    CacheDonnees:
+        Cache disque des tableaux de données indexé par l'empreinte du fichier source
+        (chemin + taille + date de modification, et optionnellement le contenu).
+        Les fichiers les moins récemment utilisés sont supprimés lorsque la taille
+        totale du cache dépasse `taille_max_octets`.
+
+        Methodes:
+            empreinte(self, file_path: str) -> str
+            lire(self, file_path: str, memoire_max: int | None = None) -> pd.DataFrame | None
+            ecrire(self, file_path: str, df: pd.DataFrame) -> None
+            chemin_annexe(self, file_path: str, nom: str) -> Path
+            statistiques(self) -> dict
+            vider(self) -> None
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+import hashlib
+import os
+import uuid
+import pandas as pd
+
+try:
+    from pyarrow import feather
+except ImportError: # pyarrow est optionnel, le cache est alors désactivé.
+    feather = None
+
+# Les formats dont l'analyse est assez coûteuse pour être mise en cache.
+FORMATS_EN_CACHE = ('csv', 'xls', 'xlsx', 'json', 'yaml', 'yml')
+
+@dataclass
+class CacheDonnees:
+    """Cache disque des tableaux de données chargés, indexé par l'empreinte du fichier source.
+
+    Args:
+        dossier (str): Le dossier où sont stockés les fichiers Feather du cache.
+        taille_max_octets (int): La taille totale maximale du cache (2 Gio par défaut).
+        hachage_contenu (bool): Ajoute le hachage du contenu du fichier à l'empreinte
+        (`False` par défaut, plus sûr mais plus lent).
+        succes (int): Le nombre de lectures réussies depuis le cache.
+        echecs (int): Le nombre de lectures absentes du cache.
+    """
+
+    dossier: str
+    taille_max_octets: int = 2 * 1024 ** 3
+    hachage_contenu: bool = False
+    succes: int = 0
+    echecs: int = 0
+
+    def __post_init__(self) -> None:
+        """Crée le dossier du cache s'il n'existe pas.
+        """
+        os.makedirs(self.dossier, exist_ok=True)
+
+    def empreinte(self, file_path: str) -> str:
+        """Calcule l'empreinte d'un fichier à partir de son chemin absolu,
+        de sa taille et de sa date de modification.
+
+        Args:
+            file_path (str): Le chemin du fichier source.
+
+        Returns:
+            str: L'empreinte hexadécimale du fichier.
+        """
+
+        info = os.stat(file_path)
+        hachage = hashlib.sha256(
+            f"{os.path.abspath(file_path)}|{info.st_size}|{info.st_mtime_ns}".encode("utf-8"))
+
+        if self.hachage_contenu:
+            with open(file_path, 'rb') as f:
+                for bloc in iter(lambda: f.read(1024 * 1024), b""):
+                    hachage.update(bloc)
+
+        return hachage.hexdigest()
+
+    def _chemin(self, file_path: str) -> Path:
+        """Retourne le chemin du fichier Feather correspondant à un fichier source.
+
+        Args:
+            file_path (str): Le chemin du fichier source.
+
+        Returns:
+            Path: Le chemin du fichier dans le cache.
+        """
+        return Path(self.dossier) / f"{self.empreinte(file_path)}.feather"
+
+    def lire(self, file_path: str, memoire_max: Optional[int] = None) -> Optional[pd.DataFrame]:
+        """Lit le tableau d'un fichier source depuis le cache s'il y est présent.
+
+        Args:
+            file_path (str): Le chemin du fichier source.
+            memoire_max (int | None): Le plafond mémoire du tableau, en octets
+            (vérifié avant sa conversion en DataFrame).
+
+        Raises:
+            MemoryError: Une erreur est levée si le tableau dépasse `memoire_max`.
+
+        Returns:
+            pd.DataFrame | None: Le tableau en cache, ou `None` s'il est absent.
+        """
+
+        chemin = self._chemin(file_path) if feather is not None else None
+
+        try:
+            if chemin is None:
+                raise FileNotFoundError(file_path)
+            # Mettre à jour la date d'utilisation pour l'éviction LRU.
+            os.utime(chemin)
+            table = feather.read_table(chemin, memory_map=True)
+        except FileNotFoundError:
+            # Absent, ou évincé par un autre processus depuis l'appel.
+            self.echecs += 1
+            return None
+
+        if memoire_max is not None and table.nbytes > memoire_max:
+            raise MemoryError(
+                f"Le plafond mémoire de {memoire_max} octets est dépassé "
+                f"par le tableau en cache ({table.nbytes} octets).")
+        self.succes += 1
+
+        return table.to_pandas()
+
+    def ecrire(self, file_path: str, df: pd.DataFrame) -> None:
+        """Écrit le tableau d'un fichier source dans le cache, puis supprime
+        les entrées les moins récemment utilisées si la taille maximale est dépassée.
+
+        Args:
+            file_path (str): Le chemin du fichier source.
+            df (pd.DataFrame): Le tableau chargé depuis ce fichier.
+        """
+
+        if feather is None:
+            return None
+
+        chemin = self._chemin(file_path)
+        # Un nom propre à chaque écriture : plusieurs processus ou fils peuvent
+        # mettre en cache le même fichier en même temps.
+        chemin_temporaire = chemin.with_suffix(f".{os.getpid()}.{uuid.uuid4().hex}.tmp")
+
+        try:
+            # Sans compression pour permettre une lecture en mémoire projetée.
+            feather.write_feather(
+                df.reset_index(drop=True),
+                chemin_temporaire,
+                compression="uncompressed")
+        except (ValueError, TypeError, NotImplementedError) as e:
+            # Colonnes non représentables en Arrow : le tableau n'est pas mis en cache.
+            print(f"\n[INFO] Le tableau n'est pas mis en cache : {e}\n")
+            chemin_temporaire.unlink(missing_ok=True)
+            return None
+
+        try:
+            os.replace(chemin_temporaire, chemin)
+        except FileNotFoundError:
+            # Supprimé par une éviction ou un `vider` concurrent : rien n'est mis en cache.
+            return None
+        self._evincer()
+        return None
+
+    def chemin_annexe(self, file_path: str, nom: str) -> Path:
+        """Retourne le chemin d'un fichier annexe d'un jeu de données (par exemple
+        un imputeur appris), indexé par la même empreinte que son tableau : il est
+        invalidé avec lui quand le fichier source change, et supprimé avec lui du cache.
+
+        Args:
+            file_path (str): Le chemin du fichier source.
+            nom (str): Le nom de l'annexe, avec son extension (par exemple `imputeur.json`).
+
+        Returns:
+            Path: Le chemin du fichier annexe dans le cache.
+        """
+        return Path(self.dossier) / f"{self.empreinte(file_path)}.{nom}"
+
+    def _supprimer(self, fichier: Path) -> None:
+        """Supprime un fichier Feather du cache et ses fichiers annexes.
+
+        Args:
+            fichier (Path): Le fichier Feather à supprimer.
+        """
+        for annexe in Path(self.dossier).glob(f"{fichier.stem}.*"):
+            annexe.unlink(missing_ok=True)
+
+    def _evincer(self) -> None:
+        """Supprime les fichiers les moins récemment utilisés jusqu'à ce que
+        la taille totale du cache soit inférieure à `taille_max_octets`.
+        """
+
+        fichiers = sorted(
+            Path(self.dossier).glob("*.feather"),
+            key=lambda f: f.stat().st_mtime_ns)
+        taille_totale = sum(f.stat().st_size for f in fichiers)
+
+        for fichier in fichiers:
+            if taille_totale <= self.taille_max_octets:
+                break
+            taille_totale -= fichier.stat().st_size
+            self._supprimer(fichier)
+
+    def statistiques(self) -> dict:
+        """Retourne les compteurs du cache pour permettre son dimensionnement.
+
+        Returns:
+            dict: Les succès, les échecs, le taux de succès, le nombre de fichiers et la taille.
+        """
+
+        fichiers = list(Path(self.dossier).glob("*.feather"))
+        total = self.succes + self.echecs
+
+        return {
+            'succes': self.succes,
+            'echecs': self.echecs,
+            'taux_de_succes': self.succes / total if total else 0.0,
+            'fichiers': len(fichiers),
+            'octets': sum(f.stat().st_size for f in fichiers),
+            'taille_max_octets': self.taille_max_octets,
+        }
+
+    def vider(self) -> None:
+        """Supprime tous les fichiers du cache (annexes comprises) et remet les compteurs à zéro.
+        """
+
+        # Les tableaux Feather et leurs fichiers annexes.
+        for fichier in Path(self.dossier).glob("*.*"):
+            fichier.unlink(missing_ok=True)
+        self.succes = 0
+        self.echecs = 0
@@ -0,0 +1,240 @@
+"""Ce module conserve sur le disque les projections (résultats de l'ACP, de t-SNE
+ou d'UMAP) déjà calculées, pour qu'une nouvelle vue graphique des mêmes colonnes
+(nouveau titre, couleurs ou mise en page) ne refasse pas la réduction.
+
+Classes:
+
+    CacheProjections:
+        Cache disque des projections indexé par l'empreinte des valeurs des colonnes,
+        la méthode, le nombre de dimensions et les hyperparamètres. Les projections
+        sont stockées en `float32` au format `.npy`, et les moins récemment utilisées
+        sont supprimées lorsque la taille totale dépasse `taille_max_octets`. Les
+        informations de la méthode (variance expliquée et contributions pour l'ACP)
+        sont conservées à côté, dans un fichier `.json` du même nom.
+
+        Methodes:
+            cle(
+                self,
+                df: pd.DataFrame | np.ndarray,
+                methode: str,
+                axes: int,
+                parametres: Optional[dict] = None
+                ) -> str
+            lire(self, cle: str) -> np.ndarray | None
+            lire_informations(self, cle: str) -> dict | None
+            ecrire(self, cle: str, x: np.ndarray, informations: Optional[dict] = None) -> np.ndarray
+            statistiques(self) -> dict
+            vider(self) -> None
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import (
+    ClassVar,
+    Optional,
+    Union,
+    )
+import hashlib
+import json
+import os
+import uuid
+import numpy as np
+import pandas as pd
+
+# Version du format des projections, à incrémenter quand le résultat d'une
+# méthode change (les anciennes entrées ne sont alors plus relues).
+VERSION_PROJECTIONS = 2
+
+@dataclass
+class CacheProjections:
+    """Cache disque des projections calculées par les méthodes de réduction.
+
+    Args:
+        dossier (str): Le dossier où sont stockés les fichiers `.npy` du cache.
+        taille_max_octets (int): La taille totale maximale du cache (512 Mio par défaut).
+        succes (int): Le nombre de lectures réussies depuis le cache.
+        echecs (int): Le nombre de lectures absentes du cache.
+    """
+
+    # Extension des fichiers du cache.
+    EXTENSION: ClassVar[str] = "npy"
+
+    dossier: str
+    taille_max_octets: int = 512 * 1024 ** 2
+    succes: int = 0
+    echecs: int = 0
+
+    def __post_init__(self) -> None:
+        """Crée le dossier du cache s'il n'existe pas.
+        """
+        os.makedirs(self.dossier, exist_ok=True)
+
+    def cle(
+        self,
+        df: Union[pd.DataFrame, np.ndarray],
+        methode: str,
+        axes: int,
+        parametres: Optional[dict] = None
+        ) -> str:
+        """Calcule la clé d'une projection à partir des valeurs des colonnes
+        (sans l'index), de la méthode, du nombre de dimensions et des hyperparamètres.
+
+        Args:
+            df (pd.DataFrame | np.ndarray): Les données à réduire.
+            methode (str): La méthode de réduction (`acp`, `tsne` ou `umap`).
+            axes (int): Le nombre de dimensions de réduction.
+            parametres (dict | None): Les hyperparamètres de la méthode.
+
+        Returns:
+            str: La clé hexadécimale de la projection.
+        """
+
+        df = pd.DataFrame(df) if isinstance(df, np.ndarray) else df
+        entete = {
+            'version': VERSION_PROJECTIONS,
+            'methode': methode,
+            'axes': axes,
+            'parametres': parametres or {},
+            'colonnes': [str(col) for col in df.columns],
+            'types': df.dtypes.astype(str).tolist(),
+        }
+        hachage = hashlib.sha256(json.dumps(entete, sort_keys=True, default=str).encode("utf-8"))
+        hachage.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+        return hachage.hexdigest()
+
+    def _chemin(self, cle: str) -> Path:
+        """Retourne le chemin du fichier d'une entrée du cache.
+        """
+        return Path(self.dossier) / f"{cle}.{self.EXTENSION}"
+
+    def _chemin_informations(self, cle: str) -> Path:
+        """Retourne le chemin du fichier des informations d'une entrée du cache.
+        """
+        return Path(self.dossier) / f"{cle}.json"
+
+    def lire(self, cle: str) -> Optional[np.ndarray]:
+        """Lit une projection depuis le cache si elle y est présente.
+
+        Args:
+            cle (str): La clé de la projection (voir `cle`).
+
+        Returns:
+            np.ndarray | None: La projection en `float32`, ou `None` si elle est absente.
+        """
+
+        chemin = self._chemin(cle)
+        try:
+            x = np.load(chemin)
+        except (OSError, ValueError, EOFError):
+            self.echecs += 1
+            return None
+
+        try:
+            # Mettre à jour la date d'utilisation pour l'éviction LRU.
+            os.utime(chemin)
+        except FileNotFoundError:
+            # Évincée par un autre processus depuis la lecture : absente du cache.
+            self.echecs += 1
+            return None
+        self.succes += 1
+        return x
+
+    def lire_informations(self, cle: str) -> Optional[dict]:
+        """Lit les informations de la méthode conservées avec une projection.
+
+        Args:
+            cle (str): La clé de la projection (voir `cle`).
+
+        Returns:
+            dict | None: Les informations, ou `None` si elles sont absentes.
+        """
+
+        try:
+            with open(self._chemin_informations(cle), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def ecrire(self, cle: str, x: np.ndarray, informations: Optional[dict] = None) -> np.ndarray:
+        """Écrit une projection dans le cache en `float32`, puis supprime les
+        entrées les moins récemment utilisées si la taille maximale est dépassée.
+
+        Args:
+            cle (str): La clé de la projection (voir `cle`).
+            x (np.ndarray): La projection calculée.
+            informations (dict | None): Les informations de la méthode, écrites
+            avant la projection pour qu'une projection relue ait toujours les siennes.
+
+        Returns:
+            np.ndarray: La projection en `float32`, telle qu'elle sera relue du cache.
+        """
+
+        x = np.ascontiguousarray(x, dtype=np.float32)
+        chemin = self._chemin(cle)
+
+        if informations is not None:
+            chemin_informations = self._chemin_informations(cle)
+            temporaire = chemin_informations.with_suffix(f".{uuid.uuid4().hex}.tmp")
+            with open(temporaire, 'w', encoding='utf-8') as f:
+                json.dump(informations, f)
+            os.replace(temporaire, chemin_informations)
+        # Un nom propre à chaque écriture : plusieurs processus ou fils peuvent
+        # mettre en cache la même projection en même temps.
+        chemin_temporaire = chemin.with_suffix(f".{os.getpid()}.{uuid.uuid4().hex}.tmp")
+
+        with open(chemin_temporaire, 'wb') as f:
+            np.save(f, x)
+        os.replace(chemin_temporaire, chemin)
+        self._evincer()
+        return x
+
+    def _evincer(self) -> None:
+        """Supprime les projections les moins récemment utilisées jusqu'à ce que
+        la taille totale du cache soit inférieure à `taille_max_octets`.
+        """
+
+        fichiers = []
+        for fichier in Path(self.dossier).glob(f"*.{self.EXTENSION}"):
+            try:
+                fichiers.append((fichier.stat(), fichier))
+            except FileNotFoundError:
+                # Supprimé entre-temps par un autre processus.
+                continue
+        fichiers.sort(key=lambda f: f[0].st_mtime_ns)
+        taille_totale = sum(info.st_size for info, _ in fichiers)
+
+        for info, fichier in fichiers:
+            if taille_totale <= self.taille_max_octets:
+                break
+            taille_totale -= info.st_size
+            fichier.unlink(missing_ok=True)
+            fichier.with_suffix(".json").unlink(missing_ok=True)
+
+    def statistiques(self) -> dict:
+        """Retourne les compteurs du cache pour permettre son dimensionnement.
+
+        Returns:
+            dict: Les succès, les échecs, le taux de succès, le nombre de fichiers et la taille.
+        """
+
+        fichiers = list(Path(self.dossier).glob(f"*.{self.EXTENSION}"))
+        total = self.succes + self.echecs
+
+        return {
+            'succes': self.succes,
+            'echecs': self.echecs,
+            'taux_de_succes': self.succes / total if total else 0.0,
+            'fichiers': len(fichiers),
+            'octets': sum(f.stat().st_size for f in fichiers),
+            'taille_max_octets': self.taille_max_octets,
+        }
+
+    def vider(self) -> None:
+        """Supprime toutes les projections du cache et remet les compteurs à zéro.
+        """
+
+        for fichier in Path(self.dossier).glob(f"*.{self.EXTENSION}"):
+            fichier.unlink(missing_ok=True)
+            fichier.with_suffix(".json").unlink(missing_ok=True)
+        self.succes = 0
+        self.echecs = 0
@@ -1,10 +1,12 @@
-"""Ce module se charge de changer les cellules
-vides de type différent de `None` à `None` afin
-de permettre le formatage des dataframes en JSON.
+"""Ce module se charge de rendre les cellules vides ou infinies
+d'un dataframe compatibles avec le formatage en JSON.
+
+Les valeurs infinies des colonnes décimales sont remplacées par `NaN`
+en un seul passage par colonne, sans changer le type des colonnes :
+la conversion de `NaN` en `null` est faite par le sérialiseur.
 
 Returns:
-    pd.DataFrame: Un dataframe est retourné avec
-    les champs vide à `None`.
+    pd.DataFrame: Un dataframe est retourné sans valeurs infinies.
 """
 
 import pandas as pd
@@ -12,15 +14,51 @@ import numpy as np
 
 class CleanDataframeForJson:
     """Cette classe nettoie DataFrame
+
+    Args:
+        valeurs_manquantes (dict[str, int]): Le nombre de valeurs manquantes ou infinies
+        par colonne, calculé lors du dernier nettoyage.
     """
+
+    def __init__(self) -> None:
+        self.valeurs_manquantes: dict[str, int] = {}
+
     def clean_dataframe_for_json(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Nettoie un DataFrame pour le rendre compatible JSON :
-        - remplace NaN, inf et -inf par None
+        """Nettoie un DataFrame pour le rendre compatible JSON en un seul passage :
+        - remplace inf et -inf par NaN dans les colonnes décimales uniquement
+        (un seul `np.isfinite` par colonne, les types numériques sont conservés) ;
+        - compte les valeurs manquantes de chaque colonne pendant ce même passage.
+        Le DataFrame d'origine n'est jamais modifié, et n'est copié que s'il contient
+        des valeurs infinies.
         """
-        if df.isnull().values.any():
+
+        self.valeurs_manquantes = {}
+        colonnes_modifiees: dict[int, np.ndarray] = {}
+
+        for position, (col, dtype) in enumerate(df.dtypes.items()):
+            if dtype.kind == "f":
+                valeurs = df.iloc[:, position].to_numpy()
+                finies = np.isfinite(valeurs)
+                non_finies = len(valeurs) - int(np.count_nonzero(finies))
+                if non_finies:
+                    self.valeurs_manquantes[col] = non_finies
+                    # Ne remplacer que si des infinis sont présents parmi les non finis.
+                    if not np.isnan(valeurs[~finies]).all():
+                        colonnes_modifiees[position] = np.where(finies, valeurs, np.nan)
+            elif dtype.kind not in "iub":
+                manquantes = int(df.iloc[:, position].isna().sum())
+                if manquantes:
+                    self.valeurs_manquantes[col] = manquantes
+
+        if self.valeurs_manquantes:
             print("[INFO] NaN détectés dans les colonnes suivantes :")
-            print(df.isnull().sum()[df.isnull().sum() > 0])
-        df = df.replace([float('inf'), float('-inf')], None)
-        df = df.replace({np.nan: None})
-        df = df.where(pd.notnull(df), None)
+            print(self.valeurs_manquantes)
+
+        if not colonnes_modifiees:
+            return df
+
+        # Copie superficielle : seules les colonnes modifiées sont remplacées.
+        df = df.copy(deep=False)
+        for position, valeurs in colonnes_modifiees.items():
+            df.isetitem(position, valeurs)
         return df
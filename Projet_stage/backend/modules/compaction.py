@@ -0,0 +1,106 @@
+"""Ce module réduit la mémoire occupée par un tableau de données après
+son chargement, sans perte d'information :
+
+- les entiers sont convertis dans le plus petit type entier suffisant ;
+- les décimaux passent en `float32` seulement si aucune valeur n'est modifiée ;
+- les colonnes texte à faible cardinalité deviennent des `category` ;
+- les autres colonnes texte utilisent le type chaîne stocké en Arrow.
+
+Classes:
+
+    CompactionDataFrame:
+        Compaction des types d'un DataFrame.
+
+        Methodes:
+            compacter(self, df: pd.DataFrame) -> tuple[pd.DataFrame, dict]
+"""
+
+from dataclasses import dataclass
+import numpy as np
+import pandas as pd
+
+@dataclass
+class CompactionDataFrame:
+    """Compaction des types d'un DataFrame, avec la mémoire occupée avant et après.
+    Une même instance peut être partagée entre les requêtes : elle ne garde aucun état.
+
+    Args:
+        seuil_categorie (float): La proportion maximale de valeurs distinctes
+        pour convertir une colonne texte en `category` (0.5 par défaut).
+        max_categories (int): Le nombre maximal de catégories d'une colonne (10 000 par défaut).
+    """
+
+    seuil_categorie: float = 0.5
+    max_categories: int = 10_000
+
+    def _compacter_colonne(self, serie: pd.Series) -> pd.Series:
+        """Retourne la colonne dans le plus petit type qui conserve ses valeurs.
+
+        Args:
+            serie (pd.Series): La colonne à compacter.
+
+        Returns:
+            pd.Series: La colonne compactée (ou la même colonne si rien n'est gagné).
+        """
+
+        dtype = serie.dtype
+
+        if isinstance(dtype, pd.CategoricalDtype) or dtype.kind == "b":
+            return serie
+
+        if dtype.kind in "iu" and isinstance(dtype, np.dtype):
+            return pd.to_numeric(serie, downcast="integer" if dtype.kind == "i" else "unsigned")
+
+        if dtype == np.float64:
+            valeurs = serie.to_numpy()
+            reduites = valeurs.astype(np.float32)
+            # Ne réduire que si chaque valeur est exactement représentable en float32.
+            if np.array_equal(reduites.astype(np.float64), valeurs, equal_nan=True):
+                return serie.astype(np.float32)
+            return serie
+
+        if not pd.api.types.is_string_dtype(dtype):
+            return serie
+
+        # Les colonnes objet mélangeant plusieurs types sont laissées telles quelles.
+        if dtype == object and pd.api.types.infer_dtype(serie, skipna=True) != "string":
+            return serie
+
+        distinctes = serie.nunique(dropna=True)
+        if distinctes <= self.max_categories and distinctes <= self.seuil_categorie * len(serie):
+            return serie.astype("category")
+        if dtype == object:
+            return serie.astype("str")
+        return serie
+
+    def compacter(self, df: pd.DataFrame) -> tuple[pd.DataFrame, dict]:
+        """Compacte les types des colonnes d'un tableau et mesure la mémoire
+        occupée avant et après. Le tableau d'origine n'est pas modifié.
+
+        Args:
+            df (pd.DataFrame): Le tableau de données à compacter.
+
+        Returns:
+            tuple[pd.DataFrame, dict]: Le tableau compacté, et le rapport des octets
+            avant et après compaction avec le ratio de réduction.
+        """
+
+        if not isinstance(df, pd.DataFrame):
+            raise TypeError("Les données ne sont pas tabulaires (DataFrame).")
+
+        octets_avant = int(df.memory_usage(deep=True).sum())
+
+        # Copie superficielle : seules les colonnes converties sont remplacées.
+        compacte = df.copy(deep=False)
+        for position in range(df.shape[1]):
+            serie = df.iloc[:, position]
+            nouvelle = self._compacter_colonne(serie)
+            if nouvelle is not serie:
+                compacte.isetitem(position, nouvelle)
+
+        octets_apres = int(compacte.memory_usage(deep=True).sum())
+        return compacte, {
+            'octets_avant': octets_avant,
+            'octets_apres': octets_apres,
+            'ratio': octets_avant / octets_apres if octets_apres else 1.0,
+        }
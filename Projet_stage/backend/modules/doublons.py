@@ -0,0 +1,206 @@
+"""Ce module détecte les lignes dupliquées d'un tableau de données à partir
+d'un hachage 64 bits de chaque ligne, calculé une seule fois par version
+des données et partagé entre l'analyse et le nettoyage.
+
+Classes:
+
+    DetecteurDoublons:
+        Détection exacte ou approchée des lignes dupliquées.
+
+        Methodes:
+            hachages(self, df: pd.DataFrame, version: Optional[Hashable] = None) -> np.ndarray
+            masque(self, df: pd.DataFrame, version: Optional[Hashable] = None) -> np.ndarray
+            compter(self, df: pd.DataFrame, version: Optional[Hashable] = None) -> int
+            estimer(self, df: pd.DataFrame, version: Optional[Hashable] = None) -> int
+            supprimer(
+                self,
+                df: pd.DataFrame,
+                version: Optional[Hashable] = None,
+                inplace: bool = False
+                ) -> pd.DataFrame
+            vider(self) -> None
+"""
+
+from collections import OrderedDict
+from dataclasses import (
+    dataclass,
+    field,
+    )
+from typing import (
+    Hashable,
+    Optional,
+    )
+import threading
+import numpy as np
+import pandas as pd
+from modules.hyperloglog import HyperLogLog
+
+# Nombre de lignes hachées à la fois par `estimer` quand les hachages ne sont pas en cache.
+TAILLE_MORCEAU_ESTIMATION = 1_000_000
+
+@dataclass
+class DetecteurDoublons:
+    """Détecte les lignes dupliquées d'un DataFrame grâce au hachage vectorisé
+    `pd.util.hash_pandas_object`. Deux lignes sont considérées identiques si leurs
+    hachages 64 bits sont égaux (le risque de collision est négligeable).
+
+    Args:
+        taille_cache (int): Le nombre de versions dont les hachages sont conservés (2 par défaut).
+        precision (int): La précision de l'estimateur HyperLogLog utilisé par `estimer`.
+    """
+
+    taille_cache: int = 2
+    precision: int = 14
+    _hachages: OrderedDict = field(default_factory=OrderedDict, init=False, repr=False)
+    # Le détecteur est partagé entre les requêtes servies en parallèle.
+    _verrou: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def _en_cache(self, version: Optional[Hashable], lignes: int) -> Optional[np.ndarray]:
+        """Retourne les hachages déjà calculés pour une version, s'ils correspondent
+        au nombre de lignes du tableau.
+
+        Args:
+            version (Hashable | None): La version des données.
+            lignes (int): Le nombre de lignes du tableau.
+
+        Returns:
+            np.ndarray | None: Les hachages en cache, ou `None`.
+        """
+
+        with self._verrou:
+            hachages = self._hachages.get(version) if version is not None else None
+            # Une version réutilisée pour un autre tableau invalide le cache.
+            if hachages is None or len(hachages) != lignes:
+                return None
+            self._hachages.move_to_end(version)
+            return hachages
+
+    def hachages(self, df: pd.DataFrame, version: Optional[Hashable] = None) -> np.ndarray:
+        """Retourne le hachage 64 bits de chaque ligne, mis en cache par version.
+
+        Args:
+            df (pd.DataFrame): Le tableau de données.
+            version (Hashable | None): La version des données ; sans version, rien n'est mis en cache.
+
+        Returns:
+            np.ndarray: Les hachages `uint64` des lignes.
+        """
+
+        if not isinstance(df, pd.DataFrame):
+            raise TypeError("Les données ne sont pas tabulaires (DataFrame).")
+
+        hachages = self._en_cache(version, len(df))
+        if hachages is not None:
+            return hachages
+
+        # Le hachage est calculé hors du verrou : seul le cache est protégé.
+        hachages = pd.util.hash_pandas_object(df, index=False).to_numpy(dtype=np.uint64)
+
+        if version is not None:
+            with self._verrou:
+                self._hachages[version] = hachages
+                while len(self._hachages) > self.taille_cache:
+                    self._hachages.popitem(last=False)
+
+        return hachages
+
+    def masque(self, df: pd.DataFrame, version: Optional[Hashable] = None) -> np.ndarray:
+        """Retourne le masque des lignes dupliquées (la première occurrence est conservée).
+
+        Args:
+            df (pd.DataFrame): Le tableau de données.
+            version (Hashable | None): La version des données.
+
+        Returns:
+            np.ndarray: `True` pour chaque ligne déjà vue plus haut dans le tableau.
+        """
+
+        hachages = self.hachages(df, version)
+        if len(hachages) == 0:
+            return np.zeros(0, dtype=bool)
+
+        # Position de la première occurrence de chaque hachage.
+        _, premieres = np.unique(hachages, return_index=True)
+        masque = np.ones(len(hachages), dtype=bool)
+        masque[premieres] = False
+        return masque
+
+    def compter(self, df: pd.DataFrame, version: Optional[Hashable] = None) -> int:
+        """Compte exactement les lignes dupliquées.
+
+        Args:
+            df (pd.DataFrame): Le tableau de données.
+            version (Hashable | None): La version des données.
+
+        Returns:
+            int: Le nombre de lignes dupliquées.
+        """
+
+        hachages = self.hachages(df, version)
+        return int(len(hachages) - len(np.unique(hachages)))
+
+    def estimer(self, df: pd.DataFrame, version: Optional[Hashable] = None) -> int:
+        """Estime le nombre de lignes dupliquées avec HyperLogLog, pour les très grands
+        tableaux où le tri des hachages serait trop coûteux. Les hachages en cache sont
+        réutilisés ; sinon les lignes sont hachées par morceaux de
+        `TAILLE_MORCEAU_ESTIMATION` lignes, sans garder un hachage par ligne.
+
+        Args:
+            df (pd.DataFrame): Le tableau de données.
+            version (Hashable | None): La version des données.
+
+        Returns:
+            int: L'estimation du nombre de lignes dupliquées.
+        """
+
+        if not isinstance(df, pd.DataFrame):
+            raise TypeError("Les données ne sont pas tabulaires (DataFrame).")
+
+        estimateur = HyperLogLog(precision=self.precision)
+        hachages = self._en_cache(version, len(df))
+        if hachages is not None:
+            estimateur.ajouter_hachages(hachages)
+        else:
+            for debut in range(0, len(df), TAILLE_MORCEAU_ESTIMATION):
+                morceau = df.iloc[debut: debut + TAILLE_MORCEAU_ESTIMATION]
+                estimateur.ajouter_hachages(
+                    pd.util.hash_pandas_object(morceau, index=False).to_numpy(dtype=np.uint64))
+        return max(0, len(df) - round(estimateur.estimer()))
+
+    def supprimer(
+        self,
+        df: pd.DataFrame,
+        version: Optional[Hashable] = None,
+        inplace: bool = False
+        ) -> pd.DataFrame:
+        """Supprime les lignes dupliquées en conservant la première occurrence.
+
+        Args:
+            df (pd.DataFrame): Le tableau de données.
+            version (Hashable | None): La version des données.
+            inplace (bool): Modifier `df` directement au lieu de retourner un nouveau tableau.
+
+        Returns:
+            pd.DataFrame: Le tableau sans lignes dupliquées (`df` lui-même si `inplace`).
+        """
+
+        masque = self.masque(df, version)
+        if not masque.any():
+            return df
+
+        if not inplace:
+            return df.iloc[~masque]
+
+        index = df.index
+        # Les étiquettes répétées ne permettent pas de cibler une seule ligne :
+        # on supprime par position puis on restaure l'index d'origine.
+        df.index = pd.RangeIndex(len(df))
+        df.drop(index=np.flatnonzero(masque), inplace=True)
+        df.index = index[~masque]
+        return df
+
+    def vider(self) -> None:
+        """Vide le cache des hachages.
+        """
+        with self._verrou:
+            self._hachages.clear()
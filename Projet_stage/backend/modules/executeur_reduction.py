@@ -0,0 +1,412 @@
+"""Ce module exécute les réductions de dimension (ACP, t-SNE, UMAP) dans un
+groupe de processus dédié, pour que le calcul ne bloque pas le processus de l'API.
+
+Les processus sont démarrés à l'avance avec sklearn et umap déjà importés (et les
+fonctions numba d'UMAP déjà compilées), et la matrice d'entrée leur est transmise par mémoire partagée plutôt que copiée
+par sérialisation : seul le résultat réduit (n lignes x 2 ou 3 colonnes) revient.
+Une ACP hors mémoire ne reçoit que le chemin du fichier, relu par morceaux.
+
+Classes:
+
+    ExecuteurReduction:
+        Groupe de processus de réduction de dimension.
+
+        Methodes:
+            demarrer(self) -> None
+            soumettre(
+                self,
+                methode: str,
+                x: pd.DataFrame | np.ndarray | str,
+                axes: int,
+                index: IndexVoisins | None = None,
+                parametres: dict | None = None,
+                informations: bool = False
+                ) -> Future
+            reduire(
+                self,
+                methode: str,
+                x: pd.DataFrame | np.ndarray | str,
+                axes: int,
+                index: IndexVoisins | None = None,
+                parametres: dict | None = None,
+                informations: bool = False
+                ) -> np.ndarray | tuple[np.ndarray, dict | None]
+            executer(self, fonction: Callable, *args) -> Future
+            coeurs_par_processus(self) -> int
+            arreter(self) -> None
+
+Fonctions:
+
+    reduire_localement(
+        methode: str,
+        x: pd.DataFrame | np.ndarray | str,
+        axes: int,
+        index: IndexVoisins | None = None,
+        parametres: dict | None = None,
+        informations: bool = False
+        ) -> np.ndarray | tuple[np.ndarray, dict | None]
+        Applique une méthode de réduction dans le processus courant.
+
+    repartir_coeurs(processus: int) -> None
+        Réserve à ce processus sa part des coeurs d'un groupe de `processus` processus.
+
+    coeurs_disponibles() -> int
+        Le nombre de coeurs dont dispose un calcul dans ce processus.
+"""
+
+from concurrent.futures import (
+    Future,
+    ProcessPoolExecutor,
+    )
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import (
+    dataclass,
+    field,
+    )
+from multiprocessing import (
+    get_context,
+    shared_memory,
+    )
+from typing import (
+    Callable,
+    Literal,
+    Optional,
+    Union,
+    )
+import os
+import threading
+import numpy as np
+import pandas as pd
+from modules.index_voisins import IndexVoisins
+
+Methode = Literal['acp', 'tsne', 'umap']
+
+# Coeurs dont dispose un calcul dans ce processus : tous, sauf dans un processus
+# d'un groupe qui calcule en parallèle (voir `repartir_coeurs`).
+_coeurs: Optional[int] = None
+
+def repartir_coeurs(processus: int) -> None:
+    """Réserve à ce processus sa part des coeurs de la machine, partagés entre
+    les `processus` processus de son groupe (initialisation d'un groupe de processus).
+
+    Args:
+        processus (int): Le nombre de processus du groupe.
+    """
+    global _coeurs # pylint: disable=global-statement
+    _coeurs = max(1, (os.cpu_count() or 1) // max(processus, 1))
+
+def coeurs_disponibles() -> int:
+    """Retourne le nombre de coeurs dont dispose un calcul dans ce processus.
+
+    Returns:
+        int: La part du processus dans son groupe, sinon tous les coeurs.
+    """
+    return _coeurs or os.cpu_count() or 1
+
+def reduire_localement(
+    methode: Methode,
+    x: Union[pd.DataFrame, np.ndarray, str],
+    axes: int,
+    index: Optional[IndexVoisins] = None,
+    parametres: Optional[dict] = None,
+    informations: bool = False
+    ) -> Union[np.ndarray, tuple[np.ndarray, Optional[dict]]]:
+    """Applique une méthode de réduction dans le processus courant.
+
+    Args:
+        methode (Literal): La méthode de réduction (`acp`, `tsne` ou `umap`).
+        x (pd.DataFrame | np.ndarray | str): Les données numériques à réduire, ou le
+        chemin d'un fichier CSV ou Parquet (ACP hors mémoire).
+        axes (int): Le nombre de dimensions de réduction.
+        index (IndexVoisins | None): L'index partagé des plus proches voisins (t-SNE et UMAP).
+        parametres (dict | None): Les hyperparamètres de la méthode (champs de sa classe,
+        par exemple `perplexity` pour t-SNE ou `n_neighbors` pour UMAP).
+        informations (bool): Retourner aussi les informations de la méthode : la variance
+        expliquée et les contributions des variables pour l'ACP (`None` sinon).
+
+    Raises:
+        ValueError: Si la méthode n'est pas supportée.
+
+    Returns:
+        np.ndarray | tuple: La matrice réduite (et ses informations si demandées).
+    """
+
+    # Importés ici pour que seuls les processus qui réduisent chargent ces bibliothèques.
+    # pylint: disable=import-outside-toplevel
+    parametres = parametres or {}
+    infos = None
+    match methode:
+        case 'acp':
+            from modules.methode_acp import MethodeACP
+            acp = MethodeACP(x, **parametres)
+            x_reduit = acp.acp_reduction(nombre_dimenssion=axes)
+            infos = acp.informations()
+        case 'tsne':
+            from modules.methode_tsne import MethodeTSNE
+            x_reduit = MethodeTSNE(x, index=index, **parametres).tsne_reduction(
+                nombre_de_dimension=axes)
+        case 'umap':
+            from modules.methode_umap import MethodeUMAP
+            x_reduit = MethodeUMAP(x, index=index, **parametres).umap_reduction(
+                nombre_de_dimension=axes)
+        case _:
+            raise ValueError(f"\nMéthode de réduction non supportée: {methode}\n")
+    return (x_reduit, infos) if informations else x_reduit
+
+def _prechauffer(compiler: bool = False, processus: int = 1) -> None:
+    """Importe les méthodes de réduction au démarrage de chaque processus du groupe.
+
+    Args:
+        compiler (bool): Compiler aussi les fonctions numba d'UMAP.
+        processus (int): Le nombre de processus du groupe, qui se partagent les coeurs.
+    """
+    repartir_coeurs(processus)
+
+    # pylint: disable=import-outside-toplevel,unused-import
+    import modules.methode_acp
+    import modules.methode_tsne
+    import modules.methode_umap
+    import umap
+
+    if compiler:
+        modules.methode_umap.prechauffer()
+
+def _pret() -> int:
+    """Tâche vide, soumise pour démarrer les processus du groupe à l'avance.
+    """
+    return os.getpid()
+
+def _reduire_partage(
+    methode: Methode,
+    nom: str,
+    forme: tuple[int, int],
+    axes: int,
+    index: Optional[IndexVoisins] = None,
+    parametres: Optional[dict] = None,
+    informations: bool = False,
+    colonnes: Optional[list] = None
+    ) -> Union[np.ndarray, tuple[np.ndarray, Optional[dict]]]:
+    """Réduit une matrice lue en mémoire partagée, dans un processus du groupe.
+
+    Args:
+        methode (Literal): La méthode de réduction.
+        nom (str): Le nom du bloc de mémoire partagée.
+        forme (tuple[int, int]): La forme de la matrice (float64).
+        axes (int): Le nombre de dimensions de réduction.
+        index (IndexVoisins | None): L'index partagé des plus proches voisins.
+        parametres (dict | None): Les hyperparamètres de la méthode.
+        informations (bool): Retourner aussi les informations de la méthode.
+        colonnes (list | None): Les noms des colonnes, pour nommer les contributions
+        des variables (la matrice est vue sans copie comme un DataFrame).
+
+    Returns:
+        np.ndarray | tuple: La matrice réduite (et ses informations si demandées).
+    """
+
+    # Le bloc appartient au processus de l'API, qui le supprime après le calcul.
+    bloc = shared_memory.SharedMemory(name=nom)
+    x = np.ndarray(forme, dtype=np.float64, buffer=bloc.buf)
+    if colonnes is not None:
+        x = pd.DataFrame(x, columns=colonnes, copy=False)
+    try:
+        resultat = reduire_localement(methode, x, axes, index, parametres, informations)
+        # Copie du résultat : il ne doit pas référencer le bloc partagé.
+        if informations:
+            return np.array(resultat[0], copy=True), resultat[1]
+        return np.array(resultat, copy=True)
+    finally:
+        del x
+        try:
+            bloc.close()
+        except BufferError:
+            # Une vue sur le bloc est encore retenue (cycle de références) :
+            # la projection sera libérée par le ramasse-miettes.
+            pass
+
+@dataclass
+class ExecuteurReduction:
+    """Groupe de processus de réduction de dimension, démarrés avec leurs
+    bibliothèques déjà importées. Plusieurs réductions peuvent s'exécuter en parallèle.
+
+    Args:
+        processus_max (int | None): Le nombre de processus du groupe
+        (par défaut le nombre de coeurs moins un, au moins 1).
+        prechauffage (bool): Compiler les fonctions numba d'UMAP au démarrage
+        des processus (`True` par défaut).
+    """
+
+    processus_max: Optional[int] = None
+    prechauffage: bool = True
+    _executeur: Optional[ProcessPoolExecutor] = field(default=None, init=False, repr=False)
+    _verrou: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        """Fixe le nombre de processus du groupe.
+        """
+        if self.processus_max is None:
+            self.processus_max = max(1, (os.cpu_count() or 1) - 1)
+
+    def demarrer(self) -> None:
+        """Démarre les processus du groupe et leurs imports, sans attendre
+        (à appeler au démarrage de l'application).
+        """
+
+        with self._verrou:
+            if self._executeur is not None:
+                return None
+            # `spawn` : pas de fork d'un processus dont les fils de calcul (OpenMP, numba)
+            # sont déjà démarrés, et même comportement que sous Windows.
+            self._executeur = ProcessPoolExecutor(
+                max_workers=self.processus_max,
+                mp_context=get_context("spawn"),
+                initializer=_prechauffer,
+                initargs=(self.prechauffage, self.processus_max))
+            for _ in range(self.processus_max):
+                self._executeur.submit(_pret)
+        return None
+
+    def _soumettre_au_groupe(self, *args) -> Future:
+        """Soumet un appel au groupe de processus, recréé une fois s'il est cassé
+        (un processus de réduction arrêté brutalement : mémoire, numba, OpenMP).
+
+        Args:
+            *args: La fonction et ses arguments.
+
+        Raises:
+            BrokenProcessPool: Si le groupe recréé est encore cassé.
+
+        Returns:
+            Future: Le futur de l'appel.
+        """
+
+        for tentative in range(2):
+            self.demarrer()
+            executeur = self._executeur
+            try:
+                return executeur.submit(*args)
+            except BrokenProcessPool:
+                with self._verrou:
+                    # Un autre fil a peut-être déjà recréé le groupe.
+                    if self._executeur is executeur:
+                        executeur.shutdown(wait=False, cancel_futures=True)
+                        self._executeur = None
+                if tentative:
+                    raise
+        raise BrokenProcessPool("\nLe groupe de processus de réduction ne démarre pas.\n")
+
+    def soumettre(
+        self,
+        methode: Methode,
+        x: Union[pd.DataFrame, np.ndarray, str],
+        axes: int,
+        index: Optional[IndexVoisins] = None,
+        parametres: Optional[dict] = None,
+        informations: bool = False
+        ) -> Future:
+        """Soumet une réduction au groupe de processus, sans attendre son résultat.
+
+        Args:
+            methode (Literal): La méthode de réduction (`acp`, `tsne` ou `umap`).
+            x (pd.DataFrame | np.ndarray | str): Les données numériques à réduire, ou le
+            chemin d'un fichier CSV ou Parquet (ACP hors mémoire).
+            axes (int): Le nombre de dimensions de réduction.
+            index (IndexVoisins | None): L'index partagé des plus proches voisins
+            (seul son dossier est transmis : le graphe est relu depuis le disque).
+            parametres (dict | None): Les hyperparamètres de la méthode.
+            informations (bool): Retourner aussi les informations de la méthode
+            (calculées dans le processus du groupe).
+
+        Returns:
+            Future: Le futur de la matrice réduite (et de ses informations si demandées).
+        """
+
+        if isinstance(x, str):
+            # Le fichier est relu par morceaux dans le processus du groupe.
+            return self._soumettre_au_groupe(
+                reduire_localement, methode, x, axes, index, parametres, informations)
+
+        # Les valeurs sont écrites directement dans le bloc partagé, colonne par
+        # colonne : aucune copie intermédiaire de la matrice entière.
+        forme = (len(x), x.shape[1])
+        bloc = shared_memory.SharedMemory(
+            create=True, size=max(forme[0] * forme[1] * np.dtype(np.float64).itemsize, 1))
+        matrice = np.ndarray(forme, dtype=np.float64, buffer=bloc.buf)
+        if isinstance(x, pd.DataFrame):
+            for j in range(forme[1]):
+                matrice[:, j] = x.iloc[:, j].to_numpy(dtype=np.float64, na_value=np.nan)
+        else:
+            matrice[:] = x
+        # La vue doit être relâchée avant la fermeture du bloc.
+        del matrice
+
+        def liberer(_: Future) -> None:
+            bloc.close()
+            bloc.unlink()
+
+        try:
+            futur = self._soumettre_au_groupe(
+                _reduire_partage, methode, bloc.name, forme, axes, index, parametres, informations,
+                list(x.columns) if isinstance(x, pd.DataFrame) else None)
+        except BaseException:
+            liberer(None)
+            raise
+        futur.add_done_callback(liberer)
+        return futur
+
+    def reduire(
+        self,
+        methode: Methode,
+        x: Union[pd.DataFrame, np.ndarray, str],
+        axes: int,
+        index: Optional[IndexVoisins] = None,
+        parametres: Optional[dict] = None,
+        informations: bool = False
+        ) -> Union[np.ndarray, tuple[np.ndarray, Optional[dict]]]:
+        """Réduit des données dans le groupe de processus et attend le résultat.
+
+        Args:
+            methode (Literal): La méthode de réduction (`acp`, `tsne` ou `umap`).
+            x (pd.DataFrame | np.ndarray | str): Les données numériques à réduire, ou le
+            chemin d'un fichier CSV ou Parquet (ACP hors mémoire).
+            axes (int): Le nombre de dimensions de réduction.
+            index (IndexVoisins | None): L'index partagé des plus proches voisins.
+            parametres (dict | None): Les hyperparamètres de la méthode.
+            informations (bool): Retourner aussi les informations de la méthode.
+
+        Returns:
+            np.ndarray | tuple: La matrice réduite (et ses informations si demandées).
+        """
+        return self.soumettre(methode, x, axes, index, parametres, informations).result()
+
+    def executer(self, fonction: Callable, *args) -> Future:
+        """Soumet une fonction quelconque au groupe de processus, sans attendre son résultat.
+        La fonction doit être définie au niveau d'un module, et ses arguments sont
+        copiés par sérialisation (réservé aux petites données, comme des échantillons).
+
+        Args:
+            fonction (Callable): La fonction à exécuter.
+            *args: Les arguments de la fonction.
+
+        Returns:
+            Future: Le futur du résultat de la fonction.
+        """
+
+        return self._soumettre_au_groupe(fonction, *args)
+
+    def coeurs_par_processus(self) -> int:
+        """Retourne le nombre de coeurs dont dispose chaque processus du groupe,
+        pour prévoir la durée d'une réduction qui y sera calculée.
+
+        Returns:
+            int: Les coeurs de la machine répartis entre les processus (au moins 1).
+        """
+        return max(1, (os.cpu_count() or 1) // self.processus_max)
+
+    def arreter(self) -> None:
+        """Arrête les processus du groupe.
+        """
+
+        with self._verrou:
+            if self._executeur is not None:
+                self._executeur.shutdown(wait=False, cancel_futures=True)
+                self._executeur = None
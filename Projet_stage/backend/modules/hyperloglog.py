@@ -0,0 +1,113 @@
+"""Ce module estime le nombre de valeurs distinctes d'un flux de données
+avec une mémoire constante grâce à l'algorithme HyperLogLog.
+
+Classes:
+
+    HyperLogLog:
+        Estimateur fusionnable du nombre de valeurs distinctes.
+
+        Methodes:
+            ajouter(self, valeurs: np.ndarray | pd.Series) -> None
+            ajouter_hachages(self, hachages: np.ndarray) -> None
+            fusionner(self, autre: HyperLogLog) -> None
+            estimer(self) -> float
+"""
+
+from dataclasses import (
+    dataclass,
+    field,
+    )
+from typing import Union
+import numpy as np
+import pandas as pd
+
+@dataclass
+class HyperLogLog:
+    """Estimateur du nombre de valeurs distinctes, fusionnable entre morceaux de données.
+    L'erreur relative est d'environ `1.04 / sqrt(2 ** precision)` (1,6 % par défaut).
+
+    Args:
+        precision (int): Le nombre de bits servant à choisir un registre (12 par défaut,
+        soit 4096 registres d'un octet).
+        registres (np.ndarray): Les registres de l'estimateur.
+    """
+
+    precision: int = 12
+    registres: np.ndarray = field(default=None, repr=False)
+
+    def __post_init__(self) -> None:
+        """Initialise les registres à zéro.
+        """
+        if not 4 <= self.precision <= 18:
+            raise ValueError("La précision doit être comprise entre 4 et 18.")
+        if self.registres is None:
+            self.registres = np.zeros(2 ** self.precision, dtype=np.uint8)
+
+    def ajouter(self, valeurs: Union[np.ndarray, pd.Series]) -> None:
+        """Ajoute des valeurs à l'estimateur (les valeurs manquantes sont ignorées).
+
+        Args:
+            valeurs (np.ndarray | pd.Series): Les valeurs à ajouter.
+        """
+
+        serie = pd.Series(valeurs) if not isinstance(valeurs, pd.Series) else valeurs
+        serie = serie.dropna()
+        if serie.empty:
+            return None
+        self.ajouter_hachages(
+            pd.util.hash_pandas_object(serie, index=False).to_numpy(dtype=np.uint64))
+        return None
+
+    def ajouter_hachages(self, hachages: np.ndarray) -> None:
+        """Ajoute des hachages 64 bits déjà calculés à l'estimateur.
+
+        Args:
+            hachages (np.ndarray): Les hachages `uint64` des valeurs.
+        """
+
+        if len(hachages) == 0:
+            return None
+
+        hachages = np.asarray(hachages, dtype=np.uint64)
+        decalage = np.uint64(64 - self.precision)
+
+        # Les premiers bits choisissent le registre, les suivants donnent le rang.
+        indices = (hachages >> decalage).astype(np.intp)
+        reste = hachages << np.uint64(self.precision)
+
+        # Rang = nombre de zéros en tête du reste + 1 (borné par les bits disponibles).
+        _, exposants = np.frexp(reste.astype(np.float64))
+        rangs = np.where(reste == 0, 64 - self.precision + 1, 65 - exposants)
+        rangs = np.minimum(rangs, 64 - self.precision + 1).astype(np.uint8)
+
+        np.maximum.at(self.registres, indices, rangs)
+        return None
+
+    def fusionner(self, autre: "HyperLogLog") -> None:
+        """Fusionne un autre estimateur de même précision dans celui-ci.
+
+        Args:
+            autre (HyperLogLog): L'estimateur à fusionner.
+        """
+
+        if autre.precision != self.precision:
+            raise ValueError("Les estimateurs doivent avoir la même précision.")
+        np.maximum(self.registres, autre.registres, out=self.registres)
+
+    def estimer(self) -> float:
+        """Estime le nombre de valeurs distinctes ajoutées.
+
+        Returns:
+            float: L'estimation du nombre de valeurs distinctes.
+        """
+
+        m = len(self.registres)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimation = alpha * m * m / np.sum(np.power(2.0, -self.registres.astype(np.float64)))
+
+        # Correction pour les petites cardinalités (comptage linéaire).
+        registres_vides = int(np.count_nonzero(self.registres == 0))
+        if estimation <= 2.5 * m and registres_vides:
+            estimation = m * np.log(m / registres_vides)
+
+        return float(estimation)
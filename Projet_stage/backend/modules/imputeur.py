@@ -0,0 +1,242 @@
+"""Ce module remplit les cellules vides avec des statistiques apprises une
+seule fois, puis réutilisées pour chaque nouveau morceau de données.
+
+Les statistiques sont fusionnables : un imputeur peut apprendre sur un flux
+de morceaux (`partial_fit`), être enregistré à côté du cache des données, puis
+rechargé pour nettoyer uniquement les lignes ajoutées depuis.
+
+Classes:
+
+    Imputeur:
+        Remplissage des valeurs manquantes par la moyenne, la médiane ou zéro.
+
+        Methodes:
+            fit(self, df: pd.DataFrame) -> Imputeur
+            partial_fit(self, df: pd.DataFrame) -> Imputeur
+            fit_flux(self, morceaux: Iterable[pd.DataFrame]) -> Imputeur
+            fusionner(self, autre: Imputeur) -> None
+            valeurs(self) -> dict
+            transform(self, df: pd.DataFrame, inplace: bool = False) -> pd.DataFrame
+            sauvegarder(self, chemin: str) -> None
+            charger(cls, chemin: str) -> Imputeur
+"""
+
+from dataclasses import (
+    dataclass,
+    field,
+    )
+from pathlib import Path
+from typing import (
+    Iterable,
+    Literal,
+    Optional,
+    )
+import json
+import os
+import numpy as np
+import pandas as pd
+from modules.statistiques_flux import SketchQuantiles
+
+@dataclass
+class Imputeur:
+    """Apprend les valeurs de remplissage de chaque colonne, puis les applique
+    aux tableaux suivants sans recalculer les statistiques de tout l'historique.
+    La médiane est approchée par une esquisse de quantiles fusionnable.
+
+    Args:
+        strategy (Literal): La valeur de remplissage (`mean`, `median` ou `fill`).
+        colonnes (list[str] | None): Les colonnes à remplir (par défaut les colonnes numériques).
+        lignes (int): Le nombre de lignes apprises.
+        nombres (dict[str, int]): Le nombre de valeurs présentes de chaque colonne.
+        sommes (dict[str, float]): La somme des valeurs de chaque colonne.
+        esquisses (dict[str, SketchQuantiles]): Les esquisses de quantiles (stratégie `median`).
+    """
+
+    strategy: Literal["mean", "median", "fill"] = "mean"
+    colonnes: Optional[list[str]] = None
+    lignes: int = 0
+    nombres: dict[str, int] = field(default_factory=dict)
+    sommes: dict[str, float] = field(default_factory=dict)
+    esquisses: dict[str, SketchQuantiles] = field(default_factory=dict, repr=False)
+
+    def __post_init__(self) -> None:
+        """Vérifie la stratégie de remplissage.
+        """
+        if self.strategy not in ("mean", "median", "fill"):
+            raise ValueError(f"\nLa valeur de la stragie non supporté: {self.strategy}\n")
+
+    def _colonnes_a_remplir(self, df: pd.DataFrame) -> list[str]:
+        """Retourne les colonnes du tableau concernées par l'imputeur.
+
+        Args:
+            df (pd.DataFrame): Le tableau de données.
+
+        Returns:
+            list[str]: Les colonnes à apprendre ou à remplir.
+        """
+        if self.colonnes:
+            return [col for col in self.colonnes if col in df.columns]
+        return df.select_dtypes(include=np.number).columns.to_list()
+
+    def fit(self, df: pd.DataFrame) -> "Imputeur":
+        """Apprend les statistiques d'un tableau, en oubliant les précédentes.
+
+        Args:
+            df (pd.DataFrame): Le tableau de données.
+
+        Returns:
+            Imputeur: L'imputeur lui-même.
+        """
+
+        self.lignes = 0
+        self.nombres, self.sommes, self.esquisses = {}, {}, {}
+        return self.partial_fit(df)
+
+    def partial_fit(self, df: pd.DataFrame) -> "Imputeur":
+        """Ajoute un morceau de données aux statistiques déjà apprises.
+        Le coût est proportionnel au nombre de lignes du morceau.
+
+        Args:
+            df (pd.DataFrame): Le morceau de données.
+
+        Returns:
+            Imputeur: L'imputeur lui-même.
+        """
+
+        if not isinstance(df, pd.DataFrame):
+            raise TypeError("Les données ne sont pas tabulaires (DataFrame).")
+
+        self.lignes += len(df)
+        if self.strategy == "fill":
+            return self
+
+        for col in self._colonnes_a_remplir(df):
+            x = pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=np.float64)
+            x = x[np.isfinite(x)]
+            self.nombres[col] = self.nombres.get(col, 0) + len(x)
+            self.sommes[col] = self.sommes.get(col, 0.0) + float(x.sum())
+            if self.strategy == "median":
+                self.esquisses.setdefault(col, SketchQuantiles()).ajouter(x)
+        return self
+
+    def fit_flux(self, morceaux: Iterable[pd.DataFrame]) -> "Imputeur":
+        """Apprend les statistiques d'un flux de morceaux (par exemple
+        `DataLoader.iterer_morceaux_csv`), sans charger tout le jeu de données.
+
+        Args:
+            morceaux (Iterable[pd.DataFrame]): Les morceaux de données.
+
+        Returns:
+            Imputeur: L'imputeur lui-même.
+        """
+
+        for morceau in morceaux:
+            self.partial_fit(morceau)
+        return self
+
+    def fusionner(self, autre: "Imputeur") -> None:
+        """Fusionne les statistiques apprises par un autre imputeur sur d'autres lignes.
+
+        Args:
+            autre (Imputeur): L'imputeur à fusionner, de même stratégie.
+        """
+
+        if autre.strategy != self.strategy:
+            raise ValueError("Les imputeurs doivent avoir la même stratégie.")
+
+        self.lignes += autre.lignes
+        for col, nombre in autre.nombres.items():
+            self.nombres[col] = self.nombres.get(col, 0) + nombre
+            self.sommes[col] = self.sommes.get(col, 0.0) + autre.sommes[col]
+        for col, esquisse in autre.esquisses.items():
+            self.esquisses.setdefault(col, SketchQuantiles()).fusionner(esquisse)
+
+    def valeurs(self) -> dict:
+        """Retourne la valeur de remplissage de chaque colonne apprise.
+        Une colonne sans aucune valeur n'est pas remplie.
+
+        Returns:
+            dict: La valeur de remplissage de chaque colonne.
+        """
+
+        if self.strategy == "fill":
+            return dict.fromkeys(self.colonnes or [], 0)
+
+        valeurs = {}
+        for col, nombre in self.nombres.items():
+            if not nombre:
+                continue
+            if self.strategy == "mean":
+                valeurs[col] = self.sommes[col] / nombre
+            else:
+                valeurs[col] = float(self.esquisses[col].quantiles([0.5])[0])
+        return valeurs
+
+    def transform(self, df: pd.DataFrame, inplace: bool = False) -> pd.DataFrame:
+        """Remplit les cellules vides d'un tableau avec les valeurs apprises.
+
+        Args:
+            df (pd.DataFrame): Le tableau à remplir.
+            inplace (bool): Modifier le tableau directement, sans copie.
+
+        Returns:
+            pd.DataFrame: Le tableau rempli (`df` lui-même si `inplace`).
+        """
+
+        if not isinstance(df, pd.DataFrame):
+            raise TypeError("Les données ne sont pas tabulaires (DataFrame).")
+
+        if self.strategy == "fill":
+            valeurs = dict.fromkeys(self._colonnes_a_remplir(df), 0)
+        else:
+            valeurs = {col: v for col, v in self.valeurs().items() if col in df.columns}
+
+        if inplace:
+            df.fillna(valeurs, inplace=True)
+            return df
+        return df.fillna(valeurs)
+
+    def sauvegarder(self, chemin: str) -> None:
+        """Enregistre l'imputeur au format JSON (par exemple à l'emplacement
+        donné par `CacheDonnees.chemin_annexe`).
+
+        Args:
+            chemin (str): Le chemin du fichier JSON.
+        """
+
+        contenu = {
+            'strategy': self.strategy,
+            'colonnes': self.colonnes,
+            'lignes': self.lignes,
+            'nombres': self.nombres,
+            'sommes': self.sommes,
+            'esquisses': {
+                col: {'k': esquisse.k, 'niveaux': [n.tolist() for n in esquisse.niveaux]}
+                for col, esquisse in self.esquisses.items()},
+        }
+
+        chemin_temporaire = Path(chemin).with_suffix(".tmp")
+        with open(chemin_temporaire, 'w', encoding="utf-8") as f:
+            json.dump(contenu, f)
+        os.replace(chemin_temporaire, chemin)
+
+    @classmethod
+    def charger(cls, chemin: str) -> "Imputeur":
+        """Recharge un imputeur enregistré avec `sauvegarder`.
+
+        Args:
+            chemin (str): Le chemin du fichier JSON.
+
+        Returns:
+            Imputeur: L'imputeur enregistré.
+        """
+
+        with open(chemin, 'r', encoding="utf-8") as f:
+            contenu = json.load(f)
+
+        esquisses = {
+            col: SketchQuantiles(
+                k=esquisse['k'],
+                niveaux=[np.asarray(n, dtype=np.float64) for n in esquisse['niveaux']])
+            for col, esquisse in contenu.pop('esquisses').items()}
+        return cls(**contenu, esquisses=esquisses)
@@ -0,0 +1,256 @@
+"""Ce module calcule une seule fois le graphe des plus proches voisins d'une
+sélection de colonnes et le conserve sur le disque : t-SNE, UMAP et les scores
+de structure le réutilisent au lieu de refaire la recherche des voisins, qui
+domine leur temps de calcul (vue 2D après la 3D, UMAP après t-SNE, ...).
+
+Le graphe inclut chaque point comme son propre premier voisin (convention
+d'UMAP) ; `VOISINS_DEFAUT` voisins suffisent à t-SNE (3 x perplexité + 1) et
+UMAP n'en garde que les premiers.
+
+Classes:
+
+    IndexVoisins:
+        Cache disque des graphes de voisins, indexé par l'empreinte des valeurs
+        (voir `CacheProjections`, dont il reprend l'éviction LRU et les compteurs).
+
+        Methodes:
+            graphe(self, df: pd.DataFrame | np.ndarray, voisins: int | None = None)
+                -> tuple[np.ndarray, np.ndarray]
+
+Fonctions:
+
+    matrice_distances_tsne(indices: np.ndarray, distances: np.ndarray, voisins: int) -> csr_matrix
+        Le graphe au format attendu par t-SNE (`metric="precomputed"`).
+
+    conservation_voisinage(indices: np.ndarray, x_proj: np.ndarray, voisins: int = 10) -> float
+        La part des voisins d'origine conservés par une projection.
+"""
+
+from dataclasses import dataclass
+from typing import (
+    TYPE_CHECKING,
+    ClassVar,
+    Optional,
+    Union,
+    )
+import os
+import uuid
+import numpy as np
+import pandas as pd
+from modules.cache_projections import CacheProjections
+
+# scipy et sklearn ne sont importés qu'au premier calcul (démarrage de l'API).
+# pylint: disable=import-outside-toplevel
+if TYPE_CHECKING:
+    from scipy.sparse import csr_matrix
+
+# 3 x perplexité par défaut de t-SNE (30) + 1.
+VOISINS_DEFAUT = 91
+# Au-delà, la recherche exacte est remplacée par NN-descent (pynndescent) si disponible.
+SEUIL_NN_DESCENT = 50_000
+
+@dataclass
+class IndexVoisins(CacheProjections):
+    """Cache disque des graphes des plus proches voisins (indices en `int32`,
+    distances euclidiennes en `float32`, au format `.npz`).
+
+    Args:
+        dossier (str): Le dossier où sont stockés les graphes.
+        taille_max_octets (int): La taille totale maximale du cache (512 Mio par défaut).
+        succes (int): Le nombre de graphes relus depuis le cache.
+        echecs (int): Le nombre de graphes absents du cache.
+        voisins (int): Le nombre de voisins calculés (`VOISINS_DEFAUT` par défaut).
+    """
+
+    EXTENSION: ClassVar[str] = "npz"
+
+    voisins: int = VOISINS_DEFAUT
+
+    def graphe(
+        self,
+        df: Union[pd.DataFrame, np.ndarray],
+        voisins: Optional[int] = None
+        ) -> tuple[np.ndarray, np.ndarray]:
+        """Retourne le graphe des plus proches voisins des lignes, calculé au premier appel.
+
+        Args:
+            df (pd.DataFrame | np.ndarray): Les données numériques.
+            voisins (int | None): Le nombre de voisins voulu (`self.voisins` par défaut).
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Les indices et les distances des voisins
+            (n x voisins + 1, le point lui-même compris).
+        """
+
+        x = np.asarray(df, dtype=np.float32)
+        demandes = voisins or self.voisins
+        # Le graphe est calculé avec au moins `self.voisins` voisins pour servir à tous.
+        calcules = min(max(demandes, self.voisins), len(x) - 1)
+
+        # La clé ne dépend que des valeurs : le même graphe sert au DataFrame
+        # et à la matrice transmise aux processus de réduction.
+        cle = self.cle(x, "voisins", calcules)
+        graphe = self.lire(cle)
+        if graphe is None:
+            graphe = self.ecrire(cle, self._calculer(x, calcules))
+
+        indices, distances = graphe
+        colonnes = min(demandes, calcules) + 1
+        return indices[:, :colonnes], distances[:, :colonnes]
+
+    def _calculer(self, x: np.ndarray, voisins: int) -> tuple[np.ndarray, np.ndarray]:
+        """Recherche les plus proches voisins : exacte (arbre), ou approchée
+        avec NN-descent pour les grands jeux de données.
+
+        Args:
+            x (np.ndarray): Les données.
+            voisins (int): Le nombre de voisins, sans compter le point lui-même.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Les indices et les distances des voisins.
+        """
+
+        if len(x) > SEUIL_NN_DESCENT:
+            try:
+                from pynndescent import NNDescent
+            except ImportError:
+                NNDescent = None
+            if NNDescent is not None:
+                indices, distances = NNDescent(
+                    x,
+                    n_neighbors=voisins + 1,
+                    random_state=42,
+                    low_memory=True).neighbor_graph
+                return indices.astype(np.int32), distances.astype(np.float32)
+
+        from sklearn.neighbors import NearestNeighbors
+
+        distances, indices = NearestNeighbors(n_neighbors=voisins + 1).fit(x).kneighbors(x)
+        return indices.astype(np.int32), distances.astype(np.float32)
+
+    def lire(self, cle: str) -> Optional[tuple[np.ndarray, np.ndarray]]:
+        """Lit un graphe depuis le cache s'il y est présent.
+
+        Args:
+            cle (str): La clé du graphe.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray] | None: Les indices et les distances,
+            ou `None` si le graphe est absent.
+        """
+
+        chemin = self._chemin(cle)
+        try:
+            with np.load(chemin) as contenu:
+                graphe = contenu['indices'], contenu['distances']
+        except (OSError, ValueError, KeyError, EOFError):
+            self.echecs += 1
+            return None
+
+        try:
+            # Mettre à jour la date d'utilisation pour l'éviction LRU.
+            os.utime(chemin)
+        except FileNotFoundError:
+            # Évincé par un autre processus depuis la lecture : absent du cache.
+            self.echecs += 1
+            return None
+        self.succes += 1
+        return graphe
+
+    def ecrire(
+        self,
+        cle: str,
+        x: tuple[np.ndarray, np.ndarray]
+        ) -> tuple[np.ndarray, np.ndarray]:
+        """Écrit un graphe dans le cache, puis supprime les graphes les moins
+        récemment utilisés si la taille maximale est dépassée.
+
+        Args:
+            cle (str): La clé du graphe.
+            x (tuple[np.ndarray, np.ndarray]): Les indices et les distances des voisins.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Le graphe écrit.
+        """
+
+        indices, distances = x
+        chemin = self._chemin(cle)
+        # Un nom propre à chaque écriture : plusieurs fils peuvent écrire le même graphe.
+        chemin_temporaire = chemin.with_suffix(f".{os.getpid()}.{uuid.uuid4().hex}.tmp")
+
+        with open(chemin_temporaire, 'wb') as f:
+            np.savez(f, indices=indices, distances=distances)
+        os.replace(chemin_temporaire, chemin)
+        self._evincer()
+        return indices, distances
+
+def _sans_soi(indices: np.ndarray, lignes: np.ndarray) -> np.ndarray:
+    """Retire de chaque ligne du graphe le point lui-même (ou, s'il n'y figure pas
+    à cause de doublons, le voisin le plus lointain).
+
+    Args:
+        indices (np.ndarray): Les indices des voisins (le point compris).
+        lignes (np.ndarray): L'indice de chaque ligne du graphe.
+
+    Returns:
+        np.ndarray: Un masque des colonnes à garder pour chaque ligne.
+    """
+
+    masque = indices != lignes[:, None]
+    masque[masque.all(axis=1), -1] = False
+    return masque
+
+def matrice_distances_tsne(indices: np.ndarray, distances: np.ndarray, voisins: int) -> "csr_matrix":
+    """Convertit le graphe en matrice creuse des distances euclidiennes au carré,
+    comme celles que t-SNE calcule lui-même (`TSNE(metric="precomputed")`).
+    Le point lui-même reste stocké (distance nulle explicite) : sklearn l'attend
+    dans le graphe et le retire avant le calcul des affinités.
+
+    Args:
+        indices (np.ndarray): Les indices des voisins (le point compris).
+        distances (np.ndarray): Les distances des voisins.
+        voisins (int): Le nombre de voisins gardés par ligne (hors le point lui-même).
+
+    Returns:
+        csr_matrix: La matrice creuse n x n des distances aux voisins.
+    """
+
+    from scipy.sparse import csr_matrix
+
+    n, gardes = len(indices), voisins + 1
+    colonnes = indices[:, :gardes]
+    valeurs = distances[:, :gardes].astype(np.float64) ** 2
+
+    return csr_matrix(
+        (valeurs.ravel(), colonnes.ravel(), np.arange(0, n * gardes + 1, gardes)),
+        shape=(n, n))
+
+def conservation_voisinage(indices: np.ndarray, x_proj: np.ndarray, voisins: int = 10) -> float:
+    """Mesure la part des plus proches voisins d'origine qui restent voisins dans
+    une projection (1 : voisinage parfaitement conservé), sur 2 000 lignes au plus.
+
+    Args:
+        indices (np.ndarray): Le graphe des voisins d'origine (voir `IndexVoisins.graphe`).
+        x_proj (np.ndarray): La projection des mêmes lignes.
+        voisins (int): Le nombre de voisins comparés.
+
+    Returns:
+        float: La part moyenne des voisins conservés.
+    """
+
+    from sklearn.neighbors import NearestNeighbors
+
+    n = len(x_proj)
+    voisins = min(voisins, indices.shape[1] - 1)
+    lignes = np.random.default_rng(42).choice(n, size=min(n, 2_000), replace=False)
+
+    _, proj = NearestNeighbors(n_neighbors=voisins + 1).fit(x_proj).kneighbors(x_proj[lignes])
+    origine = indices[lignes]
+
+    garder_origine = _sans_soi(origine, lignes)
+    garder_proj = _sans_soi(proj, lignes)
+    communs = [
+        np.intersect1d(o[m_o][:voisins], p[m_p][:voisins]).size
+        for o, m_o, p, m_p in zip(origine, garder_origine, proj, garder_proj)]
+
+    return float(np.mean(communs) / voisins)
@@ -28,14 +28,34 @@ class:
 
             Returns:
                 (Union[pd.DataFrame, np.ndarray, str]) : La valeur retournée est l\'une des types de l\'union.
+
+            detecter_delimiteur(self, file_path) -> str
+            Détecte le délimiteur d\'un fichier CSV à partir d\'un petit échantillon de tête.
+
+            iterer_morceaux_csv(self, file_path) -> Iterator[pd.DataFrame]
+            Lit un fichier CSV par morceaux de taille bornée avec le moteur C.
+
+            iterer_morceaux_parquet(self, file_path, colonnes) -> Iterator[pd.DataFrame]
+            Lit un fichier Parquet par lots de lignes, sans charger tout le fichier.
+
+            iterer_morceaux_arrow(self, file_path, colonnes) -> Iterator[pd.DataFrame]
+            Lit un fichier Arrow IPC projeté en mémoire par tranches de lignes.
+
+            iterer_morceaux(self, file_path, colonnes) -> Iterator[pd.DataFrame]
+            Lit un fichier CSV, Parquet ou Arrow par morceaux selon son extension.
+
+            load_csv_par_morceaux(self, file_path) -> pd.DataFrame
+            Assemble les morceaux d\'un fichier CSV en respectant un plafond mémoire.
 """
 
 from dataclasses import dataclass
 import os
+import csv
 import json
 import sqlite3
 from typing import (
     Union,
+    Iterator,
     Optional,
     Annotated,
     )
@@ -54,8 +74,17 @@ from fastapi import (
     # status,
     # HTTPException
     )
-# import pyarrow.parquet as pq
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError: # pyarrow est optionnel, la lecture Parquet/Arrow par lots est alors indisponible.
+    pa = None
+    pq = None
 # from pathlib import Path
+from modules.cache_donnees import (
+    CacheDonnees,
+    FORMATS_EN_CACHE,
+    )
 
 router = APIRouter()
 
@@ -75,6 +104,34 @@ class FilePayload(BaseModel):
         description="Cette variable reçois le chemin des données à charger.",
     )]
 
+    streaming: Annotated[
+        bool,
+        Field(
+        default=False,
+        title="streaming",
+        description="""Lecture d'un fichier CSV par morceaux bornés pour
+        les gros volumes de données.""",
+    )]
+
+    compacter: Annotated[
+        bool,
+        Field(
+        default=False,
+        title="compacter",
+        description="""Réduction des types des colonnes après le chargement
+        (entiers réduits, texte répétitif en catégories) pour économiser la mémoire.""",
+    )]
+
+    memoire_max: Annotated[
+        Optional[int],
+        Field(
+        default=None,
+        gt=0,
+        title="memoire_max",
+        description="""Plafond mémoire en octets du tableau chargé par morceaux ou relu
+        depuis le cache (il ne peut qu'abaisser celui du serveur).""",
+    )]
+
 # @dataclass(config=ConfigDict(arbitrary_types_allowed=True))
 @dataclass
 class DataLoader():
@@ -87,6 +144,12 @@ class DataLoader():
         Cette variable reçoit les données chargées sous forme tabulaire.
         format: str | None = None
         Cette variable reçoit le format du fichier chargé.
+        taille_morceau: int = 100_000
+        Le nombre de lignes lues à la fois en mode streaming.
+        memoire_max: int | None = None
+        Le plafond mémoire (en octets) du tableau assemblé en mode streaming.
+        cache: CacheDonnees | None = None
+        Le cache disque des tableaux déjà analysés (aucun cache par défaut).
 
     Méthodes:
         load(
@@ -94,20 +157,34 @@ class DataLoader():
             file_type,
             sql_query,
             db_path,
-            image_as_dataframe
+            image_as_dataframe,
+            streaming
             ) -> Union[pd.DataFrame, np.ndarray, str]
+        detecter_delimiteur(file_path) -> str
+        iterer_morceaux_csv(file_path) -> Iterator[pd.DataFrame]
+        iterer_morceaux_parquet(file_path, colonnes) -> Iterator[pd.DataFrame]
+        iterer_morceaux_arrow(file_path, colonnes) -> Iterator[pd.DataFrame]
+        iterer_morceaux(file_path, colonnes) -> Iterator[pd.DataFrame]
+        load_csv_par_morceaux(file_path) -> pd.DataFrame
     """
     # Veuillez mettre cette variable à "None" lors de l'initialisation de la classe.
     df: Optional[pd.DataFrame] = None
     # Veuillez mettre cette variable à "None" lors de l'initialisation de la classe.
     format: Optional[str] = None
+    # Nombre de lignes par morceau lors d'une lecture en streaming.
+    taille_morceau: int = 100_000
+    # Plafond mémoire en octets du tableau assemblé (`None` pour aucune limite).
+    memoire_max: Optional[int] = None
+    # Cache disque des tableaux déjà analysés (`None` pour le désactiver).
+    cache: Optional[CacheDonnees] = None
 
     def load(
         self,
         file_path: str,
         sql_query: Optional[str] = None,
         db_path: Optional[str] = None,
-        image_as_dataframe: bool = False
+        image_as_dataframe: bool = False,
+        streaming: bool = False
         ) -> Union[pd.DataFrame, np.ndarray, str]:
         """
         Cette méthode charge un fichier de données en fonction de son extension.
@@ -119,6 +196,7 @@ class DataLoader():
             sql_query (str | None) : Reçoi une requête SQL pour lire dans une base de données.
             db_path (str | None) : Reçoi le DNS de la base de données.
             image_as_dataframe (bool) : Confirme le chargement d'une image (`False` par défaut).
+            streaming (bool) : Lit un fichier CSV local par morceaux (`False` par défaut).
 
         Returns:
             (Union[pd.DataFrame, np.ndarray, str]) : Au moins un type de l'union est retourné.
@@ -147,8 +225,19 @@ class DataLoader():
                 # Récupérer le suffix du chemin de données (i.e 'csv', 'json' etc).
                 self.format = file_path.split(".")[-1]
 
+                # Un fichier déjà analysé est relu depuis le cache disque.
+                en_cache = self.cache is not None and self.format in FORMATS_EN_CACHE
+                if en_cache:
+                    df_cache = self.cache.lire(file_path, memoire_max=self.memoire_max)
+                    if df_cache is not None:
+                        self.df = df_cache
+                        print(f"\nFichier '{file_path.split('/')[-1]}' lu depuis le cache.")
+                        return self.df
+
                 try:
-                    if self.format == 'csv':
+                    if self.format == 'csv' and streaming:
+                        self.df = self.load_csv_par_morceaux(file_path)
+                    elif self.format == 'csv':
                         self.df = pd.read_csv(
                             filepath_or_buffer=file_path,
                             delimiter=None, # Trouve le délimiteur automatiquement.
@@ -186,6 +275,8 @@ class DataLoader():
                             self.df = f.read()
                     else:
                         raise ValueError("Format de fichier non supporté.")
+                    if en_cache:
+                        self.cache.ecrire(file_path, self.df)
                     print(f"\nFichier '{file_path.split('/')[-1]}' chargé avec succès.")
                 except pd.errors.ParserError as pe:
                     raise pd.errors.ParserError(
@@ -195,5 +286,237 @@ class DataLoader():
             raise FileNotFoundError(
                 f"Erreur : Le fichier à l'adresse '{file_path.split('/')[-1]}' est introuvable."
                 ) from exc
+        except MemoryError:
+            # Le plafond `memoire_max` est dépassé : l'erreur est transmise telle quelle.
+            raise
         except Exception as e:
             raise ValueError(f"\nUne erreur est survenue lors du chargement : {e}\n") from e
+
+    def detecter_delimiteur(self, file_path: str, taille_echantillon: int = 64 * 1024) -> str:
+        """Détecte le délimiteur d'un fichier CSV une seule fois à partir
+        d'un petit échantillon de tête, au lieu de laisser pandas le chercher
+        avec le moteur python sur tout le fichier.
+
+        Args:
+            file_path (str): Le chemin du fichier CSV.
+            taille_echantillon (int): Le nombre d'octets lus en tête de fichier.
+
+        Returns:
+            str: Le délimiteur détecté (`,` par défaut).
+        """
+
+        with open(file_path, 'r', encoding='utf-8', newline='') as f:
+            echantillon = f.read(taille_echantillon)
+
+        # Ne garder que les lignes complètes de l'échantillon.
+        if len(echantillon) == taille_echantillon and "\n" in echantillon:
+            echantillon = echantillon[: echantillon.rfind("\n")]
+
+        try:
+            return csv.Sniffer().sniff(echantillon, delimiters=",;\t|").delimiter
+        except csv.Error:
+            return ","
+
+    def iterer_morceaux_csv(
+        self,
+        file_path: str,
+        taille_morceau: Optional[int] = None,
+        colonnes: Optional[list[str]] = None
+        ) -> Iterator[pd.DataFrame]:
+        """Lit un fichier CSV par morceaux de taille bornée avec le moteur C.
+        Le typage est déduit sur chaque morceau et les valeurs infinies
+        des colonnes décimales sont remplacées par `NaN`.
+
+        Args:
+            file_path (str): Le chemin du fichier CSV.
+            taille_morceau (int | None): Le nombre de lignes par morceau
+            (`self.taille_morceau` par défaut).
+            colonnes (list[str] | None): Les seules colonnes analysées par le lecteur
+            (toutes par défaut), dans l'ordre du fichier.
+
+        Yields:
+            Iterator[pd.DataFrame]: Les morceaux du fichier les uns après les autres.
+        """
+
+        delimiteur = self.detecter_delimiteur(file_path)
+
+        with pd.read_csv(
+            filepath_or_buffer=file_path,
+            sep=delimiteur,
+            engine="c",
+            chunksize=taille_morceau or self.taille_morceau,
+            usecols=colonnes,
+            ) as lecteur:
+            for morceau in lecteur:
+                for col in morceau.select_dtypes(include="floating").columns:
+                    valeurs = morceau[col].to_numpy()
+                    non_finies = ~np.isfinite(valeurs) & ~np.isnan(valeurs)
+                    if non_finies.any():
+                        morceau[col] = np.where(non_finies, np.nan, valeurs)
+                yield morceau
+
+    def iterer_morceaux_parquet(
+        self,
+        file_path: str,
+        taille_morceau: Optional[int] = None,
+        colonnes: Optional[list[str]] = None
+        ) -> Iterator[pd.DataFrame]:
+        """Lit un fichier Parquet par lots de lignes : seul le lot en cours
+        (et les colonnes demandées) est chargé en mémoire.
+
+        Args:
+            file_path (str): Le chemin du fichier Parquet.
+            taille_morceau (int | None): Le nombre de lignes par morceau
+            (`self.taille_morceau` par défaut).
+            colonnes (list[str] | None): Les colonnes à lire (toutes par défaut).
+
+        Raises:
+            ImportError: Une erreur est levée si pyarrow n'est pas installé.
+
+        Yields:
+            Iterator[pd.DataFrame]: Les morceaux du fichier les uns après les autres.
+        """
+
+        if pq is None:
+            raise ImportError("La lecture d'un fichier Parquet par morceaux nécessite pyarrow.")
+
+        fichier = pq.ParquetFile(file_path)
+        for lot in fichier.iter_batches(
+            batch_size=taille_morceau or self.taille_morceau,
+            columns=colonnes):
+            yield lot.to_pandas()
+
+    def iterer_morceaux_arrow(
+        self,
+        file_path: str,
+        taille_morceau: Optional[int] = None,
+        colonnes: Optional[list[str]] = None
+        ) -> Iterator[pd.DataFrame]:
+        """Lit un fichier Arrow IPC (celui du stockage partagé) par tranches de lignes.
+        Le fichier est projeté en mémoire : seule la tranche en cours est convertie.
+
+        Args:
+            file_path (str): Le chemin du fichier Arrow IPC.
+            taille_morceau (int | None): Le nombre de lignes par morceau
+            (`self.taille_morceau` par défaut).
+            colonnes (list[str] | None): Les colonnes à lire (toutes par défaut).
+
+        Raises:
+            ImportError: Une erreur est levée si pyarrow n'est pas installé.
+
+        Yields:
+            Iterator[pd.DataFrame]: Les morceaux du fichier les uns après les autres.
+        """
+
+        if pa is None:
+            raise ImportError("La lecture d'un fichier Arrow par morceaux nécessite pyarrow.")
+
+        taille_morceau = taille_morceau or self.taille_morceau
+        with pa.memory_map(file_path, "r") as source:
+            # Sans copie : la table référence les pages du fichier projeté.
+            table = pa.ipc.open_file(source).read_all()
+            if colonnes is not None:
+                table = table.select(colonnes)
+            for debut in range(0, table.num_rows, taille_morceau):
+                yield table.slice(debut, taille_morceau).to_pandas()
+
+    def iterer_morceaux(
+        self,
+        file_path: str,
+        taille_morceau: Optional[int] = None,
+        colonnes: Optional[list[str]] = None
+        ) -> Iterator[pd.DataFrame]:
+        """Lit un fichier CSV, Parquet ou Arrow IPC par morceaux, selon son extension.
+
+        Args:
+            file_path (str): Le chemin du fichier.
+            taille_morceau (int | None): Le nombre de lignes par morceau
+            (`self.taille_morceau` par défaut).
+            colonnes (list[str] | None): Les colonnes à garder (toutes par défaut).
+
+        Raises:
+            ValueError: Une erreur est levée si le format ne se lit pas par morceaux.
+
+        Yields:
+            Iterator[pd.DataFrame]: Les morceaux du fichier les uns après les autres.
+        """
+
+        if file_path.endswith(".parquet"):
+            yield from self.iterer_morceaux_parquet(file_path, taille_morceau, colonnes)
+        elif file_path.endswith(".arrow"):
+            yield from self.iterer_morceaux_arrow(file_path, taille_morceau, colonnes)
+        elif file_path.endswith(".csv"):
+            # Les colonnes non demandées ne sont pas analysées ; `usecols` garde
+            # l'ordre du fichier, d'où la sélection dans l'ordre demandé.
+            for morceau in self.iterer_morceaux_csv(file_path, taille_morceau, colonnes):
+                yield morceau[colonnes] if colonnes else morceau
+        else:
+            raise ValueError(
+                f"\nLe format du fichier '{os.path.basename(file_path)}' "
+                "ne se lit pas par morceaux (CSV, Parquet ou Arrow).\n")
+
+    def load_csv_par_morceaux(self, file_path: str) -> pd.DataFrame:
+        """Assemble les morceaux d'un fichier CSV en un seul tableau
+        sans dépasser le plafond mémoire `self.memoire_max`. L'assemblage copie
+        les morceaux : le plafond doit contenir les morceaux et leur copie.
+        Les types, déduits sur chaque morceau, sont ramenés à un type commun
+        (voir `_types_communs`) avant l'assemblage.
+
+        Args:
+            file_path (str): Le chemin du fichier CSV.
+
+        Raises:
+            MemoryError: Une erreur est levée si le plafond mémoire est dépassé.
+
+        Returns:
+            pd.DataFrame: Le tableau assemblé à partir des morceaux.
+        """
+
+        morceaux: list[pd.DataFrame] = []
+        memoire_utilisee = 0
+
+        for morceau in self.iterer_morceaux_csv(file_path):
+            memoire_utilisee += int(morceau.memory_usage(deep=True).sum())
+            # Au moment de `pd.concat`, les morceaux et le tableau assemblé coexistent.
+            if self.memoire_max is not None and 2 * memoire_utilisee > self.memoire_max:
+                raise MemoryError(
+                    f"Le plafond mémoire de {self.memoire_max} octets est dépassé "
+                    f"après {sum(len(m) for m in morceaux)} lignes.")
+            morceaux.append(morceau)
+
+        if not morceaux:
+            return pd.DataFrame()
+
+        return pd.concat(self._types_communs(morceaux), ignore_index=True)
+
+    @staticmethod
+    def _types_communs(morceaux: list[pd.DataFrame]) -> list[pd.DataFrame]:
+        """Ramène chaque colonne des morceaux à un même type, comme une lecture d'un seul
+        tenant : le type numérique le plus large (un entier devient décimal si un morceau
+        contient des valeurs manquantes), sinon du texte. Sans cela, `pd.concat` produit
+        des colonnes `object` mêlant nombres et textes.
+
+        Args:
+            morceaux (list[pd.DataFrame]): Les morceaux lus avec le même en-tête.
+
+        Returns:
+            list[pd.DataFrame]: La même liste, dont les morceaux sont convertis un à un
+            (seules les colonnes dont le type change d'un morceau à l'autre).
+        """
+
+        types = {}
+        for col in morceaux[0].columns:
+            types_col = {morceau[col].dtype for morceau in morceaux}
+            if len(types_col) == 1:
+                continue
+            if all(dtype.kind in "iuf" for dtype in types_col):
+                types[col] = np.result_type(*types_col)
+            else:
+                # Les nombres relus en texte gardent leur écriture python ("1", "1.5", "True").
+                types[col] = "str"
+
+        # Remplacés un à un : un seul morceau est copié à la fois.
+        if types:
+            for i, morceau in enumerate(morceaux):
+                morceaux[i] = morceau.astype(types)
+        return morceaux
@@ -14,24 +14,57 @@ Classes:
                     nombre_dimenssion (int, optional): Le nombre de dimention de réduction. Defaults to 1.
 
                 Returns:
-                    ndarray: Matrice construite par la méthode d'ACP.
+                    ndarray: Les coordonnées des individus sur les composantes principales.
+
+                Si `df` est le chemin d'un fichier CSV, Parquet ou Arrow, l'ACP est calculée
+                hors mémoire par morceaux (résultat projeté dans `chemin_sortie` s'il est donné).
+
+            informations(self) -> dict:
+                La variance expliquée et les contributions (loadings) des variables.
+
 Returns:
-    ndarray: Matrice construite par la méthode d'ACP.
+    ndarray: Les coordonnées des individus sur les composantes principales.
 """
 
-from typing import Union
+from typing import (
+    Iterator,
+    Optional,
+    Union,
+    )
 from sklearn.preprocessing import StandardScaler
-from sklearn.decomposition import PCA
+from sklearn.decomposition import (
+    IncrementalPCA,
+    PCA,
+    )
 import numpy as np
 import pandas as pd
 from pydantic import ConfigDict
 from pydantic.dataclasses import dataclass
+from modules.loading import DataLoader
 
 @dataclass(config=ConfigDict(arbitrary_types_allowed=True))
 class MethodeACP:
-    """Réduction de dimenssion avec l'ACP."""
+    """Réduction de dimenssion avec l'ACP.
+
+    Après `acp_reduction`, la variance expliquée et les contributions des
+    variables restent disponibles sans refaire l'ajustement.
+
+    Si `df` est le chemin d'un fichier CSV, Parquet ou Arrow, l'ACP est calculée hors
+    mémoire : seul un morceau de `taille_morceau` lignes (et des `colonnes`) est
+    chargé à la fois. Les coordonnées sont écrites dans `chemin_sortie` s'il est
+    donné (le fichier appartient alors à l'appelant), sinon gardées en mémoire.
+    """
 
     df: Union[pd.DataFrame, np.ndarray, str]
+    # "auto" : covariance_eigh pour un tableau haut et étroit, SVD randomisée sinon.
+    svd_solver: str = "auto"
+    variance_expliquee: Optional[np.ndarray] = None
+    composantes: Optional[np.ndarray] = None
+    # Mode hors mémoire : lignes par morceau, colonnes numériques retenues
+    # (celles du premier morceau par défaut) et fichier du résultat projeté (facultatif).
+    taille_morceau: int = 100_000
+    colonnes: Optional[list[str]] = None
+    chemin_sortie: Optional[str] = None
 
     def acp_reduction(self, nombre_dimenssion: int = 1) -> np.ndarray:
         """Méthode de réduction d'ACP
@@ -40,17 +73,132 @@ class MethodeACP:
             nombre_dimenssion (int, optional): Le nombre de dimention de réduction. Defaults to 1.
 
         Returns:
-            ndarray: Matrice construite par la méthode d'ACP.
+            ndarray: Les coordonnées des individus sur les composantes principales (n x k).
         """
 
+        if isinstance(self.df, str):
+            return self._acp_reduction_flux(nombre_dimenssion)
+
+        # Le float32 divise par deux la mémoire et le temps de calcul, la précision
+        # suffit pour une visualisation.
         normalisation = StandardScaler()
 
-        x_normaliser = normalisation.fit_transform(self.df)
+        x_normaliser = normalisation.fit_transform(np.asarray(self.df, dtype=np.float32))
 
-        acp = PCA(n_components=nombre_dimenssion) # n_components mentionne les axes (dimenssions)
+        acp = PCA(
+            n_components=nombre_dimenssion, # n_components mentionne les axes (dimenssions)
+            svd_solver=self.svd_solver,
+            random_state=42)
 
         x_acp = acp.fit_transform(x_normaliser)
 
-        x_reconstructed = acp.inverse_transform(x_acp)
+        self.variance_expliquee = acp.explained_variance_ratio_
+        self.composantes = acp.components_
+
+        return x_acp
+
+    def _morceaux(self) -> Iterator[np.ndarray]:
+        """Relit le fichier de `df` morceau par morceau, en float32.
+
+        Yields:
+            Iterator[np.ndarray]: Les colonnes numériques de chaque morceau.
+        """
+
+        chargeur = DataLoader(taille_morceau=self.taille_morceau)
+        for morceau in chargeur.iterer_morceaux(self.df, colonnes=self.colonnes):
+            if self.colonnes is None:
+                self.colonnes = morceau.select_dtypes(include=np.number).columns.to_list()
+            x = morceau[self.colonnes].to_numpy(dtype=np.float32, na_value=np.nan)
+            # Les valeurs infinies sont traitées comme des valeurs manquantes.
+            x[np.isinf(x)] = np.nan
+            yield x
+
+    def _acp_reduction_flux(self, nombre_dimenssion: int) -> np.ndarray:
+        """ACP hors mémoire en trois lectures du fichier : la normalisation, puis
+        l'ACP incrémentale sont ajustées morceau par morceau, puis chaque morceau est
+        projeté. Hors coordonnées (n x k), la mémoire utilisée ne dépend que de
+        `taille_morceau`. Les valeurs manquantes sont remplacées par la moyenne de leur colonne.
+
+        Args:
+            nombre_dimenssion (int): Le nombre de dimention de réduction.
+
+        Raises:
+            ValueError: Si aucun morceau n'a au moins `nombre_dimenssion` lignes.
+
+        Returns:
+            np.ndarray: Les coordonnées des individus en float32 (`np.memmap`
+            projeté dans `chemin_sortie` s'il est donné).
+        """
+
+        normalisation = StandardScaler()
+        lignes = 0
+        for x in self._morceaux():
+            normalisation.partial_fit(x)
+            lignes += len(x)
+
+        def normaliser(x: np.ndarray) -> np.ndarray:
+            # Après normalisation, la moyenne d'une colonne vaut 0.
+            return np.nan_to_num(normalisation.transform(x), nan=0.0)
+
+        acp = IncrementalPCA(n_components=nombre_dimenssion)
+        ajustee = False
+        for x in self._morceaux():
+            # Un morceau doit avoir au moins autant de lignes que de composantes.
+            if len(x) >= nombre_dimenssion:
+                acp.partial_fit(normaliser(x))
+                ajustee = True
+        if not ajustee:
+            raise ValueError(
+                f"\nL'ACP hors mémoire demande au moins {nombre_dimenssion} lignes "
+                f"par morceau ({lignes} lignes lues).\n")
+
+        # Les coordonnées (k colonnes) sont bien plus petites que les données :
+        # sans fichier demandé, elles restent en mémoire et aucun fichier n'est laissé.
+        if self.chemin_sortie is None:
+            x_acp = np.empty((lignes, nombre_dimenssion), dtype=np.float32)
+        else:
+            x_acp = np.memmap(
+                self.chemin_sortie,
+                dtype=np.float32,
+                mode="w+",
+                shape=(lignes, nombre_dimenssion))
+
+        debut = 0
+        for x in self._morceaux():
+            x_acp[debut: debut + len(x)] = acp.transform(normaliser(x))
+            debut += len(x)
+        if isinstance(x_acp, np.memmap):
+            x_acp.flush()
+
+        self.variance_expliquee = acp.explained_variance_ratio_
+        self.composantes = acp.components_
+
+        return x_acp
+
+    def informations(self) -> dict:
+        """Retourne la variance expliquée par chaque composante et la contribution
+        (loading) de chaque variable, sérialisables en JSON.
+
+        Raises:
+            ValueError: Si `acp_reduction` n'a pas encore été appelée.
+
+        Returns:
+            dict: La variance expliquée et les contributions par composante.
+        """
 
-        return x_reconstructed
+        if self.variance_expliquee is None or self.composantes is None:
+            raise ValueError("\nL'ACP n'a pas encore été calculée.\n")
+
+        if self.colonnes is not None:
+            colonnes = [str(col) for col in self.colonnes]
+        elif isinstance(self.df, pd.DataFrame):
+            colonnes = [str(col) for col in self.df.columns]
+        else:
+            colonnes = [str(i) for i in range(self.composantes.shape[1])]
+
+        return {
+            'variance_expliquee': self.variance_expliquee.astype(float).tolist(),
+            'contributions': {
+                f"PC_{i + 1}": dict(zip(colonnes, composante.astype(float).tolist()))
+                for i, composante in enumerate(self.composantes)},
+        }
@@ -1,25 +1,178 @@
 """Module de réduction de dimmension avec la méthode t-SNE.
 
+Au-delà de ce que t-SNE peut calculer dans le budget de temps, seuls des points
+repères (tirés dans chaque groupe d'un k-means, en proportion de sa taille) sont
+réduits avec t-SNE ; les autres points sont placés par interpolation de leurs
+plus proches repères dans l'espace d'origine.
+
 Returns:
     ndarray: Matrice de données obtenu après réduction avec t-SNE.
 """
 
-from typing import Union
+from typing import (
+    Optional,
+    Union,
+    )
 import pandas as pd
 import numpy as np
-from sklearn.manifold import TSNE
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.decomposition import PCA
+from sklearn.neighbors import NearestNeighbors
 from pydantic import ConfigDict
 from pydantic.dataclasses import dataclass
+from modules.executeur_reduction import coeurs_disponibles
+from modules.index_voisins import (
+    IndexVoisins,
+    matrice_distances_tsne,
+    )
+
+# Coût mesuré de t-SNE (Barnes-Hut, sur un coeur) : environ 6e-4 * m * ln(m) secondes
+# pour m points. Le gradient est réparti sur les coeurs (OpenMP) dont dispose le
+# processus, seulement sa part quand plusieurs réductions s'exécutent en parallèle.
+COUT_TSNE_PAR_POINT_COEUR = 6e-4
+# Nombre minimal de repères, même si le budget est dépassé.
+REPERES_MIN = 1_000
+# Nombre de groupes du k-means servant à répartir les repères.
+GROUPES_REPERES = 50
+# Nombre de points interpolés à la fois (borne la mémoire des distances).
+TAILLE_LOT_INTERPOLATION = 50_000
 
 @dataclass(config=ConfigDict(arbitrary_types_allowed=True))
 class MethodeTSNE:
     """Classe de réduction de dimension avec la méthode t-SNE.
+
+    Args:
+        df (pd.DataFrame | np.ndarray): Les données numériques à réduire.
+        perplexity (float): La perplexité de t-SNE, le nombre effectif de voisins (30 par défaut).
+        budget_secondes (float): Le temps de calcul visé pour t-SNE (30 secondes par défaut).
+        max_points (int | None): Le nombre de repères, pour ne pas le déduire du budget.
+        voisins (int): Le nombre de repères voisins utilisés pour placer un point.
+        random_state (int): La graine du tirage des repères.
+        reperes (np.ndarray | None): Les indices des repères du dernier calcul
+        (`None` si tous les points ont été réduits avec t-SNE).
+        index (IndexVoisins | None): L'index partagé des plus proches voisins, utilisé
+        quand tous les points sont réduits ; sans lui, t-SNE fait sa propre recherche.
+        coeurs (int | None): Le nombre de coeurs du processus qui calcule t-SNE, pour
+        déduire les repères du budget (par défaut ceux de ce processus).
     """
 
     df: Union[pd.DataFrame, np.ndarray, str]
+    perplexity: float = 30.0
+    budget_secondes: float = 30.0
+    max_points: Optional[int] = None
+    voisins: int = 10
+    random_state: int = 42
+    reperes: Optional[np.ndarray] = None
+    index: Optional[IndexVoisins] = None
+    coeurs: Optional[int] = None
+
+    def nombre_de_reperes(self, n: int) -> int:
+        """Retourne le nombre de points que t-SNE peut réduire dans le budget de temps.
+
+        Args:
+            n (int): Le nombre de lignes des données.
+
+        Returns:
+            int: Le nombre de repères (`n` si toutes les lignes tiennent dans le budget).
+        """
+
+        if self.max_points is not None:
+            return min(n, self.max_points)
+
+        # Plus grand m tel que cout * m * ln(m) <= budget (recherche dichotomique).
+        cout = COUT_TSNE_PAR_POINT_COEUR / (self.coeurs or coeurs_disponibles())
+        bas, haut = REPERES_MIN, max(n, REPERES_MIN)
+        while bas < haut:
+            milieu = (bas + haut + 1) // 2
+            if cout * milieu * np.log(milieu) <= self.budget_secondes:
+                bas = milieu
+            else:
+                haut = milieu - 1
+        return min(n, bas)
+
+    def _choisir_reperes(self, x: np.ndarray, m: int) -> np.ndarray:
+        """Tire `m` repères environ, répartis entre les groupes d'un k-means
+        en proportion de leur taille (au moins un par groupe).
+
+        Args:
+            x (np.ndarray): Les données.
+            m (int): Le nombre de repères voulu.
+
+        Returns:
+            np.ndarray: Les indices triés des repères.
+        """
+
+        generateur = np.random.default_rng(self.random_state)
+        n = len(x)
+
+        # Le k-means est appris sur un échantillon, puis chaque ligne est affectée à un groupe.
+        echantillon = generateur.choice(n, size=min(n, 100 * GROUPES_REPERES), replace=False)
+        kmeans = MiniBatchKMeans(
+            n_clusters=min(GROUPES_REPERES, m),
+            n_init=1,
+            random_state=self.random_state).fit(x[echantillon])
+        groupes = kmeans.predict(x)
+
+        indices = []
+        for groupe in np.unique(groupes):
+            membres = np.flatnonzero(groupes == groupe)
+            quota = min(len(membres), max(1, round(m * len(membres) / n)))
+            indices.append(generateur.choice(membres, size=quota, replace=False))
+        return np.sort(np.concatenate(indices))
+
+    def _interpoler(self, x: np.ndarray, x_reperes: np.ndarray, y_reperes: np.ndarray) -> np.ndarray:
+        """Place des points dans l'espace réduit par la moyenne des positions de
+        leurs plus proches repères, pondérée par l'inverse de la distance.
+
+        Args:
+            x (np.ndarray): Les points à placer.
+            x_reperes (np.ndarray): Les repères dans l'espace d'origine.
+            y_reperes (np.ndarray): Les repères dans l'espace réduit.
+
+        Returns:
+            np.ndarray: Les points placés dans l'espace réduit.
+        """
+
+        voisins = NearestNeighbors(n_neighbors=min(self.voisins, len(x_reperes))).fit(x_reperes)
+        y = np.empty((len(x), y_reperes.shape[1]), dtype=np.float32)
+
+        for debut in range(0, len(x), TAILLE_LOT_INTERPOLATION):
+            lot = slice(debut, debut + TAILLE_LOT_INTERPOLATION)
+            distances, indices = voisins.kneighbors(x[lot])
+            poids = 1.0 / (distances + 1e-12)
+            y[lot] = np.einsum("ij,ijk->ik", poids, y_reperes[indices]) / poids.sum(axis=1)[:, None]
+        return y
+
+    def _tsne_voisins(self, x: np.ndarray, nombre_de_dimension: int) -> np.ndarray:
+        """t-SNE à partir du graphe des voisins de l'index partagé, avec la même
+        initialisation par ACP que t-SNE calcule lui-même.
+
+        Args:
+            x (np.ndarray): Les données.
+            nombre_de_dimension (int): Le nombre de dimension de réduction.
+
+        Returns:
+            np.ndarray: Matrice de données réduite.
+        """
+
+        from sklearn.manifold import TSNE # pylint: disable=import-outside-toplevel
+
+        tsne = TSNE(
+            n_components=nombre_de_dimension,
+            perplexity=self.perplexity,
+            metric="precomputed")
+        voisins = min(len(x) - 1, int(3.0 * tsne.perplexity + 1))
+        indices, distances = self.index.graphe(x, voisins)
+
+        x_init = PCA(n_components=nombre_de_dimension, svd_solver="randomized").fit_transform(x)
+        tsne.set_params(init=(x_init / np.std(x_init[:, 0]) * 1e-4).astype(np.float32))
+
+        return tsne.fit_transform(matrice_distances_tsne(indices, distances, voisins))
 
     def tsne_reduction(self, nombre_de_dimension: int = 1) -> np.ndarray:
-        """Méthode de réduction de dimension avec t-SNE.
+        """Méthode de réduction de dimension avec t-SNE. Si les données dépassent
+        le budget de temps, seuls les repères sont réduits avec t-SNE et les autres
+        points sont interpolés.
 
         Args:
             nombre_de_dimension (int, optional): Le nombre de dimension de réduction. Defaults to 1.
@@ -28,8 +181,35 @@ class MethodeTSNE:
             np.ndarray: Matrice de données réduite.
         """
 
-        tsne = TSNE(n_components= nombre_de_dimension)
+        # Importé à la première réduction seulement.
+        from sklearn.manifold import TSNE # pylint: disable=import-outside-toplevel
+
+        x = np.asarray(self.df, dtype=np.float32)
+        m = self.nombre_de_reperes(len(x))
+
+        if m >= len(x):
+            self.reperes = None
+
+            if self.index is not None:
+                return self._tsne_voisins(x, nombre_de_dimension)
+
+            tsne = TSNE(n_components= nombre_de_dimension, perplexity=self.perplexity)
+
+            x_tsne = tsne.fit_transform(x)
+
+            return x_tsne
+
+        # Les repères retenus restent disponibles dans `reperes`.
+        self.reperes = self._choisir_reperes(x, m)
+
+        tsne = TSNE(
+            n_components=nombre_de_dimension,
+            perplexity=self.perplexity,
+            random_state=self.random_state)
+        y_reperes = tsne.fit_transform(x[self.reperes])
 
-        x_tsne = tsne.fit_transform(self.df)
+        x_tsne = self._interpoler(x, x[self.reperes], y_reperes)
+        # Les repères gardent exactement leur position t-SNE.
+        x_tsne[self.reperes] = y_reperes
 
         return x_tsne
@@ -1,22 +1,39 @@
 """Module de réduction de dimension avec la méthode UMAP.
 
+`umap` (et numba) n'est importé qu'à la première réduction, et `prechauffer`
+compile ses fonctions à l'avance pour que la première vraie réduction ne paie
+pas les secondes de compilation à la volée.
+
 Returns:
     np.ndarray: Matrice de réduction de données obtenu grâce à la méthode UMAP.
 """
 
-from typing import Union
+from typing import (
+    Optional,
+    Union,
+    )
 import pandas as pd
 import numpy as np
-import umap
 from pydantic import ConfigDict
 from pydantic.dataclasses import dataclass
+from modules.index_voisins import IndexVoisins
 
 @dataclass(config=ConfigDict(arbitrary_types_allowed=True))
 class MethodeUMAP:
     """Classe de réduction de dimension avec la méthode UMAP.
+
+    Args:
+        df (pd.DataFrame | np.ndarray): Les données numériques à réduire.
+        n_neighbors (int): Le nombre de voisins d'UMAP (15 par défaut).
+        min_dist (float): La distance minimale entre deux points de la projection (0.1 par défaut).
+        index (IndexVoisins | None): L'index partagé des plus proches voisins ;
+        sans lui, UMAP fait sa propre recherche des voisins.
     """
 
     df: Union[pd.DataFrame, np.ndarray, str]
+    n_neighbors: int = 15
+    min_dist: float = 0.1
+    index: Optional[IndexVoisins] = None
 
     def umap_reduction(self, nombre_de_dimension: int = 1) -> np.ndarray:
         """Méthode de réduction de dimension UPAM.
@@ -28,8 +45,32 @@ class MethodeUMAP:
             np.ndarray: Matrice de réduction de données obtenu grâce à la méthode UMAP.
         """
 
-        _umap = umap.UMAP(n_components= nombre_de_dimension)
+        import umap # pylint: disable=import-outside-toplevel
+
+        graphe = (None, None, None)
+        if self.index is not None and len(self.df) > self.n_neighbors:
+            # UMAP ne garde que ses `n_neighbors` premiers voisins (le point compris).
+            indices, distances = self.index.graphe(self.df)
+            graphe = (indices[:, :self.n_neighbors], distances[:, :self.n_neighbors])
+
+        _umap = umap.UMAP(
+            n_components= nombre_de_dimension,
+            n_neighbors=self.n_neighbors,
+            min_dist=self.min_dist,
+            precomputed_knn=graphe)
 
         x_umap = _umap.fit_transform(self.df)
 
         return x_umap
+
+def prechauffer() -> None:
+    """Compile les fonctions numba d'UMAP avec un petit calcul, en utilisant
+    le cache disque de numba (`NUMBA_CACHE_DIR`) pour les fonctions qui l'autorisent.
+
+    À n'appeler que dans un processus de réduction : un processus qui a exécuté
+    du code numba parallèle ne peut plus être dupliqué sans risque par fork.
+    """
+
+    x = np.random.default_rng(0).normal(size=(100, 4)).astype(np.float32)
+    for axes in (2, 3):
+        MethodeUMAP(x, n_neighbors=5).umap_reduction(nombre_de_dimension=axes)
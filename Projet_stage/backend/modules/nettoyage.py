@@ -5,88 +5,159 @@ Returns:
     pd.DataFrame: Un nouveau table de données sans cellule vides.
 """
 
-from typing import Union, Optional, Literal
+from typing import Union, Optional, Literal, Hashable
+import warnings
 from dataclasses import dataclass
 import pandas as pd
 import numpy as np
+from modules.doublons import DetecteurDoublons
+from modules.imputeur import Imputeur
 
 @dataclass
 class Nettoyage:
     """Cette classe remplace les cellules vides pas des valeurs
     personnalisé en fonction de la stractégie et/ou du choix des
     colonnes contenant les cellules vides.
+
+    Args:
+        df (Union[pd.DataFrame, np.ndarray, str]): Le tableau de données à nettoyer.
+        version (Hashable | None): La version des données, pour réutiliser le hachage des lignes.
+        doublons (DetecteurDoublons | None): Le détecteur de lignes dupliquées partagé avec l'analyse.
+        imputeur (Imputeur | None): Un imputeur déjà appris dont les valeurs de remplissage
+        sont réutilisées au lieu d'être recalculées.
     """
 
     df: Union[pd.DataFrame, np.ndarray, str]
+    version: Optional[Hashable] = None
+    doublons: Optional[DetecteurDoublons] = None
+    imputeur: Optional[Imputeur] = None
 
     def gerer_les_valeurs_manquantes(
         self,
         column: Optional[list[str]] = None,
-        strategy: Literal["mean", "fill", "drop", "median"] = 'mean'
+        strategy: Literal["mean", "fill", "drop", "median"] = 'mean',
+        inplace: bool = False
         ) -> pd.DataFrame:
         """
         Gère les valeurs manquantes d'un tableau de données.
+        Les statistiques de toutes les colonnes sont calculées en un seul appel
+        sur le bloc sélectionné, puis appliquées par un seul `fillna`.
+        Avec un imputeur appris, ses valeurs sont appliquées sans rien recalculer
+        (la stratégie de l'imputeur remplace alors `strategy` et `column`).
 
         Args:
-            df       (pd.DataFrame) : Le tableau de données à traiter.
             strategy (Literal) : Valeurs de remplissage des cellules vide,
                 par défaut c'est `mean` (valeur possibles: `mean`, `drop`, `median` ou `fill`).
             column   (list[str], Optionel) : Les colonnes à remplir.
+            inplace  (bool) : Modifier le tableau directement, sans copie défensive.
 
         Returns:
-            pd.DataFrame: Un nouveau tableau sans des valeurs manquantes est retourné.
+            pd.DataFrame: Un tableau sans des valeurs manquantes est retourné
+            (le tableau d'origine si `inplace`).
         """
 
         if not isinstance(self.df, pd.DataFrame):
             print("Le nettoyage n'est possible qu'aux DataFrames.")
             return self.df
 
-        df_copy = self.df.copy() # On travaille sur une copie pour ne pas modifier l'original
-
         if strategy == 'drop':
-            df_copy.dropna(inplace=True)
+            df_resultat = self.df.dropna(inplace=inplace)
             print("\nLes lignes avec des valeurs manquantes ont été supprimées.\n")
-        else:
-            colonne_a_remplire = column if column else df_copy.select_dtypes(
-                include=np.number).columns.to_list()
-            if colonne_a_remplire:
-                try:
-                    for col in colonne_a_remplire:
-                        if strategy == 'mean':
-                            valeur_moyenne_de_la_colonne_numerique = df_copy[col].mean()
-                            df_copy[col].fillna(valeur_moyenne_de_la_colonne_numerique, inplace=True)
-                            continue
-                        elif strategy == 'median':
-                            valeur_median_de_la_colonne_numerique = df_copy[col].median()
-                            df_copy[col].fillna(valeur_median_de_la_colonne_numerique, inplace=True)
-                            continue
-                        elif strategy == 'fill':
-                            cellules_vide = 0
-                            df_copy[col].fillna(cellules_vide, inplace=True)
-                            continue
-                except ValueError as ve:
-                    raise ValueError(f"\nLa valeur de la stragie non supporté: {ve}\n") from ve
+            return self.df if inplace else df_resultat
+
+        if self.imputeur is not None:
+            return self.imputeur.transform(self.df, inplace=inplace)
+
+        colonne_a_remplire = column if column else self.df.select_dtypes(
+            include=np.number).columns.to_list()
+        if not colonne_a_remplire:
+            print("\nAucune colonne numérique trouvée pour le changement.\n")
+            return self.df if inplace else self.df.copy()
+
+        try:
+            bloc = self.df[colonne_a_remplire]
+            if strategy == 'mean':
+                valeurs = bloc.mean().to_dict()
+            elif strategy == 'median':
+                valeurs = self._medianes(bloc)
+            elif strategy == 'fill':
+                valeurs = dict.fromkeys(colonne_a_remplire, 0)
             else:
-                print("\nAucune colonne numérique trouvée pour le changement.\n")
-        return df_copy
+                valeurs = {}
+        except ValueError as ve:
+            raise ValueError(f"\nLa valeur de la stragie non supporté: {ve}\n") from ve
+
+        df = self.df if inplace else self.df.copy(deep=False)
+        self._ajouter_categories(df, valeurs)
+
+        if inplace:
+            df.fillna(valeurs, inplace=True)
+            return df
+        return df.fillna(valeurs)
+
+    @staticmethod
+    def _ajouter_categories(df: pd.DataFrame, valeurs: dict) -> None:
+        """
+        Ajoute les valeurs de remplissage aux catégories des colonnes `category`
+        (par exemple après compaction), qui n'acceptent pas de nouvelle valeur.
+
+        Args:
+            df (pd.DataFrame) : Le tableau à remplir (modifié directement).
+            valeurs (dict) : La valeur de remplissage de chaque colonne.
+        """
 
-    def gerer_les_valeurs_duplicates(self) -> pd.DataFrame:
+        for nom, valeur in valeurs.items():
+            serie = df[nom]
+            if (isinstance(serie.dtype, pd.CategoricalDtype)
+                    and not pd.isna(valeur)
+                    and valeur not in serie.cat.categories):
+                df[nom] = serie.cat.add_categories([valeur])
+
+    @staticmethod
+    def _medianes(bloc: pd.DataFrame) -> dict:
+        """
+        Calcule la médiane de chaque colonne d'un bloc en un seul appel.
+        Un bloc entièrement décimal passe par `np.nanmedian`, bien plus rapide
+        que `DataFrame.median` sur des tableaux larges.
+
+        Args:
+            bloc (pd.DataFrame) : Les colonnes dont on veut la médiane.
+
+        Returns:
+            dict: La médiane de chaque colonne.
+        """
+
+        if not all(dtype.kind == "f" for dtype in bloc.dtypes):
+            return bloc.median().to_dict()
+
+        with warnings.catch_warnings():
+            # Une colonne entièrement vide a une médiane NaN, comme avec pandas.
+            warnings.simplefilter("ignore", RuntimeWarning)
+            medianes = np.nanmedian(bloc.to_numpy(dtype=np.float64), axis=0)
+        return dict(zip(bloc.columns, medianes.tolist()))
+
+    def gerer_les_valeurs_duplicates(self, inplace: bool = False) -> pd.DataFrame:
         """
         Supprime les lignes dupliquées d'un tableau s'il y a.
-        
+        Les lignes sont comparées par leur hachage 64 bits, calculé une seule
+        fois par version des données.
+
         Args:
-            df (pd.DataFrame) : Prend le tableau des données.
+            inplace (bool) : Modifier le tableau directement au lieu d'en retourner un nouveau.
 
         Return:
-            pd.DataFrame: Renvoi un nouveau tableau sans des lignes dupliquées s'il y avait.
+            pd.DataFrame: Renvoi un tableau sans des lignes dupliquées s'il y avait.
         """
 
         if not isinstance(self.df, pd.DataFrame):
             print("\nL'opération n'est applicable qu'aux DataFrames.\n")
             return self.df
 
+        if self.doublons is None:
+            self.doublons = DetecteurDoublons()
+
         initial_rows = len(self.df)
-        df_copy = self.df.drop_duplicates().copy()
-        dropped_rows = initial_rows - len(df_copy)
+        df_sans_doublons = self.doublons.supprimer(self.df, self.version, inplace=inplace)
+        dropped_rows = initial_rows - len(df_sans_doublons)
         print(f"\n{dropped_rows} ligne(s) dupliquées ont été supprimées.\n")
-        return df_copy
+        return df_sans_doublons
@@ -0,0 +1,132 @@
+"""Ce module permet de ne renvoyer au frontend que la fenêtre visible
+d'un tableau de données (lignes, colonnes et ordre de tri), afin que la
+conversion en JSON ne porte jamais sur tout le tableau.
+
+Classes:
+
+    PaginationSlot:
+        Paramètres de requête de la pagination (`offset`, `limit`, `columns`,
+        `sort_by` et `ascending`).
+
+    Pagination:
+        Découpage d'un tableau de données selon les paramètres de pagination.
+
+        Methodes:
+            decouper(self, df: pd.DataFrame) -> pd.DataFrame
+"""
+
+from dataclasses import dataclass
+from typing import (
+    Optional,
+    Annotated,
+    )
+import numpy as np
+import pandas as pd
+from pydantic import (
+    Field,
+    BaseModel,
+    )
+
+class PaginationSlot(BaseModel):
+    """Cette classe reçoit les paramètres de pagination d'une lecture de données.
+
+    Args:
+        BaseModel (Model): Cette classe assure la validation et la sérialisation de la classe.
+        offset (int): L'indice de la première ligne à renvoyer.
+        limit (int | None): Le nombre maximal de lignes à renvoyer (toutes par défaut).
+        columns (list[str] | None): Les colonnes à renvoyer (toutes par défaut).
+        sort_by (str | None): La colonne servant au tri des lignes.
+        ascending (bool): Le sens du tri (croissant par défaut).
+    """
+
+    offset: Annotated[
+        int,
+        Field(
+            default=0,
+            ge=0,
+            title="offset",
+            description="Indice de la première ligne à renvoyer.")]
+
+    limit: Annotated[
+        Optional[int],
+        Field(
+            default=None,
+            ge=0,
+            title="limit",
+            description="Nombre maximal de lignes à renvoyer (toutes par défaut).")]
+
+    columns: Annotated[
+        Optional[list[str]],
+        Field(
+            default=None,
+            title="columns",
+            description="Colonnes à renvoyer (toutes par défaut).",
+            examples=[["age", "bmi"]])]
+
+    sort_by: Annotated[
+        Optional[str],
+        Field(
+            default=None,
+            title="sort_by",
+            description="Colonne servant au tri des lignes avant le découpage.")]
+
+    ascending: Annotated[
+        bool,
+        Field(
+            default=True,
+            title="ascending",
+            description="Sens du tri (croissant par défaut).")]
+
+@dataclass
+class Pagination:
+    """Cette classe découpe un tableau de données selon les paramètres de pagination.
+
+    Args:
+        parametres (PaginationSlot): Les paramètres de pagination reçus par le endpoint.
+    """
+
+    parametres: PaginationSlot
+
+    def colonnes_inconnues(self, df: pd.DataFrame) -> list[str]:
+        """Retourne les colonnes demandées (projection ou tri) absentes du tableau.
+
+        Args:
+            df (pd.DataFrame): Le tableau de données à découper.
+
+        Returns:
+            list[str]: La liste des colonnes introuvables.
+        """
+
+        demandees = list(self.parametres.columns or [])
+        if self.parametres.sort_by is not None:
+            demandees.append(self.parametres.sort_by)
+        return [col for col in demandees if col not in df.columns]
+
+    def decouper(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Découpe le tableau de données avant toute conversion :
+        seul l'index de la colonne de tri est trié, puis les lignes
+        de la fenêtre sont extraites avec les colonnes demandées.
+
+        Args:
+            df (pd.DataFrame): Le tableau de données à découper.
+
+        Returns:
+            pd.DataFrame: La fenêtre visible du tableau.
+        """
+
+        debut = self.parametres.offset
+        fin = None if self.parametres.limit is None else debut + self.parametres.limit
+
+        if self.parametres.sort_by is not None:
+            # Trier uniquement la colonne de tri pour obtenir les positions des lignes.
+            positions = np.asarray(
+                df[self.parametres.sort_by]
+                .reset_index(drop=True)
+                .sort_values(ascending=self.parametres.ascending, kind="stable")
+                .index)[debut:fin]
+        else:
+            positions = slice(debut, fin)
+
+        if self.parametres.columns:
+            return df.iloc[positions, df.columns.get_indexer(self.parametres.columns)]
+        return df.iloc[positions]
@@ -0,0 +1,409 @@
+"""Ce module conserve en mémoire plusieurs jeux de données, chacun désigné
+par un identifiant, à la place d'un unique tableau global par processus.
+
+La mémoire totale des tableaux est bornée : au-delà de `budget_octets`, les
+jeux les moins récemment utilisés sont déchargés, écrits au format Parquet
+s'il y a un dossier de débordement, puis rechargés à la demande.
+
+Avec un stockage partagé (`StockagePartage`), les tableaux sont écrits une
+seule fois en fichiers Arrow projetés en mémoire, et tous les workers qui
+utilisent le même dossier voient les mêmes jeux de données.
+
+Classes:
+
+    JeuDeDonnees:
+        Un tableau chargé et les informations qui lui sont associées.
+
+    RegistreDonnees:
+        Registre des jeux de données en mémoire, avec éviction LRU.
+
+        Methodes:
+            ajouter(
+                self,
+                identifiant: str,
+                df: pd.DataFrame,
+                file_path: Optional[Path] = None
+                ) -> JeuDeDonnees
+            obtenir(self, identifiant: str, charger: bool = True) -> JeuDeDonnees | None
+            fichier(self, jeu: JeuDeDonnees) -> Path | None
+            definir_dossier(self, identifiant: str, folder_path: Path) -> None
+            supprimer(self, identifiant: str) -> bool
+            statistiques(self) -> dict
+
+Fonctions:
+
+    nouvel_identifiant() -> str
+        Crée l'identifiant d'un jeu de données chargé sans identifiant.
+"""
+
+from collections import OrderedDict
+from dataclasses import (
+    dataclass,
+    field,
+    )
+from pathlib import Path
+from typing import Optional
+import itertools
+import os
+import threading
+import uuid
+import pandas as pd
+from modules.stockage_partage import StockagePartage
+
+
+# Les versions sont uniques pour tout le processus, quel que soit le jeu de données,
+# afin de pouvoir servir de clé aux caches partagés (résumés, hachages, ...).
+_versions = itertools.count(1)
+
+@dataclass
+class JeuDeDonnees:
+    """Un tableau chargé et les informations qui lui sont associées.
+
+    Args:
+        identifiant (str): L'identifiant du jeu de données.
+        df (pd.DataFrame | None): Le tableau, ou `None` s'il est déchargé sur le disque.
+        file_path (Path | None): Le chemin du fichier source.
+        folder_path (Path | None): Le dossier des vues graphiques du jeu de données.
+        version (int): La version du tableau, changée à chaque nouveau chargement.
+        octets (int): La mémoire occupée par le tableau.
+        chemin_debordement (Path | None): Le fichier Parquet où le tableau a été déchargé.
+        partage (bool): Le tableau est projeté depuis le stockage partagé.
+    """
+
+    identifiant: str
+    df: Optional[pd.DataFrame]
+    file_path: Optional[Path] = None
+    folder_path: Optional[Path] = None
+    version: int = field(default_factory=lambda: next(_versions))
+    octets: int = 0
+    chemin_debordement: Optional[Path] = None
+    partage: bool = False
+
+@dataclass
+class RegistreDonnees:
+    """Registre des jeux de données en mémoire, avec un budget mémoire global.
+
+    Args:
+        budget_octets (int): La mémoire maximale de tous les tableaux chargés (2 Gio par défaut).
+        dossier_debordement (str | None): Le dossier où décharger les tableaux évincés
+        au format Parquet ; sans dossier, un jeu évincé est supprimé du registre.
+        stockage (StockagePartage | None): Le stockage partagé entre les workers ; un jeu
+        partagé évincé est simplement détaché, puis projeté à nouveau à la demande.
+    """
+
+    budget_octets: int = 2 * 1024 ** 3
+    dossier_debordement: Optional[str] = None
+    stockage: Optional[StockagePartage] = None
+    jeux: OrderedDict = field(default_factory=OrderedDict, init=False, repr=False)
+    _verrou: threading.RLock = field(default_factory=threading.RLock, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        """Crée le dossier de débordement s'il est donné.
+        """
+        if self.dossier_debordement is not None:
+            os.makedirs(self.dossier_debordement, exist_ok=True)
+
+    def ajouter(
+        self,
+        identifiant: str,
+        df: pd.DataFrame,
+        file_path: Optional[Path] = None
+        ) -> JeuDeDonnees:
+        """Ajoute ou remplace un jeu de données, avec une nouvelle version.
+
+        Args:
+            identifiant (str): L'identifiant du jeu de données.
+            df (pd.DataFrame): Le tableau chargé.
+            file_path (Path | None): Le chemin du fichier source.
+
+        Returns:
+            JeuDeDonnees: Le jeu de données enregistré.
+        """
+
+        jeu = JeuDeDonnees(
+            identifiant=identifiant,
+            df=df,
+            file_path=file_path,
+            octets=int(df.memory_usage(deep=True).sum()))
+
+        if self.stockage is not None:
+            # L'écriture du fichier Arrow est longue : elle se fait hors du verrou pour
+            # ne pas bloquer `obtenir`, puis l'entrée est remplacée sous le verrou.
+            with self._verrou:
+                ancien = self.jeux.get(identifiant)
+                jeu.folder_path = ancien.folder_path if ancien is not None else None
+            precedent = self.stockage.infos(identifiant)
+            if jeu.folder_path is None and precedent and precedent.get('folder_path'):
+                jeu.folder_path = Path(precedent['folder_path'])
+            self.stockage.publier(identifiant, df, infos={
+                'file_path': str(file_path) if file_path else None,
+                'folder_path': str(jeu.folder_path) if jeu.folder_path else None})
+
+        with self._verrou:
+            ancien = self.jeux.pop(identifiant, None)
+            if ancien is not None:
+                # Le dossier des vues graphiques est conservé d'un chargement à l'autre.
+                jeu.folder_path = jeu.folder_path or ancien.folder_path
+                self._oublier(ancien)
+
+            if self.stockage is not None:
+                # Remplacer la copie privée par la projection partagée.
+                self._projeter(jeu)
+
+            self.jeux[identifiant] = jeu
+            self._evincer(garder=identifiant)
+        return jeu
+
+    def _projeter(self, jeu: JeuDeDonnees) -> bool:
+        """Attache un jeu de données à la version courante du stockage partagé.
+
+        Args:
+            jeu (JeuDeDonnees): Le jeu de données à mettre à jour.
+
+        Returns:
+            bool: `False` si le jeu de données n'existe plus dans le stockage partagé.
+        """
+
+        attache = self.stockage.attacher(jeu.identifiant)
+        if attache is None:
+            return False
+
+        df, contenu = attache
+        _appliquer_infos(jeu, contenu)
+        jeu.df = df
+        jeu.octets = int(df.memory_usage(deep=True).sum())
+        return True
+
+    def obtenir(self, identifiant: str, charger: bool = True) -> Optional[JeuDeDonnees]:
+        """Retourne un jeu de données, en rechargeant son tableau s'il a été déchargé.
+
+        Args:
+            identifiant (str): L'identifiant du jeu de données.
+            charger (bool): Recharger le tableau déchargé ; `False` pour ne lire
+            que les informations du jeu (chemins, version).
+
+        Returns:
+            JeuDeDonnees | None: Le jeu de données, ou `None` s'il est inconnu.
+        """
+
+        with self._verrou:
+            if self.stockage is not None:
+                return self._obtenir_partage(identifiant, charger)
+
+            jeu = self.jeux.get(identifiant)
+            if jeu is None:
+                return None
+            self.jeux.move_to_end(identifiant)
+
+            if charger and jeu.df is None and jeu.chemin_debordement is not None:
+                jeu.df = pd.read_parquet(jeu.chemin_debordement)
+                self._effacer_debordement(jeu)
+                self._evincer(garder=identifiant)
+            return jeu
+
+    def _obtenir_partage(self, identifiant: str, charger: bool) -> Optional[JeuDeDonnees]:
+        """Retourne un jeu de données du stockage partagé, en se rattachant à sa
+        version courante si un autre worker l'a remplacé, modifié ou supprimé.
+
+        Args:
+            identifiant (str): L'identifiant du jeu de données.
+            charger (bool): Projeter le tableau s'il ne l'est pas encore.
+
+        Returns:
+            JeuDeDonnees | None: Le jeu de données, ou `None` s'il est inconnu.
+        """
+
+        contenu = self.stockage.infos(identifiant)
+        jeu = self.jeux.get(identifiant)
+
+        if contenu is None:
+            if jeu is not None:
+                self._oublier(self.jeux.pop(identifiant))
+            return None
+
+        if jeu is None:
+            jeu = JeuDeDonnees(identifiant=identifiant, df=None, partage=True)
+            self.jeux[identifiant] = jeu
+        elif jeu.version != contenu['version']:
+            self._oublier(jeu)
+            jeu.df = None
+        self.jeux.move_to_end(identifiant)
+
+        if jeu.df is None and charger:
+            if not self._projeter(jeu):
+                del self.jeux[identifiant]
+                return None
+            self._evincer(garder=identifiant)
+        elif jeu.df is None:
+            _appliquer_infos(jeu, contenu)
+        else:
+            # Le dossier des vues graphiques a pu être changé par un autre worker.
+            jeu.folder_path = Path(contenu['folder_path']) if contenu.get('folder_path') else None
+        return jeu
+
+    def fichier(self, jeu: JeuDeDonnees) -> Optional[Path]:
+        """Retourne le fichier du registre qui contient la version enregistrée d'un jeu
+        de données (après nettoyage et compaction), pour le relire par morceaux.
+
+        Args:
+            jeu (JeuDeDonnees): Le jeu de données.
+
+        Returns:
+            Path | None: Le fichier Arrow du stockage partagé ou le fichier Parquet de
+            débordement, ou `None` si le tableau n'existe qu'en mémoire.
+        """
+
+        if jeu.partage and self.stockage is not None:
+            chemin = self.stockage.fichier(jeu.identifiant, jeu.version)
+        else:
+            chemin = jeu.chemin_debordement
+        return chemin if chemin is not None and chemin.is_file() else None
+
+    def definir_dossier(self, identifiant: str, folder_path: Path) -> None:
+        """Enregistre le dossier des vues graphiques d'un jeu de données
+        (pour tous les workers avec un stockage partagé).
+
+        Args:
+            identifiant (str): L'identifiant du jeu de données.
+            folder_path (Path): Le dossier des vues graphiques.
+        """
+
+        with self._verrou:
+            jeu = self.jeux.get(identifiant)
+            if jeu is not None:
+                jeu.folder_path = folder_path
+            if self.stockage is not None:
+                self.stockage.mettre_a_jour(identifiant, folder_path=str(folder_path))
+
+    def supprimer(self, identifiant: str) -> bool:
+        """Supprime un jeu de données du registre (et son fichier de débordement).
+
+        Args:
+            identifiant (str): L'identifiant du jeu de données.
+
+        Returns:
+            bool: `True` si le jeu de données existait.
+        """
+
+        with self._verrou:
+            jeu = self.jeux.pop(identifiant, None)
+            if jeu is not None:
+                self._oublier(jeu)
+            if self.stockage is not None:
+                return self.stockage.supprimer(identifiant) or jeu is not None
+            return jeu is not None
+
+    def _oublier(self, jeu: JeuDeDonnees) -> None:
+        """Libère les ressources d'un jeu de données retiré ou remplacé :
+        son fichier de débordement, ou sa référence dans le stockage partagé.
+
+        Args:
+            jeu (JeuDeDonnees): Le jeu de données.
+        """
+        self._effacer_debordement(jeu)
+        if jeu.partage and self.stockage is not None:
+            self.stockage.detacher(jeu.identifiant, jeu.version)
+
+    def _octets_en_memoire(self) -> int:
+        """Retourne la mémoire occupée par les tableaux chargés.
+        """
+        return sum(jeu.octets for jeu in self.jeux.values() if jeu.df is not None)
+
+    def _evincer(self, garder: str) -> None:
+        """Décharge les jeux les moins récemment utilisés tant que le budget est dépassé.
+        Le jeu `garder`, qui vient d'être utilisé, n'est jamais évincé.
+
+        Args:
+            garder (str): L'identifiant du jeu de données à conserver en mémoire.
+        """
+
+        total = self._octets_en_memoire()
+        for identifiant in list(self.jeux):
+            if total <= self.budget_octets:
+                break
+            jeu = self.jeux[identifiant]
+            if identifiant == garder or jeu.df is None:
+                continue
+            total -= jeu.octets
+            if jeu.partage:
+                # Le tableau est déjà sur le disque partagé : il suffit de s'en détacher.
+                self._oublier(jeu)
+                jeu.df = None
+            elif not self._deborder(jeu):
+                del self.jeux[identifiant]
+                print(f"\n[INFO] Le jeu de données '{identifiant}' a été évincé de la mémoire.\n")
+
+    def _deborder(self, jeu: JeuDeDonnees) -> bool:
+        """Écrit le tableau d'un jeu de données au format Parquet puis le libère.
+
+        Args:
+            jeu (JeuDeDonnees): Le jeu de données à décharger.
+
+        Returns:
+            bool: `True` si le tableau a été déchargé sur le disque.
+        """
+
+        if self.dossier_debordement is None:
+            return False
+
+        # Le processus et la version évitent tout caractère spécial dans le nom
+        # et toute collision entre plusieurs workers partageant le dossier.
+        chemin = Path(self.dossier_debordement) / f"{os.getpid()}-{jeu.version}.parquet"
+        try:
+            jeu.df.to_parquet(chemin, index=True)
+        except (ImportError, ValueError, TypeError, NotImplementedError) as e:
+            # Colonnes non représentables en Parquet : le jeu est supprimé.
+            print(f"\n[INFO] Le jeu de données '{jeu.identifiant}' n'a pas pu être déchargé : {e}\n")
+            chemin.unlink(missing_ok=True)
+            return False
+
+        jeu.chemin_debordement = chemin
+        jeu.df = None
+        return True
+
+    @staticmethod
+    def _effacer_debordement(jeu: JeuDeDonnees) -> None:
+        """Supprime le fichier de débordement d'un jeu de données s'il existe.
+
+        Args:
+            jeu (JeuDeDonnees): Le jeu de données.
+        """
+        if jeu.chemin_debordement is not None:
+            jeu.chemin_debordement.unlink(missing_ok=True)
+            jeu.chemin_debordement = None
+
+    def statistiques(self) -> dict:
+        """Retourne l'état du registre pour permettre son dimensionnement.
+
+        Returns:
+            dict: Les jeux de données en mémoire et déchargés, et la mémoire occupée.
+        """
+
+        with self._verrou:
+            return {
+                'en_memoire': [i for i, jeu in self.jeux.items() if jeu.df is not None],
+                'decharges': [i for i, jeu in self.jeux.items() if jeu.df is None],
+                'octets': self._octets_en_memoire(),
+                'budget_octets': self.budget_octets,
+            }
+
+def _appliquer_infos(jeu: JeuDeDonnees, contenu: dict) -> None:
+    """Copie les informations du stockage partagé dans un jeu de données.
+
+    Args:
+        jeu (JeuDeDonnees): Le jeu de données à mettre à jour.
+        contenu (dict): Les informations de la version courante.
+    """
+    jeu.version = contenu['version']
+    jeu.file_path = Path(contenu['file_path']) if contenu.get('file_path') else None
+    jeu.folder_path = Path(contenu['folder_path']) if contenu.get('folder_path') else None
+    jeu.partage = True
+
+def nouvel_identifiant() -> str:
+    """Crée l'identifiant d'un jeu de données chargé sans identifiant, unique
+    pour que deux clients ne remplacent pas le jeu de données l'un de l'autre.
+
+    Returns:
+        str: Un identifiant aléatoire (32 caractères hexadécimaux).
+    """
+    return uuid.uuid4().hex
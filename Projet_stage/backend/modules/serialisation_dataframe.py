@@ -0,0 +1,195 @@
+"""Ce module sérialise un tableau de données par lots de lignes directement
+depuis les tableaux de ses colonnes, afin que le premier octet d'une réponse
+soit envoyé sans attendre la construction du document JSON complet.
+
+Classes:
+
+    SerialisationDataFrame:
+        Sérialisation d'un DataFrame en NDJSON (une ligne JSON par enregistrement)
+        ou en flux binaire Apache Arrow IPC.
+
+        Methodes:
+            vers_enregistrements(self, df: pd.DataFrame) -> list[dict]
+            vers_json(self, df: pd.DataFrame) -> bytes
+            iterer_ndjson(self, df: pd.DataFrame) -> Iterator[bytes]
+            vers_arrow_ipc(self, df: pd.DataFrame, metadonnees: dict | None) -> bytes
+"""
+
+from dataclasses import dataclass
+import datetime
+from typing import (
+    Iterator,
+    Optional,
+    )
+import json
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+except ImportError: # pyarrow est optionnel, le format Arrow est alors indisponible.
+    pa = None
+
+try:
+    import orjson
+except ImportError: # orjson est optionnel, le module json standard est alors utilisé.
+    orjson = None
+
+# Type MIME d'une réponse NDJSON.
+MEDIA_TYPE_NDJSON = "application/x-ndjson"
+# Type MIME d'une réponse au format Apache Arrow IPC (stream).
+MEDIA_TYPE_ARROW = "application/vnd.apache.arrow.stream"
+
+def _convertir(objet: object) -> object:
+    """Convertit une valeur que JSON ne représente pas, comme le faisait `jsonable_encoder` :
+    les dates au format ISO 8601, les durées en secondes, le reste en texte.
+
+    Args:
+        objet (object): La valeur à convertir.
+
+    Returns:
+        object: La valeur sérialisable en JSON.
+    """
+    if isinstance(objet, (datetime.date, datetime.time)):
+        return objet.isoformat()
+    if isinstance(objet, datetime.timedelta):
+        return objet.total_seconds()
+    return str(objet)
+
+def _dumps(objet: object) -> bytes:
+    """Encode un objet python en JSON avec orjson s'il est installé.
+    Les types inconnus (dates avec fuseau horaire, décimaux, etc.) passent par `_convertir`.
+
+    Args:
+        objet (object): L'objet à encoder.
+
+    Returns:
+        bytes: Le document JSON encodé en UTF-8.
+    """
+    if orjson is not None:
+        return orjson.dumps(objet, default=_convertir)
+    return json.dumps(objet, ensure_ascii=False, default=_convertir).encode("utf-8")
+
+@dataclass
+class SerialisationDataFrame:
+    """Cette classe sérialise un tableau de données par lots de lignes.
+
+    Args:
+        taille_lot (int): Le nombre de lignes sérialisées à la fois (10 000 par défaut).
+    """
+
+    taille_lot: int = 10_000
+
+    def _colonne_en_liste(self, valeurs: np.ndarray) -> list:
+        """Convertit un lot de valeurs d'une colonne en liste python,
+        les valeurs manquantes ou infinies devenant `None`. Les dates deviennent
+        des textes ISO 8601 et les durées des secondes, comme avec `jsonable_encoder`.
+
+        Args:
+            valeurs (np.ndarray): Les valeurs d'une colonne pour un lot de lignes.
+
+        Returns:
+            list: Les valeurs sérialisables en JSON.
+        """
+
+        # `tolist` donnerait des entiers (nanosecondes) pour les dates et les durées.
+        if valeurs.dtype.kind == "M":
+            return [None if pd.isna(date) else date.isoformat() for date in pd.DatetimeIndex(valeurs)]
+        if valeurs.dtype.kind == "m":
+            valeurs = valeurs / np.timedelta64(1, "s")
+
+        liste = valeurs.tolist()
+
+        # Les entiers et les booléens ne peuvent pas contenir de valeurs manquantes.
+        if valeurs.dtype.kind in "iub":
+            return liste
+
+        if valeurs.dtype.kind == "f":
+            masque = ~np.isfinite(valeurs)
+        else:
+            masque = pd.isna(valeurs)
+
+        for i in np.flatnonzero(masque):
+            liste[i] = None
+        return liste
+
+    def vers_enregistrements(self, df: pd.DataFrame) -> list[dict]:
+        """Convertit le tableau en liste d'enregistrements (`orient="records"`)
+        colonne par colonne, les valeurs manquantes ou infinies devenant `None`.
+
+        Args:
+            df (pd.DataFrame): Le tableau de données à convertir.
+
+        Returns:
+            list[dict]: Un dictionnaire par ligne du tableau.
+        """
+
+        noms = [str(col) for col in df.columns]
+        colonnes = [self._colonne_en_liste(np.asarray(df.iloc[:, i])) for i in range(df.shape[1])]
+        return [dict(zip(noms, ligne)) for ligne in zip(*colonnes)]
+
+    def vers_json(self, df: pd.DataFrame) -> bytes:
+        """Encode le tableau en document JSON (`orient="records"`) sans passer
+        par `jsonable_encoder` : les colonnes sont converties une à une,
+        puis le document est encodé en une fois par orjson.
+
+        Args:
+            df (pd.DataFrame): Le tableau de données à encoder.
+
+        Returns:
+            bytes: Le document JSON, les valeurs NaN et infinies valant `null`.
+        """
+        return _dumps(self.vers_enregistrements(df))
+
+    def iterer_ndjson(self, df: pd.DataFrame) -> Iterator[bytes]:
+        """Sérialise le tableau en NDJSON, lot par lot, depuis les tableaux des colonnes.
+        Seules les lignes du lot en cours sont converties : la mémoire utilisée reste
+        bornée par la taille d'un lot, même pour les colonnes d'objets.
+
+        Args:
+            df (pd.DataFrame): Le tableau de données à sérialiser.
+
+        Yields:
+            Iterator[bytes]: Un bloc de lignes NDJSON par lot.
+        """
+
+        noms = [str(col) for col in df.columns]
+
+        for debut in range(0, len(df), self.taille_lot):
+            tranche = df.iloc[debut: debut + self.taille_lot]
+            lot = [
+                self._colonne_en_liste(np.asarray(tranche.iloc[:, i]))
+                for i in range(tranche.shape[1])]
+            yield b"".join(_dumps(dict(zip(noms, ligne))) + b"\n" for ligne in zip(*lot))
+
+    def vers_arrow_ipc(self, df: pd.DataFrame, metadonnees: Optional[dict] = None) -> bytes:
+        """Sérialise le tableau en flux binaire Apache Arrow IPC, sans passer
+        par une représentation python des cellules.
+
+        Args:
+            df (pd.DataFrame): Le tableau de données à sérialiser.
+            metadonnees (dict | None): Des informations ajoutées au schéma du flux
+            (encodées en JSON).
+
+        Raises:
+            ImportError: Une erreur est levée si pyarrow n'est pas installé.
+            ValueError: Une erreur est levée si une colonne n'est pas représentable en Arrow.
+
+        Returns:
+            bytes: Le flux Arrow IPC.
+        """
+
+        if pa is None:
+            raise ImportError("Le format Arrow nécessite la bibliothèque pyarrow.")
+
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        if metadonnees:
+            table = table.replace_schema_metadata({
+                **(table.schema.metadata or {}),
+                b"visualdata": json.dumps(metadonnees, default=str).encode("utf-8")})
+
+        sortie = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sortie, table.schema) as ecrivain:
+            ecrivain.write_table(table, max_chunksize=self.taille_lot)
+
+        return sortie.getvalue().to_pybytes()
@@ -0,0 +1,363 @@
+"""Ce module calcule les statistiques descriptives d'un jeu de données
+morceau par morceau, sans jamais le charger entièrement en mémoire.
+
+Chaque colonne est résumée par des accumulateurs fusionnables : nombre de
+valeurs, valeurs manquantes, moyenne et variance (Welford / Chan), minimum,
+maximum, quantiles approchés (esquisse de type KLL) et nombre de valeurs
+distinctes (HyperLogLog). Les morceaux peuvent donc être traités en parallèle
+puis fusionnés.
+
+Classes:
+
+    SketchQuantiles:
+        Esquisse fusionnable des quantiles d'une colonne numérique.
+
+    AccumulateurColonne:
+        Accumulateurs fusionnables d'une colonne.
+
+    StatistiquesFlux:
+        Statistiques descriptives d'un flux de morceaux de données.
+
+        Methodes:
+            consommer(self, morceau: pd.DataFrame) -> None
+            consommer_tout(self, morceaux: Iterable[pd.DataFrame]) -> StatistiquesFlux
+            fusionner(self, autre: StatistiquesFlux) -> None
+            resume(self) -> pd.DataFrame
+
+Fonctions:
+
+    statistiques_parquet(chemin: str, processus: int = 1) -> StatistiquesFlux
+        Calcule les statistiques d'un fichier Parquet groupe de lignes par groupe de lignes.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from dataclasses import (
+    dataclass,
+    field,
+    )
+from typing import (
+    Iterable,
+    Optional,
+    )
+import os
+import numpy as np
+import pandas as pd
+from modules.hyperloglog import HyperLogLog
+
+@dataclass
+class SketchQuantiles:
+    """Esquisse fusionnable des quantiles d'une colonne numérique (type KLL).
+    Le niveau `h` contient des valeurs de poids `2 ** h` ; un niveau plein est
+    trié puis une valeur sur deux est promue au niveau suivant.
+
+    Args:
+        k (int): La capacité de chaque niveau (plus elle est grande, plus l'esquisse est précise).
+        niveaux (list[np.ndarray]): Les valeurs conservées à chaque niveau.
+    """
+
+    k: int = 256
+    niveaux: list[np.ndarray] = field(default_factory=list, repr=False)
+    _aleatoire: np.random.Generator = field(
+        default_factory=lambda: np.random.default_rng(0), repr=False)
+
+    def ajouter(self, valeurs: np.ndarray) -> None:
+        """Ajoute des valeurs finies à l'esquisse.
+
+        Args:
+            valeurs (np.ndarray): Les valeurs à ajouter.
+        """
+
+        if len(valeurs) == 0:
+            return None
+        if not self.niveaux:
+            self.niveaux.append(np.empty(0, dtype=np.float64))
+        self.niveaux[0] = np.concatenate([self.niveaux[0], np.asarray(valeurs, dtype=np.float64)])
+        self._compacter()
+        return None
+
+    def _compacter(self) -> None:
+        """Compacte les niveaux dépassant la capacité `k`.
+        """
+
+        h = 0
+        while h < len(self.niveaux):
+            niveau = self.niveaux[h]
+            if len(niveau) > self.k:
+                niveau = np.sort(niveau)
+                # Conserver un élément si le nombre de valeurs est impair.
+                reste = niveau[:1] if len(niveau) % 2 else niveau[:0]
+                paires = niveau[len(reste):]
+                promues = paires[int(self._aleatoire.integers(2))::2]
+                self.niveaux[h] = reste
+                if h + 1 == len(self.niveaux):
+                    self.niveaux.append(np.empty(0, dtype=np.float64))
+                self.niveaux[h + 1] = np.concatenate([self.niveaux[h + 1], promues])
+            h += 1
+
+    def fusionner(self, autre: "SketchQuantiles") -> None:
+        """Fusionne une autre esquisse dans celle-ci.
+
+        Args:
+            autre (SketchQuantiles): L'esquisse à fusionner.
+        """
+
+        for h, niveau in enumerate(autre.niveaux):
+            if h == len(self.niveaux):
+                self.niveaux.append(np.empty(0, dtype=np.float64))
+            self.niveaux[h] = np.concatenate([self.niveaux[h], niveau])
+        self._compacter()
+
+    def quantiles(self, q: Iterable[float]) -> np.ndarray:
+        """Retourne les quantiles approchés des valeurs ajoutées.
+
+        Args:
+            q (Iterable[float]): Les ordres des quantiles, entre 0 et 1.
+
+        Returns:
+            np.ndarray: Les quantiles (NaN si l'esquisse est vide).
+        """
+
+        q = np.asarray(list(q), dtype=np.float64)
+        valeurs = np.concatenate(self.niveaux) if self.niveaux else np.empty(0)
+        if len(valeurs) == 0:
+            return np.full(len(q), np.nan)
+
+        poids = np.concatenate([
+            np.full(len(niveau), 2.0 ** h) for h, niveau in enumerate(self.niveaux)])
+        ordre = np.argsort(valeurs, kind="stable")
+        valeurs, poids = valeurs[ordre], poids[ordre]
+        cumul = np.cumsum(poids)
+
+        indices = np.searchsorted(cumul, q * cumul[-1], side="left")
+        return valeurs[np.minimum(indices, len(valeurs) - 1)]
+
+@dataclass
+class AccumulateurColonne:
+    """Accumulateurs fusionnables d'une colonne de données.
+
+    Args:
+        numerique (bool): La colonne est-elle numérique.
+        nombre (int): Le nombre de valeurs non manquantes.
+        nuls (int): Le nombre de valeurs manquantes.
+        moyenne (float): La moyenne des valeurs (colonnes numériques).
+        m2 (float): La somme des carrés des écarts à la moyenne (colonnes numériques).
+        minimum (float): La plus petite valeur (colonnes numériques).
+        maximum (float): La plus grande valeur (colonnes numériques).
+    """
+
+    numerique: bool
+    nombre: int = 0
+    nuls: int = 0
+    moyenne: float = 0.0
+    m2: float = 0.0
+    minimum: float = np.inf
+    maximum: float = -np.inf
+    quantiles: SketchQuantiles = field(default_factory=SketchQuantiles, repr=False)
+    distincts: HyperLogLog = field(default_factory=HyperLogLog, repr=False)
+
+    def ajouter(self, serie: pd.Series) -> None:
+        """Ajoute les valeurs d'un morceau de colonne.
+
+        Args:
+            serie (pd.Series): Les valeurs de la colonne dans un morceau.
+        """
+
+        if self.numerique and not pd.api.types.is_numeric_dtype(serie):
+            serie = pd.to_numeric(serie, errors="coerce")
+
+        valeurs = serie.dropna()
+        self.nuls += len(serie) - len(valeurs)
+        self.distincts.ajouter(valeurs)
+
+        if not self.numerique or valeurs.empty:
+            self.nombre += len(valeurs)
+            return None
+
+        x = valeurs.to_numpy(dtype=np.float64)
+        x = x[np.isfinite(x)]
+        if len(x) == 0:
+            return None
+        self._fusionner_moments(len(x), float(x.mean()), float(((x - x.mean()) ** 2).sum()))
+        self.minimum = min(self.minimum, float(x.min()))
+        self.maximum = max(self.maximum, float(x.max()))
+        self.quantiles.ajouter(x)
+        return None
+
+    def _fusionner_moments(self, nombre: int, moyenne: float, m2: float) -> None:
+        """Fusionne le nombre, la moyenne et `m2` d'un autre groupe de valeurs
+        (formule parallèle de Chan, généralisant celle de Welford).
+
+        Args:
+            nombre (int): Le nombre de valeurs de l'autre groupe.
+            moyenne (float): La moyenne de l'autre groupe.
+            m2 (float): La somme des carrés des écarts de l'autre groupe.
+        """
+
+        if nombre == 0:
+            return None
+        total = self.nombre + nombre
+        delta = moyenne - self.moyenne
+        self.moyenne += delta * nombre / total
+        self.m2 += m2 + delta * delta * self.nombre * nombre / total
+        self.nombre = total
+        return None
+
+    def fusionner(self, autre: "AccumulateurColonne") -> None:
+        """Fusionne les accumulateurs d'une autre partie de la même colonne.
+
+        Args:
+            autre (AccumulateurColonne): Les accumulateurs à fusionner.
+        """
+
+        self.nuls += autre.nuls
+        self.distincts.fusionner(autre.distincts)
+        if not self.numerique:
+            self.nombre += autre.nombre
+            return None
+        self._fusionner_moments(autre.nombre, autre.moyenne, autre.m2)
+        self.minimum = min(self.minimum, autre.minimum)
+        self.maximum = max(self.maximum, autre.maximum)
+        self.quantiles.fusionner(autre.quantiles)
+        return None
+
+    def resume(self) -> dict:
+        """Retourne le résumé de la colonne, dans l'esprit de `DataFrame.describe`.
+
+        Returns:
+            dict: Les statistiques de la colonne.
+        """
+
+        resume = {
+            'count': self.nombre,
+            'missing': self.nuls,
+            'unique': round(self.distincts.estimer()),
+        }
+        if self.numerique:
+            q25, q50, q75 = self.quantiles.quantiles([0.25, 0.5, 0.75])
+            resume.update({
+                'mean': self.moyenne if self.nombre else np.nan,
+                'std': np.sqrt(self.m2 / (self.nombre - 1)) if self.nombre > 1 else np.nan,
+                'min': self.minimum if self.nombre else np.nan,
+                '25%': q25,
+                '50%': q50,
+                '75%': q75,
+                'max': self.maximum if self.nombre else np.nan,
+            })
+        return resume
+
+@dataclass
+class StatistiquesFlux:
+    """Statistiques descriptives d'un jeu de données lu morceau par morceau.
+
+    Args:
+        lignes (int): Le nombre de lignes consommées.
+        colonnes (dict[str, AccumulateurColonne]): Les accumulateurs de chaque colonne.
+    """
+
+    lignes: int = 0
+    colonnes: dict[str, AccumulateurColonne] = field(default_factory=dict)
+
+    def consommer(self, morceau: pd.DataFrame) -> None:
+        """Ajoute un morceau de données aux statistiques.
+
+        Args:
+            morceau (pd.DataFrame): Le morceau de données.
+        """
+
+        self.lignes += len(morceau)
+        for col in morceau.columns:
+            serie = morceau[col]
+            if col not in self.colonnes:
+                self.colonnes[col] = AccumulateurColonne(
+                    numerique=pd.api.types.is_numeric_dtype(serie)
+                    and not pd.api.types.is_bool_dtype(serie))
+            self.colonnes[col].ajouter(serie)
+
+    def consommer_tout(self, morceaux: Iterable[pd.DataFrame]) -> "StatistiquesFlux":
+        """Ajoute tous les morceaux d'un flux aux statistiques.
+
+        Args:
+            morceaux (Iterable[pd.DataFrame]): Les morceaux de données
+            (par exemple `DataLoader.iterer_morceaux_csv`).
+
+        Returns:
+            StatistiquesFlux: Les statistiques elles-mêmes.
+        """
+
+        for morceau in morceaux:
+            self.consommer(morceau)
+        return self
+
+    def fusionner(self, autre: "StatistiquesFlux") -> None:
+        """Fusionne les statistiques d'une autre partie du même jeu de données.
+
+        Args:
+            autre (StatistiquesFlux): Les statistiques à fusionner.
+        """
+
+        self.lignes += autre.lignes
+        for col, accumulateur in autre.colonnes.items():
+            if col in self.colonnes:
+                self.colonnes[col].fusionner(accumulateur)
+            else:
+                self.colonnes[col] = accumulateur
+
+    def resume(self) -> pd.DataFrame:
+        """Retourne les statistiques descriptives, une ligne par colonne.
+
+        Returns:
+            pd.DataFrame: Les statistiques de chaque colonne.
+        """
+
+        return pd.DataFrame.from_dict(
+            {col: acc.resume() for col, acc in self.colonnes.items()},
+            orient="index")
+
+def _statistiques_groupe_parquet(chemin: str, groupes: list[int]) -> StatistiquesFlux:
+    """Calcule les statistiques de quelques groupes de lignes d'un fichier Parquet.
+
+    Args:
+        chemin (str): Le chemin du fichier Parquet.
+        groupes (list[int]): Les indices des groupes de lignes à lire.
+
+    Returns:
+        StatistiquesFlux: Les statistiques de ces groupes de lignes.
+    """
+
+    import pyarrow.parquet as pq
+
+    fichier = pq.ParquetFile(chemin)
+    statistiques = StatistiquesFlux()
+    for groupe in groupes:
+        statistiques.consommer(fichier.read_row_group(groupe).to_pandas())
+    return statistiques
+
+def statistiques_parquet(chemin: str, processus: Optional[int] = 1) -> StatistiquesFlux:
+    """Calcule les statistiques d'un fichier Parquet groupe de lignes par groupe de lignes,
+    éventuellement en parallèle dans plusieurs processus.
+
+    Args:
+        chemin (str): Le chemin du fichier Parquet.
+        processus (int | None): Le nombre de processus (1 par défaut, `None` pour tous les cœurs).
+
+    Returns:
+        StatistiquesFlux: Les statistiques du fichier complet.
+    """
+
+    import pyarrow.parquet as pq
+
+    nombre_groupes = pq.ParquetFile(chemin).num_row_groups
+    if processus == 1 or nombre_groupes <= 1:
+        return _statistiques_groupe_parquet(chemin, list(range(nombre_groupes)))
+
+    # Répartir les groupes de lignes entre les processus.
+    nombre = min(processus or os.cpu_count() or 1, nombre_groupes)
+    parts = [list(range(i, nombre_groupes, nombre)) for i in range(nombre)]
+
+    statistiques = StatistiquesFlux()
+    # `spawn` : un processus dupliqué par fork après du code numba ou OpenMP se bloque.
+    with ProcessPoolExecutor(max_workers=nombre, mp_context=get_context("spawn")) as executeur:
+        for resultat in executeur.map(_statistiques_groupe_parquet, [chemin] * nombre, parts):
+            statistiques.fusionner(resultat)
+    return statistiques
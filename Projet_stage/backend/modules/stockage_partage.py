@@ -0,0 +1,274 @@
+"""Ce module partage les jeux de données chargés entre plusieurs processus
+(workers uvicorn/gunicorn) grâce à des fichiers Arrow IPC projetés en mémoire.
+
+Un tableau est écrit une seule fois sur le disque ; chaque worker s'y attache
+par son identifiant sans le recopier : les pages du fichier sont partagées
+par le système entre tous les processus.
+
+Organisation du dossier, pour chaque jeu de données :
+
+    <dossier>/<identifiant>/courant.json        la version courante et ses informations
+    <dossier>/<identifiant>/<version>.arrow     le tableau au format Arrow IPC
+    <dossier>/<identifiant>/refs/<pid>-<version> les processus attachés à une version
+
+Un fichier Arrow n'est supprimé que s'il n'est plus la version courante et
+qu'aucun processus vivant n'y est attaché.
+
+Classes:
+
+    StockagePartage:
+        Stockage des tableaux partagé entre processus.
+
+        Methodes:
+            publier(
+                self,
+                identifiant: str,
+                df: pd.DataFrame,
+                infos: Optional[dict] = None
+                ) -> dict
+            infos(self, identifiant: str) -> dict | None
+            fichier(self, identifiant: str, version: int) -> Path
+            mettre_a_jour(self, identifiant: str, **infos) -> None
+            attacher(self, identifiant: str) -> tuple[pd.DataFrame, dict] | None
+            detacher(self, identifiant: str, version: int) -> None
+            supprimer(self, identifiant: str) -> bool
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+import json
+import os
+import shutil
+import time
+import uuid
+import pandas as pd
+
+try:
+    import pyarrow as pa
+except ImportError: # pyarrow est optionnel, le stockage partagé est alors indisponible.
+    pa = None
+
+@dataclass
+class StockagePartage:
+    """Stockage des tableaux chargés en fichiers Arrow IPC projetés en mémoire,
+    partagés entre tous les workers qui utilisent le même dossier.
+
+    Args:
+        dossier (str): Le dossier partagé par les workers.
+    """
+
+    dossier: str
+
+    def __post_init__(self) -> None:
+        """Crée le dossier partagé s'il n'existe pas.
+        """
+        if pa is None:
+            raise ImportError("Le stockage partagé nécessite pyarrow.")
+        os.makedirs(self.dossier, exist_ok=True)
+
+    def _dossier_jeu(self, identifiant: str) -> Path:
+        """Retourne le dossier d'un jeu de données.
+        """
+        return Path(self.dossier) / identifiant
+
+    def publier(self, identifiant: str, df: pd.DataFrame, infos: Optional[dict] = None) -> dict:
+        """Écrit un tableau dans le stockage partagé et en fait la version courante.
+
+        Args:
+            identifiant (str): L'identifiant du jeu de données.
+            df (pd.DataFrame): Le tableau à partager.
+            infos (dict | None): Des informations sérialisables en JSON (chemin du fichier, ...).
+
+        Returns:
+            dict: Les informations de la version publiée, dont `version`.
+        """
+
+        dossier = self._dossier_jeu(identifiant)
+        os.makedirs(dossier / "refs", exist_ok=True)
+
+        # Une version fondée sur l'horloge est unique entre les processus.
+        version = time.time_ns()
+        chemin = dossier / f"{version}.arrow"
+        table = pa.Table.from_pandas(df, preserve_index=False)
+
+        # Écriture sans compression, pour que la lecture projetée ne copie rien. Un nom
+        # propre à chaque écriture : plusieurs fils ou processus peuvent publier en même temps.
+        chemin_temporaire = chemin.with_suffix(f".{os.getpid()}.{uuid.uuid4().hex}.tmp")
+        with pa.OSFile(str(chemin_temporaire), "wb") as sortie:
+            with pa.ipc.new_file(sortie, table.schema) as ecrivain:
+                ecrivain.write_table(table)
+        os.replace(chemin_temporaire, chemin)
+
+        contenu = {**(infos or {}), 'version': version}
+        self._ecrire_infos(identifiant, contenu)
+        self._nettoyer(identifiant)
+        return contenu
+
+    def _ecrire_infos(self, identifiant: str, contenu: dict) -> None:
+        """Remplace atomiquement le fichier `courant.json` d'un jeu de données.
+        """
+        chemin = self._dossier_jeu(identifiant) / "courant.json"
+        chemin_temporaire = chemin.with_suffix(f".{os.getpid()}.{uuid.uuid4().hex}.tmp")
+        with open(chemin_temporaire, 'w', encoding="utf-8") as f:
+            json.dump(contenu, f)
+        os.replace(chemin_temporaire, chemin)
+
+    def infos(self, identifiant: str) -> Optional[dict]:
+        """Retourne les informations de la version courante d'un jeu de données.
+
+        Args:
+            identifiant (str): L'identifiant du jeu de données.
+
+        Returns:
+            dict | None: Les informations, ou `None` si le jeu de données n'existe pas.
+        """
+
+        try:
+            with open(self._dossier_jeu(identifiant) / "courant.json", 'r', encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def fichier(self, identifiant: str, version: int) -> Path:
+        """Retourne le fichier Arrow d'une version d'un jeu de données, qui reste
+        sur le disque tant que ce processus y est attaché.
+
+        Args:
+            identifiant (str): L'identifiant du jeu de données.
+            version (int): La version du tableau.
+
+        Returns:
+            Path: Le chemin du fichier Arrow IPC.
+        """
+        return self._dossier_jeu(identifiant) / f"{version}.arrow"
+
+    def mettre_a_jour(self, identifiant: str, **infos) -> None:
+        """Modifie les informations de la version courante, sans réécrire le tableau.
+
+        Args:
+            identifiant (str): L'identifiant du jeu de données.
+            **infos: Les informations à modifier (sérialisables en JSON).
+        """
+
+        contenu = self.infos(identifiant)
+        if contenu is not None:
+            self._ecrire_infos(identifiant, {**contenu, **infos})
+
+    def attacher(self, identifiant: str) -> Optional[tuple[pd.DataFrame, dict]]:
+        """S'attache à la version courante d'un jeu de données, sans copie des colonnes
+        numériques : le tableau est lu depuis le fichier projeté en mémoire.
+
+        Args:
+            identifiant (str): L'identifiant du jeu de données.
+
+        Returns:
+            tuple[pd.DataFrame, dict] | None: Le tableau et ses informations,
+            ou `None` si le jeu de données n'existe pas.
+        """
+
+        dossier = self._dossier_jeu(identifiant)
+
+        # Une nouvelle version peut être publiée par un autre processus entre la lecture
+        # de `courant.json` et l'ouverture du fichier : on réessaie alors avec la suivante.
+        for _ in range(3):
+            contenu = self.infos(identifiant)
+            if contenu is None:
+                return None
+
+            # La référence est posée avant l'ouverture pour que le fichier ne soit pas supprimé.
+            reference = dossier / "refs" / f"{os.getpid()}-{contenu['version']}"
+            try:
+                reference.touch()
+                source = pa.memory_map(str(dossier / f"{contenu['version']}.arrow"), "r")
+            except FileNotFoundError:
+                reference.unlink(missing_ok=True)
+                continue
+
+            table = pa.ipc.open_file(source).read_all()
+            return table.to_pandas(split_blocks=True), contenu
+        return None
+
+    def detacher(self, identifiant: str, version: int) -> None:
+        """Retire la référence de ce processus à une version d'un jeu de données.
+
+        Args:
+            identifiant (str): L'identifiant du jeu de données.
+            version (int): La version à laquelle le processus n'est plus attaché.
+        """
+
+        reference = self._dossier_jeu(identifiant) / "refs" / f"{os.getpid()}-{version}"
+        reference.unlink(missing_ok=True)
+        self._nettoyer(identifiant)
+
+    def supprimer(self, identifiant: str) -> bool:
+        """Supprime un jeu de données pour tous les processus. Les fichiers encore
+        projetés par d'autres processus sont supprimés lorsqu'ils s'en détachent.
+
+        Args:
+            identifiant (str): L'identifiant du jeu de données.
+
+        Returns:
+            bool: `True` si le jeu de données existait.
+        """
+
+        chemin = self._dossier_jeu(identifiant) / "courant.json"
+        if not chemin.exists():
+            return False
+        chemin.unlink(missing_ok=True)
+        self._nettoyer(identifiant)
+        return True
+
+    def _nettoyer(self, identifiant: str) -> None:
+        """Supprime les fichiers Arrow qui ne sont ni la version courante,
+        ni référencés par un processus vivant.
+
+        Args:
+            identifiant (str): L'identifiant du jeu de données.
+        """
+
+        dossier = self._dossier_jeu(identifiant)
+        contenu = self.infos(identifiant)
+        courante = contenu['version'] if contenu else None
+
+        versions_utilisees = set()
+        for reference in (dossier / "refs").glob("*-*"):
+            pid, version = reference.name.split("-", 1)
+            if _processus_vivant(int(pid)):
+                versions_utilisees.add(int(version))
+            else:
+                reference.unlink(missing_ok=True)
+
+        for chemin in dossier.glob("*.arrow"):
+            version = int(chemin.stem)
+            if version == courante or version in versions_utilisees:
+                continue
+            try:
+                chemin.unlink(missing_ok=True)
+            except PermissionError:
+                # Sous Windows, un fichier encore projeté ne peut pas être supprimé.
+                continue
+
+        if courante is None and not any(dossier.glob("*.arrow")):
+            shutil.rmtree(dossier, ignore_errors=True)
+
+def _processus_vivant(pid: int) -> bool:
+    """Indique si un processus existe encore.
+
+    Args:
+        pid (int): L'identifiant du processus.
+
+    Returns:
+        bool: `True` si le processus existe (toujours vrai sous Windows,
+        où `os.kill` terminerait le processus).
+    """
+
+    if pid == os.getpid() or os.name == "nt":
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
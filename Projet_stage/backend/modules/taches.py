@@ -0,0 +1,434 @@
+"""Ce module exécute les traitements longs (réduction de dimension et rendu
+des vues graphiques) dans un groupe borné de processus, en dehors des requêtes.
+
+Chaque tâche reçoit un identifiant dès sa soumission ; son état, sa progression
+et ses fichiers produits sont écrits dans `<dossier>/<identifiant>.json`, ce qui
+permet à n'importe quel worker de répondre à une demande de suivi.
+
+Classes:
+
+    EtatTache:
+        Les états possibles d'une tâche.
+
+    TacheAnnulee:
+        Exception levée dans le processus d'une tâche dont l'annulation est demandée.
+
+    FileTachesPleine:
+        Exception levée quand trop de tâches sont déjà en attente ou en cours.
+
+    Rapporteur:
+        Écrit la progression d'une tâche depuis le processus qui l'exécute.
+
+    GestionnaireTaches:
+        Soumission, suivi et annulation des tâches.
+
+        Methodes:
+            soumettre(self, fonction: Callable, *args, **kwargs) -> dict
+            obtenir(self, identifiant: str) -> dict | None
+            annuler(self, identifiant: str) -> bool
+            arreter(self) -> None
+
+Fonctions:
+
+    tache_visualisation(...) -> dict
+        Construit une vue graphique en 2 ou 3 dimensions dans un processus de tâche.
+"""
+
+from concurrent.futures import (
+    CancelledError,
+    Future,
+    ProcessPoolExecutor,
+    )
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import (
+    dataclass,
+    field,
+    )
+from enum import Enum
+from multiprocessing import get_context
+from pathlib import Path
+from typing import (
+    Callable,
+    Optional,
+    )
+import json
+import os
+import threading
+import time
+import uuid
+import pandas as pd
+from modules.cache_projections import CacheProjections
+from modules.executeur_reduction import repartir_coeurs
+from modules.index_voisins import IndexVoisins
+
+class EtatTache(str, Enum):
+    """Les états possibles d'une tâche.
+    """
+    EN_ATTENTE = "en_attente"
+    EN_COURS = "en_cours"
+    TERMINEE = "terminee"
+    ECHOUEE = "echouee"
+    ANNULEE = "annulee"
+
+# Les états à partir desquels une tâche n'évolue plus.
+ETATS_FINAUX = (EtatTache.TERMINEE, EtatTache.ECHOUEE, EtatTache.ANNULEE)
+
+class TacheAnnulee(Exception):
+    """Exception levée dans une tâche dont l'annulation a été demandée.
+    """
+
+class FileTachesPleine(RuntimeError):
+    """Exception levée quand trop de tâches sont déjà en attente ou en cours.
+    """
+
+def _ecrire_etat(chemin: Path, **etat) -> None:
+    """Met à jour atomiquement le fichier d'état d'une tâche.
+
+    Args:
+        chemin (Path): Le fichier d'état de la tâche.
+        **etat: Les champs à modifier.
+    """
+
+    try:
+        with open(chemin, 'r', encoding="utf-8") as f:
+            contenu = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        contenu = {}
+    contenu.update(etat)
+
+    chemin_temporaire = chemin.with_suffix(f".{os.getpid()}.tmp")
+    with open(chemin_temporaire, 'w', encoding="utf-8") as f:
+        json.dump(contenu, f)
+    os.replace(chemin_temporaire, chemin)
+
+@dataclass
+class Rapporteur:
+    """Écrit la progression d'une tâche depuis le processus qui l'exécute,
+    et interrompt la tâche si son annulation a été demandée.
+
+    Args:
+        chemin (str): Le fichier d'état de la tâche.
+    """
+
+    chemin: str
+
+    def __call__(self, progression: float, message: str = "") -> None:
+        """Enregistre l'avancement de la tâche (point d'annulation).
+
+        Args:
+            progression (float): L'avancement, entre 0 et 1.
+            message (str): L'étape en cours.
+
+        Raises:
+            TacheAnnulee: Si l'annulation de la tâche a été demandée.
+        """
+
+        chemin = Path(self.chemin)
+        if chemin.with_suffix(".annuler").exists():
+            raise TacheAnnulee(message)
+        _ecrire_etat(chemin, progression=round(progression, 3), message=message)
+
+def _executer(chemin: str, fonction: Callable, args: tuple, kwargs: dict) -> object:
+    """Exécute une tâche dans un processus du groupe en tenant son état à jour.
+
+    Args:
+        chemin (str): Le fichier d'état de la tâche.
+        fonction (Callable): La fonction de la tâche, qui reçoit un `Rapporteur` en `rapporter`.
+        args (tuple): Les arguments positionnels de la fonction.
+        kwargs (dict): Les arguments nommés de la fonction.
+
+    Returns:
+        object: Le résultat de la fonction.
+    """
+
+    rapporteur = Rapporteur(chemin)
+    try:
+        rapporteur(0.0, "Démarrage")
+        _ecrire_etat(Path(chemin), etat=EtatTache.EN_COURS.value, debut=time.time())
+        resultat = fonction(*args, rapporter=rapporteur, **kwargs)
+    except TacheAnnulee:
+        _ecrire_etat(Path(chemin), etat=EtatTache.ANNULEE.value, fin=time.time())
+        raise
+    except Exception as e:
+        _ecrire_etat(Path(chemin), etat=EtatTache.ECHOUEE.value, erreur=str(e), fin=time.time())
+        raise
+
+    _ecrire_etat(
+        Path(chemin),
+        etat=EtatTache.TERMINEE.value,
+        progression=1.0,
+        message="Terminée",
+        resultat=resultat,
+        fin=time.time())
+    return resultat
+
+@dataclass
+class GestionnaireTaches:
+    """Exécute les tâches longues dans un groupe borné de processus.
+    Les tâches au-delà de `processus_max` attendent leur tour, et au-delà de
+    `file_max` tâches en attente les nouvelles soumissions sont refusées.
+
+    Args:
+        dossier (str): Le dossier des fichiers d'état des tâches.
+        processus_max (int): Le nombre maximal de tâches exécutées en même temps (2 par défaut).
+        file_max (int): Le nombre maximal de tâches en attente ou en cours (20 par défaut).
+        conservation (float): La durée de conservation des états des tâches, en secondes
+        (un jour par défaut).
+    """
+
+    dossier: str
+    processus_max: int = 2
+    file_max: int = 20
+    conservation: float = 24 * 3600
+    _futurs: dict = field(default_factory=dict, init=False, repr=False)
+    _executeur: Optional[ProcessPoolExecutor] = field(default=None, init=False, repr=False)
+    _verrou: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        """Crée le dossier des fichiers d'état s'il n'existe pas.
+        """
+        os.makedirs(self.dossier, exist_ok=True)
+
+    def _chemin(self, identifiant: str) -> Path:
+        """Retourne le fichier d'état d'une tâche.
+        """
+        return Path(self.dossier) / f"{identifiant}.json"
+
+    def soumettre(self, fonction: Callable, *args, **kwargs) -> dict:
+        """Soumet une tâche et retourne immédiatement son état initial.
+        La fonction doit être définie au niveau d'un module (pour être transmise
+        à un autre processus) et accepter un argument nommé `rapporter`.
+
+        Args:
+            fonction (Callable): La fonction à exécuter.
+            *args: Les arguments positionnels de la fonction.
+            **kwargs: Les arguments nommés de la fonction.
+
+        Raises:
+            FileTachesPleine: Si trop de tâches sont déjà en attente ou en cours.
+            BrokenProcessPool: Si le groupe de processus, recréé, ne démarre pas.
+
+        Returns:
+            dict: L'état de la tâche, dont son `identifiant`.
+        """
+
+        with self._verrou:
+            self._purger()
+            if len(self._futurs) >= self.file_max:
+                raise FileTachesPleine("Trop de tâches en cours, veuillez réessayer plus tard.")
+
+            identifiant = uuid.uuid4().hex
+            chemin = self._chemin(identifiant)
+            _ecrire_etat(
+                chemin,
+                identifiant=identifiant,
+                etat=EtatTache.EN_ATTENTE.value,
+                progression=0.0,
+                message="En attente",
+                resultat=None,
+                erreur=None,
+                cree_le=time.time())
+
+            try:
+                futur = self._soumettre_au_groupe(_executer, str(chemin), fonction, args, kwargs)
+            except BrokenProcessPool as e:
+                _ecrire_etat(chemin, etat=EtatTache.ECHOUEE.value, erreur=str(e), fin=time.time())
+                raise
+            self._futurs[identifiant] = futur
+            futur.add_done_callback(lambda f, i=identifiant: self._terminer(i, f))
+
+        return self.obtenir(identifiant)
+
+    def _soumettre_au_groupe(self, *args) -> Future:
+        """Soumet un appel au groupe de processus, créé à la première tâche et recréé
+        une fois s'il est cassé (un processus arrêté brutalement : mémoire, numba...).
+        Les tâches du groupe cassé sont marquées échouées par `_terminer`.
+
+        Args:
+            *args: La fonction et ses arguments.
+
+        Raises:
+            BrokenProcessPool: Si le groupe recréé est encore cassé.
+
+        Returns:
+            Future: Le futur de l'appel.
+        """
+
+        for tentative in range(2):
+            # `spawn` : un processus dupliqué par fork après du code numba ou OpenMP
+            # (UMAP) se bloque, et les processus neufs ne chargent que les modules
+            # de leurs tâches.
+            if self._executeur is None:
+                # Chaque tâche ne dispose que de sa part des coeurs (voir `repartir_coeurs`).
+                self._executeur = ProcessPoolExecutor(
+                    max_workers=self.processus_max,
+                    mp_context=get_context("spawn"),
+                    initializer=repartir_coeurs,
+                    initargs=(self.processus_max,))
+            try:
+                return self._executeur.submit(*args)
+            except BrokenProcessPool:
+                self._executeur.shutdown(wait=False, cancel_futures=True)
+                self._executeur = None
+                if tentative:
+                    raise
+        raise BrokenProcessPool("\nLe groupe de processus des tâches ne démarre pas.\n")
+
+    def _purger(self) -> None:
+        """Oublie les tâches terminées et supprime les états trop anciens.
+        """
+
+        self._futurs = {i: f for i, f in self._futurs.items() if not f.done()}
+        limite = time.time() - self.conservation
+        for chemin in Path(self.dossier).glob("*.json"):
+            try:
+                if chemin.stat().st_mtime < limite:
+                    chemin.unlink(missing_ok=True)
+            except FileNotFoundError:
+                continue
+
+    def _terminer(self, identifiant: str, futur: Future) -> None:
+        """Enregistre l'état final d'une tâche annulée avant son démarrage,
+        ou dont le processus s'est arrêté sans pouvoir écrire son état.
+
+        Args:
+            identifiant (str): L'identifiant de la tâche.
+            futur (Future): Le futur de la tâche.
+        """
+
+        chemin = self._chemin(identifiant)
+        chemin.with_suffix(".annuler").unlink(missing_ok=True)
+        etat = self.obtenir(identifiant)
+        if etat is None or EtatTache(etat['etat']) in ETATS_FINAUX:
+            return None
+
+        try:
+            futur.result()
+        except CancelledError:
+            _ecrire_etat(chemin, etat=EtatTache.ANNULEE.value, fin=time.time())
+        except BrokenProcessPool:
+            _ecrire_etat(
+                chemin,
+                etat=EtatTache.ECHOUEE.value,
+                erreur="Le processus de la tâche s'est arrêté brutalement.",
+                fin=time.time())
+        except Exception as e: # pylint: disable=broad-exception-caught
+            _ecrire_etat(chemin, etat=EtatTache.ECHOUEE.value, erreur=str(e), fin=time.time())
+        return None
+
+    def obtenir(self, identifiant: str) -> Optional[dict]:
+        """Retourne l'état, la progression et le résultat d'une tâche.
+
+        Args:
+            identifiant (str): L'identifiant de la tâche.
+
+        Returns:
+            dict | None: L'état de la tâche, ou `None` si elle est inconnue.
+        """
+
+        try:
+            with open(self._chemin(identifiant), 'r', encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def annuler(self, identifiant: str) -> bool:
+        """Annule une tâche : immédiatement si elle est en attente, sinon à son
+        prochain point de progression. L'annulation est coopérative : une tâche
+        occupée par un seul long calcul (une réduction t-SNE ou UMAP) ne s'arrête
+        qu'à la fin de ce calcul, son processus n'étant pas interrompu.
+
+        Args:
+            identifiant (str): L'identifiant de la tâche.
+
+        Returns:
+            bool: `False` si la tâche est inconnue ou déjà terminée.
+        """
+
+        etat = self.obtenir(identifiant)
+        if etat is None or EtatTache(etat['etat']) in ETATS_FINAUX:
+            return False
+
+        futur = self._futurs.get(identifiant)
+        if futur is not None and futur.cancel():
+            return True
+
+        # Tâche en cours (ou soumise par un autre worker) : annulation coopérative.
+        self._chemin(identifiant).with_suffix(".annuler").touch()
+        return True
+
+    def arreter(self) -> None:
+        """Arrête le groupe de processus en annulant les tâches en attente.
+        """
+
+        with self._verrou:
+            if self._executeur is not None:
+                self._executeur.shutdown(wait=False, cancel_futures=True)
+                self._executeur = None
+
+def tache_visualisation(
+    axes: int,
+    df: pd.DataFrame,
+    graphic_vue_folder: str,
+    file_name: str,
+    rapporter: Callable[[float, str], None],
+    cache: Optional[CacheProjections] = None,
+    index: Optional[IndexVoisins] = None,
+    budget_secondes: Optional[float] = None,
+    parametres: Optional[dict[str, dict]] = None,
+    source: Optional[str] = None,
+    lignes_flux: int = 1_000_000
+    ) -> dict:
+    """Construit une vue graphique en 2 ou 3 dimensions, dans un processus de tâche.
+
+    Args:
+        axes (int): Le nombre de dimensions de la vue graphique (2 ou 3).
+        df (pd.DataFrame): Les colonnes numériques à visualiser.
+        graphic_vue_folder (str): Le dossier devant contenir les vues graphiques.
+        file_name (str): Le nom du fichier des données.
+        rapporter (Callable): Le rapporteur de progression de la tâche.
+        cache (CacheProjections | None): Le cache des projections déjà calculées.
+        index (IndexVoisins | None): L'index des plus proches voisins partagé par t-SNE et UMAP.
+        budget_secondes (float | None): Le temps accordé au choix de la méthode et à la réduction.
+        parametres (dict | None): Les hyperparamètres de chaque méthode de réduction.
+        source (str | None): La copie des données du registre (Arrow ou Parquet),
+        relue par l'ACP hors mémoire.
+        lignes_flux (int): Le nombre de lignes à partir duquel l'ACP relit `source` par morceaux.
+
+    Returns:
+        dict: Les fichiers HTML produits (`vues`) et, pour une vue ACP, la variance
+        expliquée et les contributions des variables (`informations`).
+    """
+
+    # Importés dans le processus de la tâche seulement.
+    from modules.visualisation_2D import Visualisation2D # pylint: disable=import-outside-toplevel
+    from modules.visualisation_3D import Visualisation3D # pylint: disable=import-outside-toplevel
+
+    classe = Visualisation2D if axes == 2 else Visualisation3D
+    dossier_vues = Path(graphic_vue_folder) / f"{axes}D"
+    debut = time.time()
+
+    # La vue rapporte son avancement entre le choix de la méthode, la réduction
+    # et le rendu : une annulation demandée interrompt la tâche à l'étape suivante.
+    vue = classe(
+        axes=axes,
+        df=df,
+        color_col=None,
+        graphic_vue_folder=graphic_vue_folder,
+        file_name=file_name,
+        cache=cache,
+        index=index,
+        budget_secondes=budget_secondes,
+        parametres=parametres,
+        source=source,
+        lignes_flux=lignes_flux,
+        rapporter=rapporter)
+    vue.visualisation_automatique()
+    rapporter(0.95, "Enregistrement des vues")
+
+    return {
+        'vues': sorted(
+            str(f) for f in dossier_vues.glob(f"{file_name}_*.html")
+            if f.stat().st_mtime >= debut - 1),
+        'informations': vue.informations,
+    }
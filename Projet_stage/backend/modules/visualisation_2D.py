@@ -7,20 +7,26 @@ Returns:
 
 from typing import (
     Any,
+    Callable,
     Optional,
     Annotated,
     Literal,
     # Union,
     )
-from dataclasses import dataclass
+from dataclasses import (
+    dataclass,
+    field,
+    )
 from pathlib import Path
 import os
 import pandas as pd
-from modules.methode_acp import MethodeACP
-from modules.methode_tsne import MethodeTSNE
-from modules.methode_umap import MethodeUMAP
 from modules.auto_selector import AutoSelector
-import plotly.express as px
+from modules.cache_projections import CacheProjections
+from modules.index_voisins import IndexVoisins
+from modules.executeur_reduction import (
+    ExecuteurReduction,
+    reduire_localement,
+    )
 import plotly.io as pio
 from pydantic import (
     Field,
@@ -85,6 +91,24 @@ class Visualisation2D:
         graphic_vue_folder (str): Le chemin du dossier local devant contenir les vues graphique.
         color_col (Optional[str]): La colone devant servir de coloration des vues graphique
         (None par défaut).
+        executeur (Optional[ExecuteurReduction]): Le groupe de processus de réduction
+        (None par défaut : la réduction est faite dans le processus courant).
+        cache (Optional[CacheProjections]): Le cache des projections déjà calculées
+        (None par défaut).
+        index (Optional[IndexVoisins]): L'index des plus proches voisins partagé
+        par t-SNE et UMAP (None par défaut).
+        budget_secondes (Optional[float]): Le temps accordé au choix de la méthode et à
+        la réduction (None par défaut : la méthode est choisie par l'heuristique immédiate).
+        parametres (Optional[dict]): Les hyperparamètres de chaque méthode, par exemple
+        `{'tsne': {'perplexity': 50}}` (None par défaut : ceux de chaque méthode).
+        rapporter (Optional[Callable]): Le rapporteur de progression d'une tâche, appelé
+        entre le choix de la méthode, la réduction et le rendu (points d'annulation).
+        source (Optional[str]): Le fichier CSV, Parquet ou Arrow qui contient exactement les
+        lignes de `df`, comme la copie du registre des données (None par défaut : l'ACP est toujours calculée en mémoire).
+        lignes_flux (int): Le nombre de lignes à partir duquel l'ACP relit `source`
+        par morceaux (1 000 000 par défaut).
+        informations (Optional[dict]): Après une vue ACP, la variance expliquée et les
+        contributions des variables (None sinon).
     """
 
     df: pd.DataFrame
@@ -92,6 +116,15 @@ class Visualisation2D:
     graphic_vue_folder: str
     axes: int = 2
     color_col: Optional[str] = None  # La colonne devant permettre la coloration
+    executeur: Optional[ExecuteurReduction] = None  # Réduction hors du processus de l'API
+    cache: Optional[CacheProjections] = None  # Projections déjà calculées
+    index: Optional[IndexVoisins] = None  # Graphe des voisins déjà calculé
+    budget_secondes: Optional[float] = None  # Budget de la sélection automatique
+    parametres: Optional[dict[str, dict]] = None  # Hyperparamètres par méthode
+    rapporter: Optional[Callable[[float, str], None]] = None  # Progression d'une tâche
+    source: Optional[str] = None  # Fichier des données, relu par l'ACP hors mémoire
+    lignes_flux: int = 1_000_000  # Seuil de l'ACP hors mémoire
+    informations: Optional[dict] = field(default=None, init=False)  # Résultats de l'ACP
 
     def __post_init__(self) -> None:
         """Cette méthode vérifie si le chemin reçu par la classe existe dans l'OS.
@@ -138,27 +171,107 @@ class Visualisation2D:
         # (i.e Créer une chaîne de caractère spécifiant l'emplacement de la vue graphique).
         return os.path.join(folder_name, file_name) # Recommandé pour la compatibilité OS.
 
+    def _rapporter(self, progression: float, message: str) -> None:
+        """Cette méthode rapporte l'avancement de la vue à la tâche qui la construit.
+
+        Args:
+            progression (float): L'avancement, entre 0 et 1.
+            message (str): L'étape qui commence.
+
+        Raises:
+            TacheAnnulee: Si l'annulation de la tâche a été demandée.
+        """
+        if self.rapporter is not None:
+            self.rapporter(progression, message)
+
+    def parametres_de(self, methode: str) -> dict:
+        """Cette méthode retourne les hyperparamètres demandés pour une méthode de réduction.
+
+        Args:
+            methode (str): La méthode de réduction (`acp`, `tsne` ou `umap`).
+
+        Returns:
+            dict: Les champs de la classe de la méthode à modifier (vide par défaut).
+        """
+        return dict((self.parametres or {}).get(methode, {}))
+
+    def _reduire(self, methode: str) -> Any:
+        """Cette méthode applique une méthode de réduction aux données, dans le
+        groupe de processus de réduction s'il est fourni, sinon dans le processus courant.
+        Une projection déjà calculée pour les mêmes valeurs est relue depuis le cache.
+        Les informations de la méthode (pour l'ACP) sont calculées avec la projection,
+        dans le processus qui réduit, et conservées dans `informations`.
+
+        Args:
+            methode (str): La méthode de réduction (`acp`, `tsne` ou `umap`).
+
+        Returns:
+            np.ndarray: La matrice réduite suivant les axes.
+        """
+
+        self._rapporter(0.3, f"Réduction avec {methode}")
+
+        # Les hyperparamètres font partie de la clé : d'autres réglages, une autre projection.
+        parametres = self.parametres_de(methode)
+        cle = None
+        if self.cache is not None:
+            cle = self.cache.cle(self.df, methode, self.axes, parametres)
+            x_reduit = self.cache.lire(cle)
+            informations = self.cache.lire_informations(cle) if methode == 'acp' else None
+            # Une ACP relue sans ses informations est recalculée.
+            if x_reduit is not None and (methode != 'acp' or informations is not None):
+                self.informations = informations
+                self._rapporter(0.8, "Rendu de la vue graphique")
+                return x_reduit
+
+        # Au-delà de `lignes_flux` lignes, l'ACP relit par morceaux la copie du registre
+        # plutôt que de copier toute la matrice vers le processus de réduction.
+        x, parametres_reduction = self.df, parametres
+        if methode == 'acp' and self.source is not None and len(self.df) >= self.lignes_flux:
+            x = self.source
+            parametres_reduction = {
+                **parametres, 'colonnes': [str(col) for col in self.df.columns]}
+
+        if self.executeur is not None:
+            x_reduit, informations = self.executeur.reduire(
+                methode, x, self.axes, self.index, parametres_reduction, informations=True)
+        else:
+            x_reduit, informations = reduire_localement(
+                methode, x, self.axes, self.index, parametres_reduction, True)
+        self.informations = informations
+
+        # La projection est mise en cache sous la clé de `df` : le fichier relu doit
+        # contenir exactement les mêmes lignes.
+        if len(x_reduit) != len(self.df):
+            raise ValueError(
+                f"\nLe fichier '{x}' contient {len(x_reduit)} lignes, "
+                f"les données chargées {len(self.df)}.\n")
+
+        if cle is not None:
+            x_reduit = self.cache.ecrire(cle, x_reduit, informations)
+        self._rapporter(0.8, "Rendu de la vue graphique")
+        return x_reduit
+
     def visualisation_2d_acp(self) -> None:
         """Cette méthode permet de faire la visualisation 2D avec la méthode ACP.
         """
 
-        # 1. Instancier la classe avec la méthode d'ACP avec une data_frame.
-        apc_2d_instance = MethodeACP(self.df)
+        import plotly.express as px # pylint: disable=import-outside-toplevel
 
-        # 2. Appliquer la méthode de réduction d'ACP suivant les axes (ici 2).
-        x_acp = apc_2d_instance.acp_reduction(nombre_dimenssion= self.axes)
+        # 1. Appliquer la méthode de réduction d'ACP suivant les axes (ici 2).
+        x_acp = self._reduire('acp')
 
-        # 3. Définir un titre à la vue graphique finale.
+        # 2. Définir un titre à la vue graphique finale.
         title = "Méthode de réduction de données avec ACP en 2D."
 
-        # 4. Définir les noms des axes de la vue graphique finale.
+        # 3. Définir les noms des axes de la vue graphique finale.
         label = {"x": "PC_1", "y": "PC_2"}
 
-        # 5. Créer un data_frame après réduction de dimension sur la data_frame
+        # 4. Créer un data_frame après réduction de dimension sur la data_frame
         # d'initailiasation.
         df_acp = pd.DataFrame(x_acp, columns=["PC_1: Composante 1", "PC_2: Composante 2"])
 
-        # 6. Construire une figure graphique dans une variable 'fig'.
+        # 5. Construire une figure graphique dans une variable 'fig'.
         fig = px.scatter(
             data_frame=df_acp,
             x="PC_1: Composante 1",
@@ -167,7 +280,7 @@ class Visualisation2D:
             title=title,
             labels=label)
 
-        # 7. Créer la vue graphique.
+        # 6. Créer la vue graphique.
         fig.write_html(self.output_html_path(
             folder=self.graphic_vue_folder,
             file=self.file_name,
@@ -177,23 +290,22 @@ class Visualisation2D:
         """Cette méthode permet de faire la visualisation 2D avec la méthode t-SNE.
         """
 
-        # 1. Instancier la classe avec la méthode de t-SNE avec une data_frame.
-        chargeur_tsne = MethodeTSNE(self.df)
+        import plotly.express as px # pylint: disable=import-outside-toplevel
 
-        # 2. Appliquer la méthode de réduction de t-SNE suivant les axes (ici 2).
-        x_tsne = chargeur_tsne.tsne_reduction(nombre_de_dimension=self.axes)
+        # 1. Appliquer la méthode de réduction de t-SNE suivant les axes (ici 2).
+        x_tsne = self._reduire('tsne')
 
-        # 3. Définir un titre à la vue graphique finale.
+        # 2. Définir un titre à la vue graphique finale.
         title = "Méthode de réduction de données avec t-SNE en 2D."
 
-        # 4. Définir les noms des axes de la vue graphique finale.
+        # 3. Définir les noms des axes de la vue graphique finale.
         label = {"x": "t-SNE_1", "y": "t-SNE_2"}
 
-        # 5. Créer un data_frame après réduction de dimension sur la data_frame
+        # 4. Créer un data_frame après réduction de dimension sur la data_frame
         # d'initailiasation.
         df_tsne = pd.DataFrame(x_tsne, columns=["t-SNE_1", "t-SNE_2"])
 
-        # 6. Construire une figure graphique dans une variable 'fig'.
+        # 5. Construire une figure graphique dans une variable 'fig'.
         fig = px.scatter(
             data_frame=df_tsne,
             x="t-SNE_1",
@@ -202,7 +314,7 @@ class Visualisation2D:
             title=title,
             labels=label)
 
-        # 7. Créer la vue graphique.
+        # 6. Créer la vue graphique.
         fig.write_html(self.output_html_path(
             folder=self.graphic_vue_folder,
             file=self.file_name,
@@ -212,23 +324,22 @@ class Visualisation2D:
         """Cette méthode permet de faire la visualisation 2D avec la méthode UMAP.
         """
 
-        # 1. Instancier la classe avec la méthode de UMAP avec une data_frame.
-        chargeur_umap = MethodeUMAP(self.df)
+        import plotly.express as px # pylint: disable=import-outside-toplevel
 
-        # 2. Appliquer la méthode de réduction de UMAP suivant les axes (ici 2).
-        x_umap = chargeur_umap.umap_reduction(nombre_de_dimension=self.axes)
+        # 1. Appliquer la méthode de réduction de UMAP suivant les axes (ici 2).
+        x_umap = self._reduire('umap')
 
-        # 3. Définir un titre à la vue graphique finale.
+        # 2. Définir un titre à la vue graphique finale.
         title = "Méthode de réduction de données avec UMAP en 2D."
 
-        # 4. Définir les noms des axes de la vue graphique finale.
+        # 3. Définir les noms des axes de la vue graphique finale.
         label = {"x": "UMAP_1", "y": "UMAP_2"}
 
-        # 5. Créer un data_frame après réduction de dimension sur la data_frame
+        # 4. Créer un data_frame après réduction de dimension sur la data_frame
         # d'initailiasation.
         df_umap = pd.DataFrame(x_umap, columns=["UMAP_1", "UMAP_2"])
 
-        # 6. Construire une figure graphique dans une variable 'fig'.
+        # 5. Construire une figure graphique dans une variable 'fig'.
         fig = px.scatter(
             data_frame=df_umap,
             x="UMAP_1",
@@ -237,7 +348,7 @@ class Visualisation2D:
             title=title,
             labels=label)
 
-        # 7. Créer la vue graphique.
+        # 6. Créer la vue graphique.
         fig.write_html(self.output_html_path(
             folder=self.graphic_vue_folder,
             file=self.file_name,
@@ -252,10 +363,21 @@ class Visualisation2D:
             None: Rien n'est retourné par cette fonction.
         """
 
+        self._rapporter(0.1, "Sélection de la méthode")
         auto = AutoSelector(nombre_de_dimension=2, df=self.df)
-        methode = auto.detecter_methode()
+        if self.budget_secondes is None:
+            methode = auto.detecter_methode()
+        else:
+            selection = auto.selectionner(self.budget_secondes, executeur=self.executeur)
+            methode = selection.methode
+            # Le budget restant après la sélection borne la réduction (les
+            # hyperparamètres demandés explicitement restent prioritaires).
+            self.parametres = {
+                **(self.parametres or {}),
+                methode: {**selection.parametres, **self.parametres_de(methode)}}
+            self._rapporter(0.2, f"Méthode retenue : {methode}")
         match methode:
-            case 'pca':
+            case 'acp':
                 return self.visualisation_2d_acp()
             case 'tsne':
                 return self.visualisation_2d_tsne()
@@ -7,19 +7,25 @@ Returns:
 
 from typing import (
     Any,
+    Callable,
     Literal,
     Optional,
     Annotated,
     )
-from dataclasses import dataclass
+from dataclasses import (
+    dataclass,
+    field,
+    )
 from pathlib import Path
 import os
 import pandas as pd
-from modules.methode_acp import MethodeACP
-from modules.methode_tsne import MethodeTSNE
-from modules.methode_umap import MethodeUMAP
 from modules.auto_selector import AutoSelector
-import plotly.express as px
+from modules.cache_projections import CacheProjections
+from modules.index_voisins import IndexVoisins
+from modules.executeur_reduction import (
+    ExecuteurReduction,
+    reduire_localement,
+    )
 import plotly.io as pio
 from pydantic import (
     Field,
@@ -141,6 +147,79 @@ class Visualisation3D:
             mode="serialisation"
         )]
 
+    executeur: Annotated[
+        Optional[ExecuteurReduction],
+        Field(
+            title="executeur",
+            description="""Ce paramètre reçoit le groupe de processus
+            de réduction (la réduction est faite dans le processus
+            courant s'il n'est pas fourni)."""
+        )] = None
+
+    cache: Annotated[
+        Optional[CacheProjections],
+        Field(
+            title="cache",
+            description="""Ce paramètre reçoit le cache des
+            projections déjà calculées."""
+        )] = None
+
+    index: Annotated[
+        Optional[IndexVoisins],
+        Field(
+            title="index",
+            description="""Ce paramètre reçoit l'index des plus
+            proches voisins partagé par t-SNE et UMAP."""
+        )] = None
+
+    budget_secondes: Annotated[
+        Optional[float],
+        Field(
+            title="budget_secondes",
+            description="""Ce paramètre reçoit le temps accordé au
+            choix de la méthode et à la réduction (la méthode est
+            choisie par l'heuristique immédiate s'il n'est pas fourni)."""
+        )] = None
+
+    parametres: Annotated[
+        Optional[dict[str, dict]],
+        Field(
+            title="parametres",
+            description="""Ce paramètre reçoit les hyperparamètres de
+            chaque méthode, par exemple `{'tsne': {'perplexity': 50}}`
+            (ceux de chaque méthode s'il n'est pas fourni)."""
+        )] = None
+
+    rapporter: Annotated[
+        Optional[Callable[[float, str], None]],
+        Field(
+            title="rapporter",
+            description="""Ce paramètre reçoit le rapporteur de progression
+            d'une tâche, appelé entre le choix de la méthode, la réduction
+            et le rendu (points d'annulation)."""
+        )] = None
+
+    source: Annotated[
+        Optional[str],
+        Field(
+            title="source",
+            description="""Ce paramètre reçoit le fichier CSV, Parquet ou Arrow
+            qui contient exactement les lignes de `df`, comme la copie du
+            registre des données (l'ACP est toujours
+            calculée en mémoire s'il n'est pas fourni)."""
+        )] = None
+
+    lignes_flux: Annotated[
+        int,
+        Field(
+            title="lignes_flux",
+            description="""Ce paramètre reçoit le nombre de lignes à partir
+            duquel l'ACP relit `source` par morceaux."""
+        )] = 1_000_000
+
+    # Après une vue ACP, la variance expliquée et les contributions des variables.
+    informations: Optional[dict] = field(default=None, init=False)
+
     def __post_init__(self) -> None:
         """Cette méthode vérifie si le chemin reçu par la classe existe dans l'OS.
         """
@@ -186,31 +265,111 @@ class Visualisation3D:
         return os.path.join(folder_name, file_name) # Recommandé pour la compatibilité OS.
 
 
+    def _rapporter(self, progression: float, message: str) -> None:
+        """Cette méthode rapporte l'avancement de la vue à la tâche qui la construit.
+
+        Args:
+            progression (float): L'avancement, entre 0 et 1.
+            message (str): L'étape qui commence.
+
+        Raises:
+            TacheAnnulee: Si l'annulation de la tâche a été demandée.
+        """
+        if self.rapporter is not None:
+            self.rapporter(progression, message)
+
+    def parametres_de(self, methode: str) -> dict:
+        """Cette méthode retourne les hyperparamètres demandés pour une méthode de réduction.
+
+        Args:
+            methode (str): La méthode de réduction (`acp`, `tsne` ou `umap`).
+
+        Returns:
+            dict: Les champs de la classe de la méthode à modifier (vide par défaut).
+        """
+        return dict((self.parametres or {}).get(methode, {}))
+
+    def _reduire(self, methode: str) -> Any:
+        """Cette méthode applique une méthode de réduction aux données, dans le
+        groupe de processus de réduction s'il est fourni, sinon dans le processus courant.
+        Une projection déjà calculée pour les mêmes valeurs est relue depuis le cache.
+        Les informations de la méthode (pour l'ACP) sont calculées avec la projection,
+        dans le processus qui réduit, et conservées dans `informations`.
+
+        Args:
+            methode (str): La méthode de réduction (`acp`, `tsne` ou `umap`).
+
+        Returns:
+            np.ndarray: La matrice réduite suivant les axes.
+        """
+
+        self._rapporter(0.3, f"Réduction avec {methode}")
+
+        # Les hyperparamètres font partie de la clé : d'autres réglages, une autre projection.
+        parametres = self.parametres_de(methode)
+        cle = None
+        if self.cache is not None:
+            cle = self.cache.cle(self.df, methode, self.axes, parametres)
+            x_reduit = self.cache.lire(cle)
+            informations = self.cache.lire_informations(cle) if methode == 'acp' else None
+            # Une ACP relue sans ses informations est recalculée.
+            if x_reduit is not None and (methode != 'acp' or informations is not None):
+                self.informations = informations
+                self._rapporter(0.8, "Rendu de la vue graphique")
+                return x_reduit
+
+        # Au-delà de `lignes_flux` lignes, l'ACP relit par morceaux la copie du registre
+        # plutôt que de copier toute la matrice vers le processus de réduction.
+        x, parametres_reduction = self.df, parametres
+        if methode == 'acp' and self.source is not None and len(self.df) >= self.lignes_flux:
+            x = self.source
+            parametres_reduction = {
+                **parametres, 'colonnes': [str(col) for col in self.df.columns]}
+
+        if self.executeur is not None:
+            x_reduit, informations = self.executeur.reduire(
+                methode, x, self.axes, self.index, parametres_reduction, informations=True)
+        else:
+            x_reduit, informations = reduire_localement(
+                methode, x, self.axes, self.index, parametres_reduction, True)
+        self.informations = informations
+
+        # La projection est mise en cache sous la clé de `df` : le fichier relu doit
+        # contenir exactement les mêmes lignes.
+        if len(x_reduit) != len(self.df):
+            raise ValueError(
+                f"\nLe fichier '{x}' contient {len(x_reduit)} lignes, "
+                f"les données chargées {len(self.df)}.\n")
+
+        if cle is not None:
+            x_reduit = self.cache.ecrire(cle, x_reduit, informations)
+        self._rapporter(0.8, "Rendu de la vue graphique")
+        return x_reduit
+
     def visualisation_3d_acp(self) -> None:
         """Cette méthode permet de faire la visualisation 3D avec la méthode ACP.
         """
 
-        # 1. Instancier la classe avec la méthode d'ACP avec une data_frame.
-        apc_3d_instance = MethodeACP(self.df)
+        import plotly.express as px # pylint: disable=import-outside-toplevel
 
-        # 2. Appliquer la méthode de réduction d'ACP suivant les axes (ici 2).
-        x_acp = apc_3d_instance.acp_reduction(nombre_dimenssion=self.axes)
+        # 1. Appliquer la méthode de réduction d'ACP suivant les axes (ici 3).
+        x_acp = self._reduire('acp')
 
-        # 3. Définir un titre à la vue graphique finale.
+        # 2. Définir un titre à la vue graphique finale.
         title = "Méthode de réduction de données ACP en 3D(Interactif)."
 
-        # 4. Définir les noms des axes de la vue graphique finale.
+        # 3. Définir les noms des axes de la vue graphique finale.
         label = {
             "x": "PC_1: Composant 1",
             "y": "PC_2: Composant 2",
             "z": "PC_3: Composant 3"
             }
 
-        # 5. Créer un data_frame après réduction de dimension sur la data_frame
+        # 4. Créer un data_frame après réduction de dimension sur la data_frame
         # d'initailiasation.
         df_acp = pd.DataFrame(x_acp, columns=["PC_1","PC_2","PC_3"])
 
-        # 6. Construire une figure graphique dans une variable 'fig'.
+        # 5. Construire une figure graphique dans une variable 'fig'.
         fig = px.scatter_3d(df_acp,
                 x= x_acp[:, 0],
                 y= x_acp[:, 1],
@@ -220,7 +379,7 @@ class Visualisation3D:
                 labels=label
                 )
 
-        # 7. Créer la vue graphique.
+        # 6. Créer la vue graphique.
         fig.write_html(self.output_html_path(
             folder=self.graphic_vue_folder,
             file=self.file_name,
@@ -230,27 +389,26 @@ class Visualisation3D:
         """Cette méthode permet de faire la visualisation 3D avec la méthode t-SNE.
         """
 
-        # 1. Instancier la classe avec la méthode de t-SNE avec une data_frame.
-        tsne_3d_instance = MethodeTSNE(self.df)
+        import plotly.express as px # pylint: disable=import-outside-toplevel
 
-        # 2. Appliquer la méthode de réduction de t-SNE suivant les axes (ici 2).
-        x_tsne = tsne_3d_instance.tsne_reduction(nombre_de_dimension=self.axes)
+        # 1. Appliquer la méthode de réduction de t-SNE suivant les axes (ici 3).
+        x_tsne = self._reduire('tsne')
 
-        # 3. Définir un titre à la vue graphique finale.
+        # 2. Définir un titre à la vue graphique finale.
         title = "Méthode de réduction de données avec t-SNE en 3D(Iteratif)."
 
-        # 4. Définir les noms des axes de la vue graphique finale.
+        # 3. Définir les noms des axes de la vue graphique finale.
         label = {
             "x": "t-SNE_1: Composant 1",
             "y": "t-SNE_2: Composant 2",
             "z": "t-SNE_3: Composant 3"
             }
 
-        # 5. Créer un data_frame après réduction de dimension sur la data_frame
+        # 4. Créer un data_frame après réduction de dimension sur la data_frame
         # d'initailiasation.
         df_tsne = pd.DataFrame(x_tsne, columns=["t-SNE_1","t-SNE_2","t-SNE_3"])
 
-        # 6. Construire une figure graphique dans une variable 'fig'.
+        # 5. Construire une figure graphique dans une variable 'fig'.
         fig = px.scatter_3d(df_tsne,
                 x= x_tsne[:, 0],
                 y= x_tsne[:, 1],
@@ -269,23 +427,22 @@ class Visualisation3D:
         """Cette méthode permet de faire la visualisation 3D avec la méthode UMAP.
         """
 
-        # 1. Instancier la classe avec la méthode de UMAP avec une data_frame.
-        umap_3d_instance = MethodeUMAP(self.df)
+        import plotly.express as px # pylint: disable=import-outside-toplevel
 
-        # 2. Appliquer la méthode de réduction de UMAP suivant les axes (ici 2).
-        x_umap = umap_3d_instance.umap_reduction(nombre_de_dimension=self.axes)
+        # 1. Appliquer la méthode de réduction de UMAP suivant les axes (ici 3).
+        x_umap = self._reduire('umap')
 
-        # 3. Définir un titre à la vue graphique finale.
+        # 2. Définir un titre à la vue graphique finale.
         title = "Méthode de réduction de données avec UMAP en 3D(Iteratif)."
 
-        # 4. Définir les noms des axes de la vue graphique finale.
+        # 3. Définir les noms des axes de la vue graphique finale.
         label = {"x": "UMAP_1: Composant 1", "y": "UMAP_2: Composant 2", "z": "UMAP_3: Composant 3"}
 
-        # 5. Créer un data_frame après réduction de dimension sur la data_frame
+        # 4. Créer un data_frame après réduction de dimension sur la data_frame
         # d'initailiasation.
         df_umap = pd.DataFrame(x_umap, columns=["UMAP_1","UMAP_2","UMAP_3"])
 
-        # 6. Construire une figure graphique dans une variable 'fig'.
+        # 5. Construire une figure graphique dans une variable 'fig'.
         fig = px.scatter_3d(df_umap,
                 x= x_umap[:, 0],
                 y= x_umap[:, 1],
@@ -308,10 +465,21 @@ class Visualisation3D:
             None: Rien n'est retourné par cette fonction.
         """
 
+        self._rapporter(0.1, "Sélection de la méthode")
         auto = AutoSelector(nombre_de_dimension=3, df=self.df,)
-        methode = auto.detecter_methode()
+        if self.budget_secondes is None:
+            methode = auto.detecter_methode()
+        else:
+            selection = auto.selectionner(self.budget_secondes, executeur=self.executeur)
+            methode = selection.methode
+            # Le budget restant après la sélection borne la réduction (les
+            # hyperparamètres demandés explicitement restent prioritaires).
+            self.parametres = {
+                **(self.parametres or {}),
+                methode: {**selection.parametres, **self.parametres_de(methode)}}
+            self._rapporter(0.2, f"Méthode retenue : {methode}")
         match methode:
-            case 'pca':
+            case 'acp':
                 return self.visualisation_3d_acp()
             case 'tsne':
                 return self.visualisation_3d_tsne()
@@ -0,0 +1,59 @@
+"""Mesure du temps de sérialisation JSON d'un DataFrame avant et après
+l'utilisation de `SerialisationDataFrame.vers_json`.
+
+Le fichier `tests/data/csv/insurance.csv` est répété jusqu'à 1 million de lignes.
+Depuis le dossier `Projet_stage/backend` :
+
+    python -m tests.benchmarks.bench_serialisation
+"""
+
+from pathlib import Path
+import time
+import numpy as np
+import pandas as pd
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from modules.clean_dataframe_for_json import CleanDataframeForJson
+from modules.serialisation_dataframe import SerialisationDataFrame
+
+INSURANCE_CSV = Path(__file__).parents[1] / "data" / "csv" / "insurance.csv"
+NOMBRE_DE_LIGNES = 1_000_000
+
+def donnees() -> pd.DataFrame:
+    """Répète le fichier de test jusqu'à `NOMBRE_DE_LIGNES` lignes,
+    avec une valeur manquante toutes les 7 lignes dans la colonne `bmi`.
+
+    Returns:
+        pd.DataFrame: Le tableau de données du benchmark.
+    """
+    df = pd.read_csv(INSURANCE_CSV)
+    df = pd.concat([df] * (NOMBRE_DE_LIGNES // len(df) + 1), ignore_index=True)
+    df = df.iloc[:NOMBRE_DE_LIGNES].copy()
+    df.loc[::7, "bmi"] = np.nan
+    return df
+
+def avant(df: pd.DataFrame) -> bytes:
+    """Chemin d'origine : copie objet avec `None`, `to_dict`, `jsonable_encoder`.
+    """
+    df = df.replace([float('inf'), float('-inf')], None)
+    df = df.replace({np.nan: None})
+    df = df.where(pd.notnull(df), None)
+    return JSONResponse(content=jsonable_encoder(df.to_dict(orient="records"))).body
+
+def apres(df: pd.DataFrame) -> bytes:
+    """Nouveau chemin : nettoyage en un passage puis encodage colonne par colonne.
+    """
+    df = CleanDataframeForJson().clean_dataframe_for_json(df)
+    return SerialisationDataFrame().vers_json(df)
+
+def mesurer(nom: str, fonction, df: pd.DataFrame) -> None:
+    """Affiche la durée d'une sérialisation et la taille du document produit.
+    """
+    debut = time.perf_counter()
+    contenu = fonction(df)
+    print(f"{nom:>6} : {time.perf_counter() - debut:6.2f} s, {len(contenu) / 1e6:.0f} Mo")
+
+if __name__ == "__main__":
+    data = donnees()
+    mesurer("avant", avant, data)
+    mesurer("après", apres, data)
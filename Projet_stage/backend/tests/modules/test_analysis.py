@@ -5,6 +5,7 @@
 
 from tests.modules.test_loading import TestDataLoader
 from modules.analysis import Analyse
+from modules.doublons import DetecteurDoublons
 import pandas as pd
 
 class TestAnalyse:
@@ -52,3 +53,53 @@ class TestAnalyse:
         assert resultat is not None
         assert isinstance(resultat, pd.DataFrame)
         assert len(resultat) > 0
+
+    def test_summarize_par_colonne(self) -> None:
+        """Test la méthode `summarize_par_colonne`.
+        """
+
+        data = pd.DataFrame({"a": [1, None, 3], "b": ["x", "y", None]})
+
+        resultat = Analyse().summarize_par_colonne(df=data)
+
+        assert resultat["colonne"].tolist() == ["a", "b"]
+        assert resultat["valeurs_manquantes"].tolist() == [1, 1]
+        assert resultat["numerique"].tolist() == [True, False]
+
+    def test_summarize_version(self) -> None:
+        """Test que le résumé d'une même version n'est calculé qu'une fois.
+        """
+
+        data = pd.DataFrame({"a": [1, 1, 3]})
+        analyse = Analyse(taille_cache=1)
+
+        premier = analyse.summarize(data=data, version=1)
+        data.loc[3] = [4]
+
+        assert analyse.summarize(data=data, version=1) is premier
+        assert analyse.summarize(data=data, version=2)['shape'] == (4, 1)
+        assert analyse.summarize(data=data, version=1) is not premier
+
+    def test_get_descriptive_stats_flux(self) -> None:
+        """Test la méthode `get_descriptive_stats_flux`.
+        """
+
+        data = pd.DataFrame({"a": range(10), "b": list("abcdeabcde")})
+
+        resultat = Analyse().get_descriptive_stats_flux([data.iloc[:4], data.iloc[4:]])
+
+        assert resultat.loc["a", "count"] == 10
+        assert resultat.loc["a", "mean"] == 4.5
+        assert resultat.loc["b", "unique"] == 5
+
+    def test_summarize_doublons_partages(self) -> None:
+        """Test que le résumé réutilise le hachage des lignes du détecteur partagé.
+        """
+
+        data = pd.DataFrame({"a": [1, 1, 2], "b": ["x", "x", "y"]})
+        doublons = DetecteurDoublons()
+
+        resume = Analyse(doublons=doublons).summarize(data=data, version=1)
+
+        assert resume['duplicates'] == 1
+        assert doublons.hachages(data, version=1) is doublons.hachages(data, version=1)
@@ -1,8 +1,23 @@
 """Test du module `Projet_stage/backend/modules/auto_selctor.py`
 """
 
+import threading
+import time
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.datasets import make_blobs
 from tests.modules.test_loading import TestDataLoader
-from modules.auto_selector import AutoSelector
+from modules import auto_selector
+from modules.auto_selector import (
+    CANDIDATS,
+    AutoSelector,
+    ResultatSelection,
+    _evaluer_candidat,
+    duree_prevue,
+    reperes_tsne,
+    )
+from modules.executeur_reduction import ExecuteurReduction
 
 class TestAutoSelector:
     """Test de la classe `AutoSelector`.
@@ -25,3 +40,94 @@ class TestAutoSelector:
         print(detecter_methode_dim_1)
         print(detecter_methode_dim_2)
         print(detecter_methode_dim_3)
+
+    def test_grand_jeu_de_donnees(self) -> None:
+        """Test que la taille du jeu complet, et non celle de l'échantillon,
+        écarte t-SNE pour un grand jeu de données.
+        """
+
+        generateur = np.random.default_rng(0)
+        petit = pd.DataFrame(generateur.standard_normal((2_000, 5)))
+        grand = pd.DataFrame(generateur.standard_normal((50_000, 5)))
+
+        assert AutoSelector(nombre_de_dimension=2, df=petit).detecter_methode() == "tsne"
+        assert AutoSelector(nombre_de_dimension=2, df=grand).detecter_methode() == "umap"
+
+    def test_selectionner(self) -> None:
+        """Test la sélection budgétée, avec les méthodes évaluées en parallèle
+        dans le groupe de processus de réduction.
+        """
+
+        x, _ = make_blobs(n_samples=3_000, n_features=5, centers=4, random_state=0)
+        executeur = ExecuteurReduction(processus_max=2, prechauffage=False)
+        try:
+            resultat = AutoSelector(nombre_de_dimension=2, df=pd.DataFrame(x)).selectionner(
+                budget_secondes=400, executeur=executeur)
+        finally:
+            executeur.arreter()
+
+        assert resultat.methode in CANDIDATS
+        assert 0 < resultat.score <= 1
+        assert 0 < resultat.duree_prevue <= 400
+        # Seul t-SNE reçoit le nombre de repères qui tient dans le budget restant.
+        assert resultat.parametres == (
+            {'max_points': 3_000} if resultat.methode == 'tsne' else {})
+
+    def test_budget_epuise(self) -> None:
+        """Test que l'ACP est retenue sans évaluation quand le budget est épuisé.
+        """
+
+        df = pd.DataFrame(np.random.default_rng(0).standard_normal((2_000, 5)))
+
+        resultat = AutoSelector(nombre_de_dimension=2, df=df).selectionner(budget_secondes=1e-6)
+
+        assert resultat == ResultatSelection('acp')
+
+    def test_duree_prevue(self) -> None:
+        """Test l'extrapolation des durées mesurées sur l'échantillon.
+        """
+
+        assert duree_prevue('acp', 1.0, 500, 5_000) == 10.0
+        assert duree_prevue('umap', 1.0, 500, 5_000) > 10.0
+        # Au-delà de son budget, t-SNE ne réduit que des repères.
+        assert duree_prevue('tsne', 1.0, 500, 10**7) < duree_prevue('umap', 1.0, 500, 10**7)
+        # Le nombre de repères suit le budget transmis.
+        assert duree_prevue('tsne', 1.0, 500, 10**7, 30) < duree_prevue('tsne', 1.0, 500, 10**7, 300)
+
+    def test_reperes_tsne(self) -> None:
+        """Test le nombre de repères de t-SNE, arrondi pour garder la même clé de cache.
+        """
+
+        assert reperes_tsne(500) == 500
+        assert reperes_tsne(10**7, 100) % 1_000 == 0
+        assert reperes_tsne(10**7, 100) < reperes_tsne(10**7, 1_000)
+        # Un processus qui n'a qu'une part des coeurs réduit moins de repères.
+        assert reperes_tsne(10**7, 100, coeurs=1) < reperes_tsne(10**7, 100, coeurs=8)
+
+    def test_echeance(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test qu'une évaluation trop longue n'est pas attendue au-delà de l'échéance,
+        même hors du fil principal (fil d'une route synchrone de l'API).
+        """
+
+        x = np.random.default_rng(0).standard_normal((100, 5))
+        with pytest.raises(TimeoutError):
+            _evaluer_candidat('acp', x, 2, time.time() - 1)
+
+        reduire = auto_selector.reduire_localement
+        def reduire_lentement(methode, *args):
+            if methode == 'tsne':
+                time.sleep(5)
+            return reduire(methode, *args)
+        monkeypatch.setattr(auto_selector, "reduire_localement", reduire_lentement)
+
+        df = pd.DataFrame(np.random.default_rng(0).standard_normal((2_000, 5)))
+        resultats = []
+        debut = time.perf_counter()
+        fil = threading.Thread(target=lambda: resultats.append(
+            AutoSelector(nombre_de_dimension=2, df=df).selectionner(budget_secondes=8)))
+        fil.start()
+        fil.join()
+
+        # L'échéance de l'évaluation tombe après 2 secondes (le quart du budget).
+        assert time.perf_counter() - debut < 4
+        assert resultats[0].methode == 'acp'
@@ -0,0 +1,104 @@
+"""Test du module `Projet_stage/backend/modules/cache_donnees.py`.
+"""
+
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+import os
+import pandas as pd
+import pytest
+from modules.cache_donnees import CacheDonnees
+from modules.loading import DataLoader
+
+INSURANCE_CSV = Path(__file__).parents[1] / "data" / "csv" / "insurance.csv"
+
+class TestCacheDonnees:
+    """Test de la classe `CacheDonnees`.
+    """
+
+    def test_chargement_depuis_le_cache(self, tmp_path: Path) -> None:
+        """Test qu'un second chargement du même fichier est lu depuis le cache.
+        """
+
+        cache = CacheDonnees(dossier=str(tmp_path / "cache"))
+        chargeur = DataLoader(cache=cache)
+
+        premier = chargeur.load(file_path=str(INSURANCE_CSV))
+        second = chargeur.load(file_path=str(INSURANCE_CSV))
+
+        pd.testing.assert_frame_equal(premier, second)
+        assert cache.statistiques()['succes'] == 1
+        assert cache.statistiques()['echecs'] == 1
+        assert cache.statistiques()['fichiers'] == 1
+
+    def test_empreinte_change_avec_le_fichier(self, tmp_path: Path) -> None:
+        """Test que l'empreinte change lorsque le fichier source est modifié.
+        """
+
+        fichier = tmp_path / "data.csv"
+        fichier.write_text("a,b\n1,2\n", encoding="utf-8")
+
+        cache = CacheDonnees(dossier=str(tmp_path / "cache"))
+        avant = cache.empreinte(str(fichier))
+
+        fichier.write_text("a,b\n1,2\n3,4\n", encoding="utf-8")
+
+        assert cache.empreinte(str(fichier)) != avant
+
+    def test_eviction_lru(self, tmp_path: Path) -> None:
+        """Test que l'entrée la moins récemment utilisée est supprimée en premier.
+        """
+
+        cache = CacheDonnees(dossier=str(tmp_path / "cache"))
+        fichiers = []
+
+        for i in range(3):
+            fichier = tmp_path / f"data_{i}.csv"
+            fichier.write_text(f"a,b\n{i},2\n", encoding="utf-8")
+            fichiers.append(str(fichier))
+            cache.ecrire(str(fichier), pd.read_csv(fichier))
+
+        # Limiter le cache à deux entrées, puis réutiliser la première.
+        cache.taille_max_octets = 2 * cache.statistiques()['octets'] // 3
+        cache.lire(fichiers[0])
+        cache.ecrire(fichiers[2], pd.read_csv(fichiers[2]))
+
+        assert cache.statistiques()['fichiers'] == 2
+        assert cache.lire(fichiers[0]) is not None
+        assert cache.lire(fichiers[1]) is None
+
+    def test_ecritures_concurrentes(self, tmp_path: Path) -> None:
+        """Test que des écritures simultanées du même fichier ne se gênent pas.
+        """
+
+        cache = CacheDonnees(dossier=str(tmp_path / "cache"))
+        df = pd.read_csv(INSURANCE_CSV)
+
+        with ThreadPoolExecutor(max_workers=4) as executeur:
+            list(executeur.map(lambda _: cache.ecrire(str(INSURANCE_CSV), df), range(8)))
+
+        pd.testing.assert_frame_equal(cache.lire(str(INSURANCE_CSV)), df)
+        assert not list((tmp_path / "cache").glob("*.tmp"))
+
+    def test_entree_evincee(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test qu'une entrée supprimée pendant la lecture compte comme absente.
+        """
+
+        cache = CacheDonnees(dossier=str(tmp_path / "cache"))
+        cache.ecrire(str(INSURANCE_CSV), pd.read_csv(INSURANCE_CSV))
+
+        def evincer(chemin, *args, **kwargs) -> None:
+            raise FileNotFoundError(chemin)
+        monkeypatch.setattr(os, "utime", evincer)
+
+        assert cache.lire(str(INSURANCE_CSV)) is None
+        assert cache.statistiques()['echecs'] == 1
+
+    def test_memoire_max(self, tmp_path: Path) -> None:
+        """Test que le plafond mémoire du chargeur s'applique aussi au tableau en cache.
+        """
+
+        cache = CacheDonnees(dossier=str(tmp_path / "cache"))
+        DataLoader(cache=cache).load(file_path=str(INSURANCE_CSV))
+
+        with pytest.raises(MemoryError):
+            DataLoader(cache=cache, memoire_max=1_000).load(file_path=str(INSURANCE_CSV))
@@ -0,0 +1,227 @@
+"""Test du module `Projet_stage/backend/modules/cache_projections.py`.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import os
+import time
+import numpy as np
+import pandas as pd
+import pytest
+from modules.auto_selector import ResultatSelection
+from modules.cache_projections import CacheProjections
+from modules import visualisation_2D
+from modules.visualisation_2D import Visualisation2D
+
+INSURANCE_CSV = Path(__file__).parents[1] / "data" / "csv" / "insurance.csv"
+
+class TestCacheProjections:
+    """Test de la classe `CacheProjections`.
+    """
+
+    def test_cle(self, tmp_path: Path) -> None:
+        """Test que la clé dépend des valeurs, de la méthode et des paramètres, pas de l'index.
+        """
+
+        cache = CacheProjections(dossier=str(tmp_path))
+        data = pd.DataFrame({'a': [1.0, 2.0, 3.0], 'b': [4, 5, 6]})
+        cle = cache.cle(data, 'tsne', 2)
+
+        assert cache.cle(data.set_index(pd.Index([7, 8, 9])), 'tsne', 2) == cle
+        assert cache.cle(data.assign(a=[1.0, 2.0, 3.5]), 'tsne', 2) != cle
+        assert cache.cle(data, 'umap', 2) != cle
+        assert cache.cle(data, 'tsne', 3) != cle
+        assert cache.cle(data, 'tsne', 2, {'perplexity': 5}) != cle
+
+    def test_eviction_lru(self, tmp_path: Path) -> None:
+        """Test la relecture en float32 et la suppression de la projection la moins récemment utilisée.
+        """
+
+        cache = CacheProjections(dossier=str(tmp_path))
+        for i in range(3):
+            cache.ecrire(f"cle_{i}", np.full((100, 2), i, dtype=np.float64))
+            # Dates de modification distinctes, même avec une horloge grossière.
+            time.sleep(0.02)
+        assert cache.lire("cle_0").dtype == np.float32
+        time.sleep(0.02)
+
+        # Limiter le cache à deux entrées après avoir réutilisé la première.
+        cache.taille_max_octets = 2 * cache.statistiques()['octets'] // 3
+        cache.ecrire("cle_3", np.zeros((100, 2)))
+
+        assert cache.statistiques()['fichiers'] == 2
+        assert cache.lire("cle_0") is not None
+        assert cache.lire("cle_1") is None
+
+    def test_ecritures_concurrentes(
+        self,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test que des fils qui écrivent la même projection ne partagent pas de fichier
+        temporaire, et qu'une projection évincée pendant sa lecture est une absence.
+        """
+
+        cache = CacheProjections(dossier=str(tmp_path))
+        with ThreadPoolExecutor(max_workers=8) as groupe:
+            list(groupe.map(lambda i: cache.ecrire("cle", np.full((10_000, 2), i)), range(32)))
+
+        assert cache.lire("cle").shape == (10_000, 2)
+        assert not list(tmp_path.glob("*.tmp"))
+
+        def evincer(chemin, *args, **kwargs) -> None:
+            raise FileNotFoundError(chemin)
+        monkeypatch.setattr(os, "utime", evincer)
+        assert cache.lire("cle") is None
+        assert cache.statistiques()['echecs'] == 1
+
+    def test_visualisation_relit_la_projection(
+        self,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test qu'une seconde vue graphique des mêmes colonnes ne refait pas la réduction.
+        """
+
+        appels = []
+        reduire = visualisation_2D.reduire_localement
+        monkeypatch.setattr(
+            visualisation_2D,
+            "reduire_localement",
+            lambda *args: appels.append(args[0]) or reduire(*args))
+
+        cache = CacheProjections(dossier=str(tmp_path / "projections"))
+        data = pd.read_csv(INSURANCE_CSV).select_dtypes(include=np.number)
+
+        for _ in range(2):
+            Visualisation2D(
+                df=data,
+                file_name="insurance",
+                graphic_vue_folder=str(tmp_path),
+                cache=cache).visualisation_2d_acp()
+
+        assert appels == ['acp']
+        assert cache.statistiques()['succes'] == 1
+        assert (tmp_path / "2D" / "insurance_ACP_2D.html").is_file()
+
+    def test_visualisation_parametres(
+        self,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test que des hyperparamètres différents donnent une autre clé et une nouvelle réduction.
+        """
+
+        appels = []
+        reduire = visualisation_2D.reduire_localement
+        monkeypatch.setattr(
+            visualisation_2D,
+            "reduire_localement",
+            lambda *args: appels.append(args[4]) or reduire(*args))
+
+        cache = CacheProjections(dossier=str(tmp_path / "projections"))
+        data = pd.read_csv(INSURANCE_CSV).select_dtypes(include=np.number).head(200)
+        vues = [
+            Visualisation2D(
+                df=data,
+                file_name="insurance",
+                graphic_vue_folder=str(tmp_path),
+                cache=cache,
+                parametres=parametres)
+            for parametres in (None, {'tsne': {'perplexity': 5}}, {'tsne': {'perplexity': 5}})]
+
+        cles = [cache.cle(data, 'tsne', 2, vue.parametres_de('tsne')) for vue in vues]
+        assert cles[0] != cles[1] == cles[2]
+
+        for vue in vues:
+            vue.visualisation_2d_tsne()
+        assert appels == [{}, {'perplexity': 5}]
+        assert cache.statistiques()['succes'] == 1
+
+    def test_visualisation_acp_hors_memoire(
+        self,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test qu'au-delà du seuil de lignes, l'ACP relit le fichier source par morceaux.
+        """
+
+        appels = []
+        reduire = visualisation_2D.reduire_localement
+        monkeypatch.setattr(
+            visualisation_2D,
+            "reduire_localement",
+            lambda *args: appels.append(args[1]) or reduire(*args))
+
+        data = pd.read_csv(INSURANCE_CSV).select_dtypes(include=np.number)
+        for lignes_flux in (len(data) + 1, len(data)):
+            Visualisation2D(
+                df=data,
+                file_name="insurance",
+                graphic_vue_folder=str(tmp_path),
+                source=str(INSURANCE_CSV),
+                lignes_flux=lignes_flux).visualisation_2d_acp()
+
+        assert isinstance(appels[0], pd.DataFrame)
+        assert appels[1] == str(INSURANCE_CSV)
+
+        # Un fichier qui ne contient pas les lignes chargées n'est pas mis en cache.
+        cache = CacheProjections(dossier=str(tmp_path / "projections"))
+        with pytest.raises(ValueError, match="lignes"):
+            Visualisation2D(
+                df=data.head(100),
+                file_name="insurance",
+                graphic_vue_folder=str(tmp_path),
+                cache=cache,
+                source=str(INSURANCE_CSV),
+                lignes_flux=1).visualisation_2d_acp()
+        assert cache.statistiques()['fichiers'] == 0
+
+    def test_visualisation_budget(
+        self,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test que le budget de la requête, restant après la sélection, atteint t-SNE.
+        """
+
+        appels = []
+        monkeypatch.setattr(
+            visualisation_2D,
+            "reduire_localement",
+            lambda *args: appels.append(args[4]) or (np.zeros((len(args[1]), 2)), None))
+        monkeypatch.setattr(
+            visualisation_2D.AutoSelector,
+            "selectionner",
+            lambda *args, **kwargs: ResultatSelection('tsne', 0.9, 5.0, {'max_points': 1_000}))
+
+        data = pd.read_csv(INSURANCE_CSV).select_dtypes(include=np.number)
+        for parametres in (None, {'tsne': {'max_points': 2_000}}):
+            Visualisation2D(
+                df=data,
+                file_name="insurance",
+                graphic_vue_folder=str(tmp_path),
+                budget_secondes=20,
+                parametres=parametres).visualisation_automatique()
+
+        # Les hyperparamètres demandés explicitement restent prioritaires.
+        assert appels == [{'max_points': 1_000}, {'max_points': 2_000}]
+
+    def test_visualisation_informations(self, tmp_path: Path) -> None:
+        """Test que les informations de l'ACP accompagnent la vue, même relue depuis le cache.
+        """
+
+        cache = CacheProjections(dossier=str(tmp_path / "projections"))
+        data = pd.read_csv(INSURANCE_CSV).select_dtypes(include=np.number)
+        vues = [
+            Visualisation2D(
+                df=data,
+                file_name="insurance",
+                graphic_vue_folder=str(tmp_path),
+                cache=cache)
+            for _ in range(2)]
+
+        for vue in vues:
+            assert vue.informations is None
+            vue.visualisation_2d_acp()
+
+        assert cache.statistiques()['succes'] == 1
+        assert vues[0].informations == vues[1].informations
+        assert set(vues[1].informations['contributions']['PC_2']) == set(data.columns)
+        # Les informations sont conservées à côté de la projection, pas recalculées.
+        assert len(list((tmp_path / "projections").glob("*.json"))) == 1
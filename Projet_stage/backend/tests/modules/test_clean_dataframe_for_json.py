@@ -1,6 +1,8 @@
 """Tester le module `Projet_stage/backend/modules/clean_dataframe_for_json.py`.
 """
 
+import numpy as np
+import pandas as pd
 from modules.clean_dataframe_for_json import CleanDataframeForJson
 from tests.modules.test_loading import TestDataLoader
 
@@ -17,3 +19,27 @@ class TestCleanDataframeForJson:
         data = chargeur_data.get_data()
         data_df_json = chargeur_dataframe_for_json.clean_dataframe_for_json(df=data)
         print(data_df_json.head())
+
+    def test_clean_dataframe_for_json_un_passage(self) -> None:
+        """Test que les infinis deviennent NaN sans changer les types ni l'original."""
+
+        data = pd.DataFrame({
+            "a": [1, 2, 3],
+            "b": [0.5, np.inf, np.nan],
+            "c": ["x", None, "z"]})
+        chargeur_dataframe_for_json = CleanDataframeForJson()
+
+        data_df_json = chargeur_dataframe_for_json.clean_dataframe_for_json(df=data)
+
+        assert (data_df_json.dtypes == data.dtypes).all()
+        assert data_df_json["b"].isna().tolist() == [False, True, True]
+        assert np.isinf(data["b"]).sum() == 1
+        assert chargeur_dataframe_for_json.valeurs_manquantes == {"b": 2, "c": 1}
+
+    def test_clean_dataframe_for_json_sans_copie(self) -> None:
+        """Test qu'un tableau sans valeurs infinies est retourné tel quel."""
+
+        data = pd.DataFrame({"a": [1.0, np.nan]})
+        chargeur_dataframe_for_json = CleanDataframeForJson()
+
+        assert chargeur_dataframe_for_json.clean_dataframe_for_json(df=data) is data
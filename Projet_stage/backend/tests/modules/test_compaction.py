@@ -0,0 +1,45 @@
+"""Test du module `Projet_stage/backend/modules/compaction.py`.
+"""
+
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from modules.compaction import CompactionDataFrame
+
+INSURANCE_CSV = Path(__file__).parents[1] / "data" / "csv" / "insurance.csv"
+
+class TestCompactionDataFrame:
+    """Test de la classe `CompactionDataFrame`.
+    """
+
+    def test_compacter_insurance(self) -> None:
+        """Test la compaction du fichier de test sans perte de valeurs.
+        """
+
+        data = pd.read_csv(INSURANCE_CSV)
+        chargeur = CompactionDataFrame()
+
+        compacte, rapport = chargeur.compacter(data)
+
+        assert compacte["age"].dtype == np.int8
+        assert isinstance(compacte["region"].dtype, pd.CategoricalDtype)
+        assert rapport['octets_apres'] < rapport['octets_avant']
+        pd.testing.assert_frame_equal(compacte, data, check_dtype=False, check_categorical=False)
+
+    def test_compacter_sans_perte(self) -> None:
+        """Test que les décimaux et les colonnes objet mixtes ne perdent pas d'information.
+        """
+
+        data = pd.DataFrame({
+            "exact": [0.5, np.nan, 2.25, 1.0],
+            "inexact": [0.1, 0.2, 0.3, 0.4],
+            "mixte": [1, "a", None, 2.5],
+            "texte": pd.Series(["a", "b", "c", None], dtype=object)})
+
+        compacte, _ = CompactionDataFrame().compacter(data)
+
+        assert compacte["exact"].dtype == np.float32
+        assert compacte["inexact"].dtype == np.float64
+        assert compacte["mixte"].dtype == object
+        assert pd.api.types.is_string_dtype(compacte["texte"].dtype)
+        assert data["texte"].dtype == object
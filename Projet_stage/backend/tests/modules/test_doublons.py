@@ -0,0 +1,96 @@
+"""Test du module `Projet_stage/backend/modules/doublons.py`.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+import pytest
+from modules import doublons
+from modules.doublons import DetecteurDoublons
+
+class TestDetecteurDoublons:
+    """Test de la classe `DetecteurDoublons`.
+    """
+
+    def get_data(self) -> pd.DataFrame:
+        """Petit tableau contenant deux lignes dupliquées et des valeurs manquantes.
+
+        Returns:
+            pd.DataFrame: Un tableau de cinq lignes.
+        """
+        return pd.DataFrame({
+            "a": [1.0, np.nan, 1.0, np.nan, 2.0],
+            "b": ["x", None, "x", None, "x"]})
+
+    def test_compter_et_masque(self) -> None:
+        """Test que le comptage et le masque correspondent à `duplicated`.
+        """
+
+        detecteur = DetecteurDoublons()
+        data = self.get_data()
+
+        assert detecteur.compter(data) == int(data.duplicated().sum()) == 2
+        assert detecteur.masque(data).tolist() == data.duplicated().tolist()
+
+    def test_cache_par_version(self) -> None:
+        """Test que les hachages d'une version ne sont calculés qu'une fois.
+        """
+
+        detecteur = DetecteurDoublons(taille_cache=1)
+        data = self.get_data()
+
+        premier = detecteur.hachages(data, version=1)
+
+        assert detecteur.hachages(data, version=1) is premier
+        detecteur.hachages(data, version=2)
+        assert detecteur.hachages(data, version=1) is not premier
+
+    def test_supprimer(self) -> None:
+        """Test la suppression des doublons avec et sans copie.
+        """
+
+        detecteur = DetecteurDoublons()
+        data = self.get_data()
+
+        copie = detecteur.supprimer(data)
+        assert len(copie) == 3 and len(data) == 5
+
+        assert detecteur.supprimer(data, inplace=True) is data
+        assert data.index.to_list() == [0, 1, 4]
+
+    def test_estimer(self) -> None:
+        """Test l'estimation approchée du nombre de doublons.
+        """
+
+        data = pd.DataFrame({"a": np.arange(200_000) % 50_000})
+
+        estimation = DetecteurDoublons().estimer(data)
+
+        assert abs(estimation - 150_000) / 150_000 < 0.02
+
+    def test_estimer_par_morceaux(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test que l'estimation par morceaux ne garde pas les hachages des lignes.
+        """
+
+        monkeypatch.setattr(doublons, "TAILLE_MORCEAU_ESTIMATION", 7_000)
+        data = pd.DataFrame({"a": np.arange(200_000) % 50_000})
+        detecteur = DetecteurDoublons()
+
+        estimation = detecteur.estimer(data, version="v1")
+
+        assert abs(estimation - 150_000) / 150_000 < 0.02
+        assert detecteur.estimer(data) == estimation
+        assert not detecteur._hachages # pylint: disable=protected-access
+
+    def test_versions_concurrentes(self) -> None:
+        """Test le cache partagé par des requêtes servies en parallèle.
+        """
+
+        detecteur = DetecteurDoublons(taille_cache=2)
+        data = pd.DataFrame({"a": np.arange(1_000) % 10})
+
+        with ThreadPoolExecutor(max_workers=8) as executeur:
+            comptes = list(executeur.map(lambda v: detecteur.compter(data, v % 5), range(200)))
+
+        assert comptes == [990] * 200
+        assert len(detecteur._hachages) <= 2 # pylint: disable=protected-access
@@ -0,0 +1,83 @@
+"""Test du module `Projet_stage/backend/modules/executeur_reduction.py`.
+"""
+
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from modules import executeur_reduction
+from modules.executeur_reduction import (
+    ExecuteurReduction,
+    coeurs_disponibles,
+    reduire_localement,
+    repartir_coeurs,
+    )
+
+INSURANCE_CSV = Path(__file__).parents[1] / "data" / "csv" / "insurance.csv"
+
+def arreter_processus() -> None:
+    """Arrête brutalement le processus de réduction (comme un manque de mémoire)."""
+    os._exit(1) # pylint: disable=protected-access
+
+class TestExecuteurReduction:
+    """Test de la classe `ExecuteurReduction`.
+    """
+
+    def test_reduire(self) -> None:
+        """Test des réductions faites dans le groupe de processus, identiques
+        à celles faites dans le processus courant pour l'ACP.
+        """
+
+        data = pd.read_csv(INSURANCE_CSV).select_dtypes(include=np.number)
+        executeur = ExecuteurReduction(processus_max=1, prechauffage=False)
+        try:
+            # Deux réductions soumises en même temps.
+            futur_acp = executeur.soumettre('acp', data, 2)
+            futur_tsne = executeur.soumettre('tsne', data.head(200), 3)
+
+            x_acp = futur_acp.result(timeout=300)
+            x_tsne = futur_tsne.result(timeout=300)
+
+            # Les informations de l'ACP reviennent du processus avec la projection.
+            x_informe, informations = executeur.reduire('acp', data, 2, informations=True)
+        finally:
+            executeur.arreter()
+
+        np.testing.assert_allclose(x_acp, reduire_localement('acp', data, 2), rtol=1e-4, atol=1e-5)
+        assert x_tsne.shape == (200, 3)
+        np.testing.assert_allclose(x_informe, x_acp)
+        assert set(informations['contributions']['PC_1']) == set(data.columns)
+        assert len(informations['variance_expliquee']) == 2
+
+    def test_groupe_recree(self) -> None:
+        """Test qu'une réduction arrêtée brutalement ne bloque pas les suivantes.
+        """
+
+        data = pd.DataFrame(
+            {"a": [1.0, 2.0, np.nan, 4.0], "b": [1, 0, 1, 0]}).astype({"b": "Int64"})
+        executeur = ExecuteurReduction(processus_max=1, prechauffage=False)
+        try:
+            with pytest.raises(BrokenProcessPool):
+                executeur.executer(arreter_processus).result(timeout=300)
+
+            x_acp = executeur.reduire('acp', data.fillna(0), 1)
+        finally:
+            executeur.arreter()
+
+        np.testing.assert_allclose(
+            x_acp, reduire_localement('acp', data.fillna(0), 1), rtol=1e-4, atol=1e-5)
+
+    def test_repartir_coeurs(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test que chaque processus d'un groupe ne compte que sa part des coeurs.
+        """
+
+        monkeypatch.setattr(executeur_reduction.os, "cpu_count", lambda: 8)
+        monkeypatch.setattr(executeur_reduction, "_coeurs", None)
+        assert coeurs_disponibles() == 8
+
+        repartir_coeurs(3)
+        assert coeurs_disponibles() == 2
+        assert ExecuteurReduction(processus_max=4, prechauffage=False).coeurs_par_processus() == 2
+        assert ExecuteurReduction(processus_max=16, prechauffage=False).coeurs_par_processus() == 1
@@ -0,0 +1,30 @@
+"""Test du module `Projet_stage/backend/modules/hyperloglog.py`.
+"""
+
+import numpy as np
+from modules.hyperloglog import HyperLogLog
+
+class TestHyperLogLog:
+    """Test de la classe `HyperLogLog`.
+    """
+
+    def test_estimer(self) -> None:
+        """Test l'estimation du nombre de valeurs distinctes.
+        """
+
+        estimateur = HyperLogLog()
+        estimateur.ajouter(np.arange(100_000) % 20_000)
+
+        assert abs(estimateur.estimer() - 20_000) / 20_000 < 0.05
+
+    def test_fusionner(self) -> None:
+        """Test que la fusion de deux estimateurs estime l'union des valeurs.
+        """
+
+        premier, second = HyperLogLog(), HyperLogLog()
+        premier.ajouter(np.arange(0, 10_000))
+        second.ajouter(np.arange(5_000, 15_000))
+
+        premier.fusionner(second)
+
+        assert abs(premier.estimer() - 15_000) / 15_000 < 0.05
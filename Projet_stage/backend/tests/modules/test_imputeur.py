@@ -0,0 +1,66 @@
+"""Test du module `Projet_stage/backend/modules/imputeur.py`.
+"""
+
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from modules.cache_donnees import CacheDonnees
+from modules.imputeur import Imputeur
+
+class TestImputeur:
+    """Test de la classe `Imputeur`.
+    """
+
+    def get_data(self) -> pd.DataFrame:
+        """Tableau de 1000 lignes avec des valeurs manquantes.
+
+        Returns:
+            pd.DataFrame: Une colonne numérique et une colonne texte.
+        """
+        rng = np.random.default_rng(0)
+        data = pd.DataFrame({"a": rng.normal(10, 3, 1000), "b": ["x"] * 1000})
+        data.loc[::5, "a"] = np.nan
+        return data
+
+    def test_partial_fit(self) -> None:
+        """Test que l'apprentissage par morceaux donne la moyenne de tout le tableau.
+        """
+
+        data = self.get_data()
+
+        imputeur = Imputeur().fit_flux([data.iloc[:300], data.iloc[300:]])
+        nouveau = imputeur.transform(pd.DataFrame({"a": [np.nan, 1.0], "b": [None, "y"]}))
+
+        assert imputeur.lignes == 1000
+        assert np.isclose(nouveau.loc[0, "a"], data["a"].mean())
+        assert nouveau["b"].isna().sum() == 1
+
+    def test_median_fusionner(self) -> None:
+        """Test la médiane approchée de deux imputeurs fusionnés.
+        """
+
+        data = self.get_data()
+        premier = Imputeur(strategy="median").fit(data.iloc[:500])
+        second = Imputeur(strategy="median").fit(data.iloc[500:])
+
+        premier.fusionner(second)
+
+        assert abs(premier.valeurs()["a"] - data["a"].median()) < 0.3
+
+    def test_sauvegarder_charger(self, tmp_path: Path) -> None:
+        """Test l'enregistrement de l'imputeur à côté du cache des données.
+        """
+
+        source = tmp_path / "data.csv"
+        self.get_data().to_csv(source, index=False)
+        cache = CacheDonnees(dossier=str(tmp_path / "cache"))
+        chemin = cache.chemin_annexe(str(source), "imputeur.json")
+
+        imputeur = Imputeur(strategy="median").fit(self.get_data())
+        imputeur.sauvegarder(str(chemin))
+        recharge = Imputeur.charger(str(chemin))
+
+        assert recharge.valeurs() == imputeur.valeurs()
+
+        cache.vider()
+        assert not chemin.exists()
@@ -0,0 +1,96 @@
+"""Test du module `Projet_stage/backend/modules/index_voisins.py`.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from sklearn.datasets import make_blobs
+from modules.index_voisins import (
+    IndexVoisins,
+    conservation_voisinage,
+    matrice_distances_tsne,
+    )
+from modules.methode_tsne import MethodeTSNE
+from modules.methode_umap import MethodeUMAP
+
+def donnees(n: int = 300) -> pd.DataFrame:
+    """Trois groupes de points bien séparés en 5 dimensions.
+    """
+    x, _ = make_blobs(n_samples=n, n_features=5, centers=3, random_state=0)
+    return pd.DataFrame(x, columns=[f"c{i}" for i in range(5)])
+
+class TestIndexVoisins:
+    """Test de la classe `IndexVoisins` et des fonctions du module.
+    """
+
+    def test_graphe_reutilise(self, tmp_path: Path) -> None:
+        """Test que le graphe est calculé une fois, puis relu pour un nombre de voisins différent.
+        """
+
+        index = IndexVoisins(dossier=str(tmp_path))
+        df = donnees()
+
+        indices, distances = index.graphe(df)
+        assert indices.shape == distances.shape == (300, 92)
+        assert indices.dtype == np.int32 and distances.dtype == np.float32
+        assert (indices[:, 0] == np.arange(300)).all()
+
+        # Le même graphe sert à UMAP (15 voisins) et aux données en matrice.
+        indices_umap, _ = index.graphe(df.to_numpy(), 15)
+        assert indices_umap.shape == (300, 16)
+        assert (indices_umap == indices[:, :16]).all()
+        assert index.statistiques()['fichiers'] == 1
+        assert (index.succes, index.echecs) == (1, 1)
+
+    def test_ecritures_concurrentes(self, tmp_path: Path) -> None:
+        """Test que des fils qui écrivent le même graphe ne partagent pas de fichier temporaire.
+        """
+
+        index = IndexVoisins(dossier=str(tmp_path))
+        graphe = (np.zeros((5_000, 16), dtype=np.int32), np.zeros((5_000, 16), dtype=np.float32))
+        with ThreadPoolExecutor(max_workers=8) as groupe:
+            list(groupe.map(lambda _: index.ecrire("cle", graphe), range(32)))
+
+        assert index.lire("cle")[0].shape == (5_000, 16)
+        assert not list(tmp_path.glob("*.tmp"))
+
+    def test_matrice_distances_tsne(self, tmp_path: Path) -> None:
+        """Test la matrice creuse des distances au carré, le point lui-même compris.
+        """
+
+        indices, distances = IndexVoisins(dossier=str(tmp_path)).graphe(donnees(), 30)
+        matrice = matrice_distances_tsne(indices, distances, 30)
+
+        assert matrice.shape == (300, 300)
+        assert (np.diff(matrice.indptr) == 31).all()
+        assert (matrice.diagonal() == 0).all()
+        assert np.allclose(matrice[0, indices[0, 1]], distances[0, 1] ** 2)
+
+    def test_conservation_voisinage(self, tmp_path: Path) -> None:
+        """Test que le voisinage est conservé par l'identité, pas par une projection aléatoire.
+        """
+
+        df = donnees()
+        indices, _ = IndexVoisins(dossier=str(tmp_path)).graphe(df)
+
+        assert conservation_voisinage(indices, df.to_numpy()) == 1.0
+        aleatoire = np.random.default_rng(0).normal(size=(300, 2))
+        assert conservation_voisinage(indices, aleatoire) < 0.2
+
+    def test_reductions_avec_index(self, tmp_path: Path) -> None:
+        """Test t-SNE et UMAP sur le graphe partagé : une seule recherche des voisins,
+        et des groupes toujours séparés.
+        """
+
+        index = IndexVoisins(dossier=str(tmp_path))
+        df = donnees()
+        indices, _ = index.graphe(df)
+
+        x_tsne = MethodeTSNE(df, index=index).tsne_reduction(nombre_de_dimension=2)
+        x_umap = MethodeUMAP(df, index=index).umap_reduction(nombre_de_dimension=2)
+
+        assert x_tsne.shape == x_umap.shape == (300, 2)
+        assert index.echecs == 1
+        assert conservation_voisinage(indices, x_tsne) > 0.5
+        assert conservation_voisinage(indices, x_umap) > 0.5
@@ -3,11 +3,16 @@
 
 # test de tests/modules/test_loading.py
 from typing import Union
+from pathlib import Path
 # from tests import __FILE_PATH_TEST__
 import pandas as pd
 import numpy as np
+import pytest
 from modules.loading import DataLoader
 
+# Chemin du fichier de test relatif à ce fichier.
+INSURANCE_CSV = Path(__file__).parents[1] / "data" / "csv" / "insurance.csv"
+
 class TestDataLoader:
     """
     Test la classe `DataLoader` du module Projet_stage/backend/modules.loding.py.
@@ -54,3 +59,110 @@ class TestDataLoader:
         df = chargeur.load(file_path=__file_absolut_path__)
 
         return df
+
+
+class TestDataLoaderStreaming:
+    """
+    Test le mode de chargement par morceaux de la classe `DataLoader`.
+    """
+
+    def test_detecter_delimiteur(self, tmp_path: Path) -> None:
+        """Test la détection du délimiteur sur un échantillon de tête."""
+
+        fichier = tmp_path / "data.csv"
+        fichier.write_text("col1;col2\n1;2\n3;4\n", encoding="utf-8")
+
+        chargeur = DataLoader()
+
+        assert chargeur.detecter_delimiteur(str(fichier)) == ";"
+
+    def test_load_streaming(self) -> None:
+        """Test que le chargement par morceaux donne le même tableau
+        que le chargement complet."""
+
+        chargeur = DataLoader(taille_morceau=100)
+
+        data = chargeur.load(file_path=str(INSURANCE_CSV), streaming=True)
+        attendu = pd.read_csv(INSURANCE_CSV)
+
+        pd.testing.assert_frame_equal(data, attendu)
+
+    def test_iterer_morceaux_csv(self, tmp_path: Path) -> None:
+        """Test la taille des morceaux et le remplacement des valeurs infinies."""
+
+        fichier = tmp_path / "data.csv"
+        fichier.write_text("a,b\n1.5,x\ninf,y\n-inf,z\n", encoding="utf-8")
+
+        chargeur = DataLoader(taille_morceau=2)
+
+        morceaux = list(chargeur.iterer_morceaux_csv(str(fichier)))
+
+        assert [len(m) for m in morceaux] == [2, 1]
+        assert morceaux[0]["a"].isna().sum() == 1
+        assert morceaux[1]["a"].isna().all()
+
+    def test_iterer_morceaux_colonnes(self, tmp_path: Path) -> None:
+        """Test que seules les colonnes demandées sont lues, dans l'ordre demandé."""
+
+        fichier = tmp_path / "data.csv"
+        fichier.write_text("a,b,c\n1,x,2\n3,y,4\n", encoding="utf-8")
+
+        chargeur = DataLoader(taille_morceau=10)
+
+        assert list(next(chargeur.iterer_morceaux_csv(str(fichier), colonnes=["c", "a"]))) == [
+            "a", "c"]
+        assert list(next(chargeur.iterer_morceaux(str(fichier), colonnes=["c", "a"]))) == [
+            "c", "a"]
+
+    def test_iterer_morceaux_arrow(self, tmp_path: Path) -> None:
+        """Test la lecture par tranches d'un fichier Arrow IPC (stockage partagé)."""
+
+        pa = pytest.importorskip("pyarrow")
+        fichier = tmp_path / "data.arrow"
+        table = pa.table({"a": [1.0, 2.0, 3.0], "b": ["x", "y", "z"]})
+        with pa.OSFile(str(fichier), "wb") as sortie:
+            with pa.ipc.new_file(sortie, table.schema) as ecrivain:
+                ecrivain.write_table(table)
+
+        chargeur = DataLoader(taille_morceau=2)
+        morceaux = list(chargeur.iterer_morceaux(str(fichier), colonnes=["a"]))
+
+        assert [len(m) for m in morceaux] == [2, 1]
+        assert list(morceaux[0]) == ["a"]
+        assert morceaux[1]["a"].iloc[0] == 3.0
+
+    def test_types_par_morceaux(self, tmp_path: Path) -> None:
+        """Test que l'assemblage donne les types d'une lecture d'un seul tenant,
+        quand le type d'une colonne change après le premier morceau."""
+
+        fichier = tmp_path / "data.csv"
+        fichier.write_text("a,b,c,d\n1,1,True,1\n2,2,False,2\n,x,1.5,3\n4,4,True,4\n", encoding="utf-8")
+
+        data = DataLoader(taille_morceau=2).load_csv_par_morceaux(str(fichier))
+        attendu = pd.read_csv(fichier)
+
+        assert data["a"].dtype == np.float64
+        assert data["d"].dtype == np.int64
+        assert data["b"].tolist() == ["1", "2", "x", "4"]
+        pd.testing.assert_frame_equal(data, attendu)
+
+    def test_memoire_max(self) -> None:
+        """Test que le dépassement du plafond mémoire lève une erreur."""
+
+        chargeur = DataLoader(taille_morceau=100, memoire_max=1_000)
+
+        with pytest.raises(MemoryError):
+            chargeur.load_csv_par_morceaux(str(INSURANCE_CSV))
+
+    def test_memoire_max_assemblage(self) -> None:
+        """Test que le plafond compte la copie faite par l'assemblage des morceaux."""
+
+        total = int(sum(
+            morceau.memory_usage(deep=True).sum()
+            for morceau in DataLoader(taille_morceau=100).iterer_morceaux_csv(str(INSURANCE_CSV))))
+
+        with pytest.raises(MemoryError):
+            DataLoader(taille_morceau=100, memoire_max=total * 3 // 2).load_csv_par_morceaux(
+                str(INSURANCE_CSV))
+        assert len(DataLoader(taille_morceau=100, memoire_max=2 * total).load_csv_par_morceaux(
+            str(INSURANCE_CSV))) == 1338
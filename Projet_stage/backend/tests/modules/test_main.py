@@ -0,0 +1,100 @@
+"""Test du module `Projet_stage/backend/main.py`.
+"""
+
+from pathlib import Path
+import subprocess
+import sys
+from fastapi.testclient import TestClient
+
+# Temps d'importation maximal de l'API (environ 0,7 seconde mesurée), en secondes.
+BUDGET_IMPORTATION = 2.5
+# Bibliothèques qui ne doivent être importées qu'à la première réduction ou vue graphique.
+MODULES_DIFFERES = (
+    'sklearn',
+    'scipy',
+    'umap',
+    'numba',
+    'pynndescent',
+    'plotly.express',
+    'matplotlib',
+    'cv2',
+    )
+
+class TestDemarrage:
+    """Test du démarrage de l'API.
+    """
+
+    def test_temps_importation(self) -> None:
+        """Test que l'importation de `main` reste dans le budget, mesurée
+        comme `python -X importtime`, sans charger les bibliothèques de calcul.
+        """
+
+        code = (
+            "import sys, main; "
+            f"print(' '.join(m for m in {MODULES_DIFFERES!r} if m in sys.modules))")
+        resultat = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            cwd=Path(__file__).parents[2],
+            capture_output=True,
+            text=True,
+            check=False)
+        assert resultat.returncode == 0, resultat.stderr[-2000:]
+
+        # Lignes « import time: <propre> | <cumulé> | <module> », en microsecondes.
+        cumules = {
+            colonnes[2].strip(): int(colonnes[1])
+            for colonnes in (
+                ligne.split(":", 1)[1].split("|")
+                for ligne in resultat.stderr.splitlines()
+                if ligne.startswith("import time:") and "|" in ligne)
+            if colonnes[1].strip().isdigit()}
+
+        assert resultat.stdout.split() == []
+        assert cumules['main'] / 1e6 < BUDGET_IMPORTATION
+
+class TestJeuxDeDonnees:
+    """Test des identifiants des jeux de données chargés par l'API.
+    """
+
+    def test_identifiant_genere(self, tmp_path: Path) -> None:
+        """Test que deux chargements sans entête créent deux jeux distincts,
+        et qu'une lecture sans entête est refusée.
+        """
+
+        import main # pylint: disable=import-outside-toplevel
+
+        client = TestClient(main.app)
+        autre = tmp_path / "autre.csv"
+        autre.write_text("x,y\n1,2\n3,4\n", encoding="utf-8")
+        identifiants = []
+        for fichier in (Path(__file__).parents[1] / "data" / "csv" / "insurance.csv", autre):
+            reponse = client.post("/v_01/data/", json={'file_path': str(fichier)})
+            assert reponse.status_code == 201
+            identifiants.append(reponse.headers["X-Dataset-Id"])
+
+        assert identifiants[0] != identifiants[1]
+        premier = client.get("/v_01/data/", headers={"X-Dataset-Id": identifiants[0]})
+        second = client.get("/v_01/data/", headers={"X-Dataset-Id": identifiants[1]})
+        assert "charges" in premier.json()[0]
+        assert second.json() == [{"x": 1, "y": 2}, {"x": 3, "y": 4}]
+        assert client.get("/v_01/data/").status_code == 422
+        for identifiant in identifiants:
+            client.delete("/v_01/data/", headers={"X-Dataset-Id": identifiant})
+
+    def test_memoire_max(self, tmp_path: Path) -> None:
+        """Test qu'un chargement par morceaux au-delà du plafond de la requête est refusé.
+        """
+
+        import main # pylint: disable=import-outside-toplevel
+
+        client = TestClient(main.app)
+        fichier = tmp_path / "donnees.csv"
+        fichier.write_text("x,y\n" + "1,2\n" * 1_000, encoding="utf-8")
+
+        reponse = client.post(
+            "/v_01/data/",
+            json={'file_path': str(fichier), 'streaming': True, 'memoire_max': 1_000})
+        assert reponse.status_code == 413
+        assert client.post(
+            "/v_01/data/",
+            json={'file_path': str(fichier), 'memoire_max': 0}).status_code == 422
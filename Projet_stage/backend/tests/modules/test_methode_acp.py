@@ -3,9 +3,15 @@
 
 # Contenue de tests/test_methode_acp.py
 
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import pytest
 from modules.methode_acp import MethodeACP
 from tests.modules.test_numeric_data import TestNumericData
 
+INSURANCE_CSV = Path(__file__).parents[1] / "data" / "csv" / "insurance.csv"
+
 class TestMethodePCA:
     """Test de la classe `MethodeACP`.
     """
@@ -24,3 +30,63 @@ class TestMethodePCA:
 
         assert x_acp is not None
         # assert not x_acp.empty
+
+    def test_acp_informations(self) -> None:
+        """Test des coordonnées retournées et des informations de l'ACP.
+        """
+
+        data = pd.read_csv(INSURANCE_CSV).select_dtypes(include=np.number)
+        chargeur = MethodeACP(data)
+
+        x_acp = chargeur.acp_reduction(nombre_dimenssion=3)
+
+        # Les coordonnées sur les composantes, pas la reconstruction des données.
+        assert x_acp.shape == (len(data), 3)
+
+        informations = chargeur.informations()
+        assert len(informations['variance_expliquee']) == 3
+        assert sum(informations['variance_expliquee']) <= 1.0 + 1e-6
+        assert set(informations['contributions']['PC_1']) == set(data.columns)
+
+    def test_acp_hors_memoire(self, tmp_path: Path) -> None:
+        """Test de l'ACP calculée par morceaux depuis un fichier CSV ou Parquet,
+        comparée à l'ACP en mémoire.
+        """
+
+        data = pd.read_csv(INSURANCE_CSV)
+        numeriques = data.select_dtypes(include=np.number)
+        acp_memoire = MethodeACP(numeriques)
+        x_memoire = acp_memoire.acp_reduction(nombre_dimenssion=2)
+
+        data.to_parquet(tmp_path / "insurance.parquet", row_group_size=100)
+        for fichier in (str(INSURANCE_CSV), str(tmp_path / "insurance.parquet")):
+            chargeur = MethodeACP(
+                fichier,
+                taille_morceau=200,
+                chemin_sortie=str(tmp_path / "acp.f32"))
+
+            x_flux = chargeur.acp_reduction(nombre_dimenssion=2)
+
+            assert isinstance(x_flux, np.memmap)
+            assert x_flux.shape == (len(data), 2)
+            assert chargeur.colonnes == numeriques.columns.to_list()
+            # L'ACP incrémentale est approchée : la première composante (définie au
+            # signe près) et la variance expliquée restent proches de l'ACP exacte.
+            assert abs(np.corrcoef(x_flux[:, 0], x_memoire[:, 0])[0, 1]) > 0.99
+            np.testing.assert_allclose(
+                chargeur.variance_expliquee, acp_memoire.variance_expliquee, atol=0.01)
+
+        # Les valeurs infinies sont traitées comme des valeurs manquantes.
+        fichier = tmp_path / "infinis.csv"
+        fichier.write_text("a,b\n1,2\ninf,3\n2,-inf\n4,1\n", encoding="utf-8")
+        x_flux = MethodeACP(str(fichier), taille_morceau=2).acp_reduction(2)
+        assert np.isfinite(x_flux).all()
+
+        # Aucun morceau assez long pour ajuster l'ACP incrémentale.
+        with pytest.raises(ValueError, match="au moins 2 lignes"):
+            MethodeACP(str(fichier), taille_morceau=1).acp_reduction(2)
+
+        # Sans fichier de sortie demandé, les coordonnées restent en mémoire.
+        x_flux = MethodeACP(str(INSURANCE_CSV), taille_morceau=200).acp_reduction(2)
+        assert not isinstance(x_flux, np.memmap)
+        assert x_flux.shape == (len(data), 2)
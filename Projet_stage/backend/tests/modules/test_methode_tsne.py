@@ -1,6 +1,8 @@
 """Test du module `Projet_stage/backend/modules/methode_tsne.py`.
 """
 
+import numpy as np
+from sklearn.datasets import make_blobs
 from modules.methode_tsne import MethodeTSNE
 from tests.modules.test_numeric_data import TestNumericData
 
@@ -21,3 +23,31 @@ class TestMethodeTSNE:
         x_tsne = chargeur_tsne.tsne_reduction(nombre_de_dimension=2)
 
         assert x_tsne is not None
+
+    def test_tsne_reperes(self) -> None:
+        """Test du mode par repères : seuls les repères sont réduits avec t-SNE,
+        les autres points sont interpolés près de leurs voisins.
+        """
+
+        data, groupes = make_blobs(n_samples=5000, n_features=5, centers=3, random_state=0)
+        chargeur_tsne = MethodeTSNE(data, max_points=400)
+
+        x_tsne = chargeur_tsne.tsne_reduction(nombre_de_dimension=2)
+
+        assert x_tsne.shape == (5000, 2)
+        assert 300 <= len(chargeur_tsne.reperes) <= 500
+        # Chaque groupe d'origine reste plus proche de son centre que des autres.
+        centres = np.array([x_tsne[groupes == g].mean(axis=0) for g in range(3)])
+        plus_proche = np.argmin(
+            np.linalg.norm(x_tsne[:, None, :] - centres[None, :, :], axis=2), axis=1)
+        assert (plus_proche == groupes).mean() > 0.95
+
+    def test_nombre_de_reperes(self) -> None:
+        """Test que le nombre de repères croît avec le budget de temps, sans dépasser les données.
+        """
+
+        assert MethodeTSNE(np.zeros((500, 2))).nombre_de_reperes(500) == 500
+        assert (
+            MethodeTSNE(np.zeros((1, 2)), budget_secondes=10).nombre_de_reperes(10**6)
+            < MethodeTSNE(np.zeros((1, 2)), budget_secondes=60).nombre_de_reperes(10**6)
+            < 10**6)
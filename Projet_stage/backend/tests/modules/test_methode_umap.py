@@ -1,6 +1,9 @@
 """Test du module `Projet_stage/backend/modules/methode_umap.py`.
 """
 
+from pathlib import Path
+import subprocess
+import sys
 from tests.modules.test_numeric_data import TestNumericData
 from modules.methode_umap import MethodeUMAP
 
@@ -20,3 +23,16 @@ class TestMethodeUMAP:
         xumap = chargeur_umap.umap_reduction(nombre_de_dimension=2)
 
         assert xumap is not None
+
+    def test_import_differe(self) -> None:
+        """Test que `umap` (et numba) n'est importé qu'à la première réduction.
+        """
+
+        code = "import sys, modules.methode_umap; assert 'umap' not in sys.modules"
+        resultat = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=Path(__file__).parents[2],
+            capture_output=True,
+            check=False)
+
+        assert resultat.returncode == 0, resultat.stderr.decode()
@@ -4,6 +4,9 @@
 # Contenu tests/modules/test_netoyage.py
 
 from tests.modules.test_loading import TestDataLoader
+import pandas as pd
+from modules.compaction import CompactionDataFrame
+from modules.imputeur import Imputeur
 from modules.nettoyage import Nettoyage
 
 class TestNettoyage:
@@ -40,3 +43,68 @@ class TestNettoyage:
 
         assert data_netoyer is not None
         assert not data_netoyer.empty
+
+    def test_gerer_les_valeurs_duplicates_inplace(self) -> None:
+        """Test la suppression des doublons sur place avec un index répété.
+        """
+
+        data = pd.DataFrame({"a": [1, 1, 2, 1], "b": ["x", "x", "y", "z"]}, index=[0, 0, 1, 2])
+
+        resultat = Nettoyage(data, version=1).gerer_les_valeurs_duplicates(inplace=True)
+
+        assert resultat is data
+        assert data["a"].to_list() == [1, 2, 1]
+        assert data.index.to_list() == [0, 1, 2]
+
+    def test_gerer_les_valeurs_manquantes_vectorise(self) -> None:
+        """Test le remplissage par la moyenne et la médiane de toutes les colonnes.
+        """
+
+        data = pd.DataFrame({
+            "a": [1.0, None, 5.0, 6.0],
+            "b": [None, 2.0, 4.0, 9.0],
+            "c": ["x", None, "y", "z"]})
+
+        moyenne = Nettoyage(data).gerer_les_valeurs_manquantes(strategy="mean")
+        mediane = Nettoyage(data).gerer_les_valeurs_manquantes(strategy="median")
+
+        assert moyenne["a"].to_list() == [1.0, 4.0, 5.0, 6.0]
+        assert mediane["b"].to_list() == [4.0, 2.0, 4.0, 9.0]
+        assert moyenne["c"].isna().sum() == 1
+        assert data.isna().sum().sum() == 3
+
+    def test_gerer_les_valeurs_manquantes_inplace(self) -> None:
+        """Test le remplissage sur place, sans copie du tableau.
+        """
+
+        data = pd.DataFrame({"a": [1, None, 3], "b": [None, 0.5, 0.5]})
+
+        resultat = Nettoyage(data).gerer_les_valeurs_manquantes(strategy="fill", inplace=True)
+
+        assert resultat is data
+        assert data.isna().sum().sum() == 0
+        assert data["a"].to_list() == [1.0, 0.0, 3.0]
+
+    def test_gerer_les_valeurs_manquantes_categories(self) -> None:
+        """Test le remplissage d'une colonne texte compactée en `category`.
+        """
+
+        data = pd.DataFrame({"c": ["x", None, "y", "x", "x", "y"]})
+        compacte, _ = CompactionDataFrame().compacter(data)
+
+        resultat = Nettoyage(compacte).gerer_les_valeurs_manquantes(strategy="fill", column=["c"])
+
+        assert resultat["c"].to_list() == ["x", 0, "y", "x", "x", "y"]
+        assert compacte["c"].isna().sum() == 1
+        assert 0 not in compacte["c"].cat.categories
+
+    def test_gerer_les_valeurs_manquantes_imputeur(self) -> None:
+        """Test le remplissage avec les valeurs d'un imputeur déjà appris.
+        """
+
+        imputeur = Imputeur().fit(pd.DataFrame({"a": [2.0, 4.0]}))
+        data = pd.DataFrame({"a": [None, 10.0]})
+
+        resultat = Nettoyage(data, imputeur=imputeur).gerer_les_valeurs_manquantes()
+
+        assert resultat["a"].to_list() == [3.0, 10.0]
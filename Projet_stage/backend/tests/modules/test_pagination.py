@@ -0,0 +1,55 @@
+"""Test du module `Projet_stage/backend/modules/pagination.py`.
+"""
+
+import pandas as pd
+from modules.pagination import (
+    Pagination,
+    PaginationSlot,
+    )
+
+class TestPagination:
+    """Test de la classe `Pagination`.
+    """
+
+    def get_data(self) -> pd.DataFrame:
+        """Petit tableau de données pour les tests de pagination.
+
+        Returns:
+            pd.DataFrame: Un tableau de cinq lignes et trois colonnes.
+        """
+        return pd.DataFrame({
+            "a": [5, 3, 1, 4, 2],
+            "b": ["e", "c", "a", "d", "b"],
+            "c": [0.5, 0.3, 0.1, 0.4, 0.2]})
+
+    def test_decouper_fenetre(self) -> None:
+        """Test le découpage par `offset` et `limit` avec projection de colonnes.
+        """
+
+        parametres = PaginationSlot(offset=1, limit=2, columns=["b", "a"])
+
+        page = Pagination(parametres=parametres).decouper(self.get_data())
+
+        assert list(page.columns) == ["b", "a"]
+        assert page["a"].tolist() == [3, 1]
+
+    def test_decouper_avec_tri(self) -> None:
+        """Test le découpage après tri décroissant d'une colonne.
+        """
+
+        parametres = PaginationSlot(offset=0, limit=3, sort_by="a", ascending=False)
+
+        page = Pagination(parametres=parametres).decouper(self.get_data())
+
+        assert page["a"].tolist() == [5, 4, 3]
+        assert page["b"].tolist() == ["e", "d", "c"]
+
+    def test_colonnes_inconnues(self) -> None:
+        """Test la détection des colonnes absentes du tableau.
+        """
+
+        parametres = PaginationSlot(columns=["a", "z"], sort_by="y")
+
+        inconnues = Pagination(parametres=parametres).colonnes_inconnues(self.get_data())
+
+        assert inconnues == ["z", "y"]
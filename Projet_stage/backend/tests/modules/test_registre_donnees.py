@@ -0,0 +1,119 @@
+"""Test du module `Projet_stage/backend/modules/registre_donnees.py`.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import threading
+import pandas as pd
+from modules.registre_donnees import RegistreDonnees
+from modules.stockage_partage import StockagePartage
+
+class TestRegistreDonnees:
+    """Test de la classe `RegistreDonnees`.
+    """
+
+    def get_data(self, valeur: int) -> pd.DataFrame:
+        """Tableau de 1000 lignes rempli d'une même valeur.
+
+        Returns:
+            pd.DataFrame: Un tableau d'une colonne entière.
+        """
+        return pd.DataFrame({"a": [valeur] * 1000})
+
+    def test_jeux_independants(self) -> None:
+        """Test que deux jeux de données ne s'écrasent pas et ont des versions distinctes.
+        """
+
+        registre = RegistreDonnees()
+
+        premier = registre.ajouter("premier", self.get_data(1))
+        second = registre.ajouter("second", self.get_data(2))
+
+        assert registre.obtenir("premier").df["a"].iloc[0] == 1
+        assert registre.obtenir("second").df["a"].iloc[0] == 2
+        assert premier.version != second.version
+        assert registre.ajouter("premier", self.get_data(3)).version != premier.version
+        assert registre.supprimer("premier")
+        assert registre.obtenir("premier") is None
+
+    def test_debordement(self, tmp_path: Path) -> None:
+        """Test que le jeu le moins récemment utilisé est déchargé puis rechargé.
+        """
+
+        registre = RegistreDonnees(budget_octets=10_000, dossier_debordement=str(tmp_path))
+
+        registre.ajouter("premier", self.get_data(1))
+        registre.ajouter("second", self.get_data(2))
+
+        assert registre.statistiques()['decharges'] == ["premier"]
+        assert len(list(tmp_path.glob("*.parquet"))) == 1
+        # La copie déchargée peut être relue par morceaux ; un jeu en mémoire n'a pas de fichier.
+        assert registre.fichier(registre.obtenir("premier", charger=False)).suffix == ".parquet"
+        assert registre.fichier(registre.obtenir("second")) is None
+
+        assert registre.obtenir("premier").df["a"].iloc[0] == 1
+        assert registre.statistiques()['decharges'] == ["second"]
+
+    def test_eviction_sans_debordement(self) -> None:
+        """Test qu'un jeu évincé sans dossier de débordement est supprimé.
+        """
+
+        registre = RegistreDonnees(budget_octets=10_000)
+
+        registre.ajouter("premier", self.get_data(1))
+        registre.ajouter("second", self.get_data(2))
+
+        assert registre.obtenir("premier") is None
+        assert registre.obtenir("second") is not None
+
+    def test_stockage_partage(self, tmp_path: Path) -> None:
+        """Test que deux registres (deux workers) partagent les mêmes jeux de données.
+        """
+
+        premier = RegistreDonnees(stockage=StockagePartage(dossier=str(tmp_path)))
+        second = RegistreDonnees(stockage=StockagePartage(dossier=str(tmp_path)))
+
+        jeu = premier.ajouter("commun", self.get_data(1), file_path=Path("a.csv"))
+        premier.definir_dossier("commun", tmp_path)
+        vu = second.obtenir("commun")
+
+        assert vu.version == jeu.version
+        assert vu.df["a"].iloc[0] == 1
+        assert vu.folder_path == tmp_path
+        assert second.fichier(vu) == tmp_path / "commun" / f"{jeu.version}.arrow"
+
+        second.ajouter("commun", self.get_data(2))
+        assert premier.obtenir("commun").df["a"].iloc[0] == 2
+        assert len(list((tmp_path / "commun").glob("*.arrow"))) == 1
+
+        assert second.supprimer("commun")
+        assert premier.obtenir("commun") is None
+        assert not (tmp_path / "commun").exists()
+
+    def test_publication_hors_verrou(self, tmp_path: Path) -> None:
+        """Test que l'écriture d'un jeu partagé ne bloque pas les lectures, et que des
+        publications concurrentes ne partagent pas de fichier temporaire.
+        """
+
+        stockage = StockagePartage(dossier=str(tmp_path))
+        registre = RegistreDonnees(stockage=stockage)
+        registre.ajouter("lu", self.get_data(1))
+
+        publier = stockage.publier
+        lectures = []
+
+        def publier_en_lisant(*args, **kwargs) -> dict:
+            lecteur = threading.Thread(target=lambda: lectures.append(registre.obtenir("lu")))
+            lecteur.start()
+            lecteur.join(timeout=10)
+            return publier(*args, **kwargs)
+
+        stockage.publier = publier_en_lisant
+        registre.ajouter("ecrit", self.get_data(2))
+        assert lectures[0].df["a"].iloc[0] == 1
+
+        stockage.publier = publier
+        with ThreadPoolExecutor(max_workers=4) as groupe:
+            list(groupe.map(lambda i: registre.ajouter("ecrit", self.get_data(i)), range(8)))
+        assert registre.obtenir("ecrit").df["a"].iloc[0] in range(8)
+        assert not list((tmp_path / "ecrit").glob("*.tmp"))
@@ -0,0 +1,121 @@
+"""Test du module `Projet_stage/backend/modules/serialisation_dataframe.py`.
+"""
+
+import json
+import tracemalloc
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from modules.serialisation_dataframe import SerialisationDataFrame
+
+class TestSerialisationDataFrame:
+    """Test de la classe `SerialisationDataFrame`.
+    """
+
+    def get_data(self) -> pd.DataFrame:
+        """Petit tableau de données contenant des valeurs manquantes et infinies.
+
+        Returns:
+            pd.DataFrame: Un tableau de trois lignes.
+        """
+        return pd.DataFrame({
+            "a": [1, 2, 3],
+            "b": [0.5, np.nan, np.inf],
+            "c": ["x", None, "z"]})
+
+    def test_vers_enregistrements(self) -> None:
+        """Test la conversion en enregistrements avec `None` pour NaN et inf.
+        """
+
+        chargeur = SerialisationDataFrame()
+
+        assert chargeur.vers_enregistrements(self.get_data()) == [
+            {"a": 1, "b": 0.5, "c": "x"},
+            {"a": 2, "b": None, "c": None},
+            {"a": 3, "b": None, "c": "z"}]
+
+    def test_vers_json(self) -> None:
+        """Test l'encodage JSON colonne par colonne avec `null` pour NaN et inf.
+        """
+
+        chargeur = SerialisationDataFrame()
+
+        assert json.loads(chargeur.vers_json(self.get_data())) == [
+            {"a": 1, "b": 0.5, "c": "x"},
+            {"a": 2, "b": None, "c": None},
+            {"a": 3, "b": None, "c": "z"}]
+
+    def test_iterer_ndjson(self) -> None:
+        """Test la sérialisation NDJSON par lots de lignes.
+        """
+
+        chargeur = SerialisationDataFrame(taille_lot=2)
+
+        lots = list(chargeur.iterer_ndjson(self.get_data()))
+        lignes = [json.loads(ligne) for lot in lots for ligne in lot.splitlines()]
+
+        assert len(lots) == 2
+        assert lignes == [
+            {"a": 1, "b": 0.5, "c": "x"},
+            {"a": 2, "b": None, "c": None},
+            {"a": 3, "b": None, "c": "z"}]
+
+    def test_dates_et_durees(self) -> None:
+        """Test que les dates restent des textes ISO 8601 et les durées des secondes,
+        comme avec `jsonable_encoder`, avec `null` pour les valeurs manquantes.
+        """
+
+        chargeur = SerialisationDataFrame()
+        data = pd.DataFrame({
+            "d": pd.to_datetime([
+                "2024-01-02", None, "2024-01-02 00:00:00.000000001"], format="ISO8601"),
+            "z": pd.to_datetime(["2024-01-02", "2024-01-03", None]).tz_localize("UTC"),
+            "t": pd.to_timedelta(["1 days 2s", None, "500ms"])})
+        attendu = [
+            {"d": "2024-01-02T00:00:00", "z": "2024-01-02T00:00:00+00:00", "t": 86402.0},
+            {"d": None, "z": "2024-01-03T00:00:00+00:00", "t": None},
+            {"d": "2024-01-02T00:00:00.000000001", "z": None, "t": 0.5}]
+
+        assert json.loads(chargeur.vers_json(data)) == attendu
+        lignes = b"".join(chargeur.iterer_ndjson(data)).splitlines()
+        assert [json.loads(ligne) for ligne in lignes] == attendu
+
+    def test_iterer_ndjson_vide(self) -> None:
+        """Test qu'un tableau vide ne produit aucun lot.
+        """
+
+        chargeur = SerialisationDataFrame()
+
+        assert not list(chargeur.iterer_ndjson(self.get_data().iloc[0:0]))
+
+    def test_iterer_ndjson_memoire(self) -> None:
+        """Test que le premier lot ne convertit pas toute la colonne de textes.
+        """
+
+        chargeur = SerialisationDataFrame(taille_lot=100)
+        data = pd.DataFrame({"c": [f"valeur_{i}" for i in range(200_000)]})
+
+        tracemalloc.start()
+        try:
+            premier = next(chargeur.iterer_ndjson(data))
+            _, pic = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        assert len(premier.splitlines()) == 100
+        # Une copie objet de la colonne entière occuperait plusieurs Mio.
+        assert pic < 1024 ** 2
+
+    def test_vers_arrow_ipc(self) -> None:
+        """Test l'aller-retour d'un tableau au format Arrow IPC avec métadonnées.
+        """
+
+        chargeur = SerialisationDataFrame()
+        data = self.get_data()
+
+        contenu = chargeur.vers_arrow_ipc(data, metadonnees={"shape": data.shape})
+        table = pa.ipc.open_stream(contenu).read_all()
+
+        assert table.num_rows == 3
+        assert table.column_names == ["a", "b", "c"]
+        assert json.loads(table.schema.metadata[b"visualdata"]) == {"shape": [3, 3]}
@@ -0,0 +1,66 @@
+"""Test du module `Projet_stage/backend/modules/statistiques_flux.py`.
+"""
+
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from modules.loading import DataLoader
+from modules.statistiques_flux import (
+    StatistiquesFlux,
+    statistiques_parquet,
+    )
+
+INSURANCE_CSV = Path(__file__).parents[1] / "data" / "csv" / "insurance.csv"
+
+class TestStatistiquesFlux:
+    """Test de la classe `StatistiquesFlux`.
+    """
+
+    def test_consommer_morceaux_csv(self) -> None:
+        """Test que les statistiques par morceaux correspondent à `describe`.
+        """
+
+        chargeur = DataLoader(taille_morceau=100)
+        resume = StatistiquesFlux().consommer_tout(
+            chargeur.iterer_morceaux_csv(str(INSURANCE_CSV))).resume()
+        attendu = pd.read_csv(INSURANCE_CSV).describe().transpose()
+
+        for col in attendu.index:
+            assert resume.loc[col, 'count'] == attendu.loc[col, 'count']
+            assert np.isclose(resume.loc[col, 'mean'], attendu.loc[col, 'mean'])
+            assert np.isclose(resume.loc[col, 'std'], attendu.loc[col, 'std'])
+            assert resume.loc[col, 'min'] == attendu.loc[col, 'min']
+            assert resume.loc[col, 'max'] == attendu.loc[col, 'max']
+        assert resume.loc['region', 'unique'] == 4
+
+    def test_fusionner(self) -> None:
+        """Test que la fusion de deux moitiés donne les statistiques du tout.
+        """
+
+        rng = np.random.default_rng(0)
+        data = pd.DataFrame({"x": rng.normal(5, 2, 20_000)})
+        data.loc[::10, "x"] = np.nan
+
+        premier, second = StatistiquesFlux(), StatistiquesFlux()
+        premier.consommer(data.iloc[:7_000])
+        second.consommer(data.iloc[7_000:])
+        premier.fusionner(second)
+        resume = premier.resume()
+
+        assert resume.loc["x", "missing"] == 2_000
+        assert np.isclose(resume.loc["x", "mean"], data["x"].mean())
+        assert np.isclose(resume.loc["x", "std"], data["x"].std())
+        assert abs(resume.loc["x", "50%"] - data["x"].median()) < 0.1
+
+    def test_statistiques_parquet(self, tmp_path: Path) -> None:
+        """Test les statistiques d'un fichier Parquet en plusieurs processus.
+        """
+
+        data = pd.read_csv(INSURANCE_CSV)
+        chemin = tmp_path / "insurance.parquet"
+        data.to_parquet(chemin, row_group_size=300)
+
+        resume = statistiques_parquet(str(chemin), processus=2).resume()
+
+        assert resume.loc["age", "count"] == len(data)
+        assert np.isclose(resume.loc["charges", "mean"], data["charges"].mean())
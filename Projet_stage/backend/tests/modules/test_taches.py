@@ -0,0 +1,151 @@
+"""Test du module `Projet_stage/backend/modules/taches.py`.
+"""
+
+import os
+import time
+import numpy as np
+import pandas as pd
+import pytest
+from modules.taches import (
+    FileTachesPleine,
+    GestionnaireTaches,
+    TacheAnnulee,
+    tache_visualisation,
+    )
+
+def additionner(a: int, b: int, rapporter) -> int:
+    """Tâche de test : une addition avec un point de progression."""
+    rapporter(0.5, "Addition")
+    return a + b
+
+def patienter(duree: float, rapporter) -> None:
+    """Tâche de test : attend en rapportant sa progression."""
+    for etape in range(int(duree * 10)):
+        rapporter(etape / (duree * 10), "Attente")
+        time.sleep(0.1)
+
+def arreter_processus(rapporter) -> None:
+    """Tâche de test : arrête brutalement son processus (comme un manque de mémoire)."""
+    rapporter(0.5, "Arrêt")
+    os._exit(1) # pylint: disable=protected-access
+
+def attendre_fin(gestionnaire: GestionnaireTaches, identifiant: str, delai: float = 30) -> dict:
+    """Attend qu'une tâche atteigne un état final."""
+    limite = time.time() + delai
+    while time.time() < limite:
+        etat = gestionnaire.obtenir(identifiant)
+        if etat['etat'] in ("terminee", "echouee", "annulee"):
+            return etat
+        time.sleep(0.05)
+    raise TimeoutError(identifiant)
+
+class TestGestionnaireTaches:
+    """Test de la classe `GestionnaireTaches`.
+    """
+
+    def test_soumettre_et_suivre(self, tmp_path) -> None:
+        """Test l'exécution d'une tâche et la lecture de son résultat.
+        """
+
+        gestionnaire = GestionnaireTaches(dossier=str(tmp_path), processus_max=1)
+        try:
+            etat = gestionnaire.soumettre(additionner, 2, 3)
+            assert etat['etat'] == "en_attente"
+
+            etat = attendre_fin(gestionnaire, etat['identifiant'])
+            assert etat['etat'] == "terminee"
+            assert etat['resultat'] == 5
+            assert etat['progression'] == 1.0
+
+            # L'état est lisible par un autre gestionnaire du même dossier (autre worker).
+            autre = GestionnaireTaches(dossier=str(tmp_path))
+            assert autre.obtenir(etat['identifiant'])['resultat'] == 5
+            assert autre.obtenir("inconnue") is None
+        finally:
+            gestionnaire.arreter()
+
+    def test_echec(self, tmp_path) -> None:
+        """Test l'enregistrement de l'erreur d'une tâche qui échoue.
+        """
+
+        gestionnaire = GestionnaireTaches(dossier=str(tmp_path), processus_max=1)
+        try:
+            etat = gestionnaire.soumettre(additionner, 2, "3")
+            etat = attendre_fin(gestionnaire, etat['identifiant'])
+            assert etat['etat'] == "echouee"
+            assert etat['erreur']
+        finally:
+            gestionnaire.arreter()
+
+    def test_annuler(self, tmp_path) -> None:
+        """Test l'annulation d'une tâche en cours et d'une tâche en attente.
+        """
+
+        gestionnaire = GestionnaireTaches(dossier=str(tmp_path), processus_max=1)
+        try:
+            en_cours = gestionnaire.soumettre(patienter, 20)
+            en_attente = gestionnaire.soumettre(additionner, 1, 1)
+
+            assert gestionnaire.annuler(en_attente['identifiant'])
+
+            while gestionnaire.obtenir(en_cours['identifiant'])['etat'] == "en_attente":
+                time.sleep(0.05)
+            assert gestionnaire.annuler(en_cours['identifiant'])
+            assert attendre_fin(gestionnaire, en_cours['identifiant'])['etat'] == "annulee"
+
+            # Déjà transmise au processus, la tâche en attente s'arrête dès son démarrage.
+            assert attendre_fin(gestionnaire, en_attente['identifiant'])['etat'] == "annulee"
+
+            # Une tâche terminée ne peut plus être annulée.
+            assert not gestionnaire.annuler(en_cours['identifiant'])
+        finally:
+            gestionnaire.arreter()
+
+    def test_processus_arrete(self, tmp_path) -> None:
+        """Test qu'un processus arrêté brutalement fait échouer sa tâche
+        sans bloquer les suivantes.
+        """
+
+        gestionnaire = GestionnaireTaches(dossier=str(tmp_path), processus_max=1)
+        try:
+            etat = gestionnaire.soumettre(arreter_processus)
+            etat = attendre_fin(gestionnaire, etat['identifiant'])
+            assert etat['etat'] == "echouee"
+            assert etat['erreur']
+
+            etat = gestionnaire.soumettre(additionner, 2, 3)
+            assert attendre_fin(gestionnaire, etat['identifiant'])['resultat'] == 5
+        finally:
+            gestionnaire.arreter()
+
+    def test_file_pleine(self, tmp_path) -> None:
+        """Test le refus des soumissions au-delà de la taille de la file.
+        """
+
+        gestionnaire = GestionnaireTaches(dossier=str(tmp_path), processus_max=1, file_max=1)
+        try:
+            etat = gestionnaire.soumettre(patienter, 2)
+            with pytest.raises(FileTachesPleine):
+                gestionnaire.soumettre(additionner, 1, 1)
+            gestionnaire.annuler(etat['identifiant'])
+        finally:
+            gestionnaire.arreter()
+
+def test_visualisation_interrompue(tmp_path) -> None:
+    """Test qu'une annulation demandée pendant la réduction interrompt la tâche
+    avant le rendu de la vue graphique.
+    """
+
+    etapes = []
+    def rapporter(progression: float, message: str) -> None:
+        etapes.append(message)
+        if message.startswith("Rendu"):
+            raise TacheAnnulee(message)
+
+    df = pd.DataFrame(np.random.default_rng(0).normal(size=(200, 3)), columns=["a", "b", "c"])
+    with pytest.raises(TacheAnnulee):
+        tache_visualisation(2, df, str(tmp_path), "donnees", rapporter=rapporter)
+
+    assert etapes[0] == "Sélection de la méthode"
+    assert etapes[1].startswith("Réduction avec")
+    assert not list(tmp_path.rglob("*.html"))
@@ -41,6 +41,9 @@ export function initFormEvents() {
             if (!response.ok)
                 throw new Error(`HTTP error! Status: ${response.status}`);
 
+            // Identifiant du jeu de données chargé, renvoyé à chaque requête suivante.
+            constants.headers["X-Dataset-Id"] = response.headers.get("X-Dataset-Id");
+
             await response.json();
 
             await Promise.all([